@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the discovery and cataloguing of the polyaxonfiles under a large tree.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_discovery.py [n_projects]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.polyaxonfile import (  # noqa isort:skip
+    PolyaxonFile,
+    PolyaxonFilesCatalog,
+    find_polyaxonfiles
+)
+
+
+def create_tree(path, n_projects):
+    fixture = os.path.abspath(os.path.join('tests', 'fixtures', 'simple_file.yml'))
+    for i in range(n_projects):
+        project_path = os.path.join(path, 'project{}'.format(i), 'src', 'models')
+        os.makedirs(project_path)
+        for j in range(10):
+            open(os.path.join(project_path, 'model{}.py'.format(j)), 'w').close()
+        if i % 2 == 0:
+            shutil.copy(fixture, os.path.join(path, 'project{}'.format(i), 'polyaxonfile.yml'))
+
+
+def check_default_paths(path):
+    return [filepath for filepath in (
+        PolyaxonFile.check_default_path(dirpath) for dirpath, _, _ in os.walk(path)) if filepath]
+
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return result, (time.time() - start) * 1000
+
+
+def main(n_projects=1000):
+    path = tempfile.mkdtemp()
+    try:
+        create_tree(path, n_projects)
+        filepaths, duration = timed(check_default_paths, path)
+        print('os.walk + check_default_path: {:8.1f} ms ({} files)'.format(
+            duration, len(filepaths)))
+        filepaths, duration = timed(lambda: list(find_polyaxonfiles(path)))
+        print('find_polyaxonfiles:           {:8.1f} ms ({} files)'.format(
+            duration, len(filepaths)))
+
+        catalog = PolyaxonFilesCatalog(path)
+        parsed, duration = timed(catalog.scan)
+        print('catalog full scan:            {:8.1f} ms ({} parsed)'.format(
+            duration, len(parsed)))
+        parsed, duration = timed(catalog.scan)
+        print('catalog incremental scan:     {:8.1f} ms ({} parsed)'.format(
+            duration, len(parsed)))
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
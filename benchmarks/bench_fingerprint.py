@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the fingerprints of configs against dumping and encoding them to json.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_fingerprint.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import pickle
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.ops.build import BuildConfig  # noqa isort:skip
+from polyaxon_schemas.specs import ExperimentSpecification  # noqa isort:skip
+
+
+def get_experiment_content(n_layers):
+    return {
+        'version': 1,
+        'kind': 'experiment',
+        'environment': {'resources': {'cpu': {'requests': 1, 'limits': 2}}},
+        'build': {'image': 'my_image', 'build_steps': ['pip install foo'], 'env_vars': [['A', 1]]},
+        'run': {'cmd': 'train'},
+        'model': {
+            'model_type': 'classifier',
+            'loss': {'MeanSquaredError': None},
+            'optimizer': {'Adam': {'learning_rate': 0.21}},
+            'graph': {
+                'input_layers': 'images',
+                'layers': [
+                    {'Dense': {'units': i, 'activation': 'relu', 'kernel_regularizer': {
+                        'L2': {'l': 0.01}}}} for i in range(n_layers)
+                ],
+            },
+        },
+    }
+
+
+def dump_and_encode(config):
+    return json.dumps(config.to_dict(), sort_keys=True)
+
+
+def timeit_func(func, config, number):
+    return min(timeit.repeat(lambda: func(config), number=number, repeat=3)) / number
+
+
+def timeit_cold_fingerprint(config, number):
+    # The fingerprints are memoised on the interned configs, fresh copies measure a cold run
+    payload = pickle.dumps(config, pickle.HIGHEST_PROTOCOL)
+    durations = []
+    for _ in range(3):
+        copies = [pickle.loads(payload) for _ in range(number)]
+        durations.append(timeit.timeit(lambda: copies.pop().fingerprint(), number=number))
+    return min(durations) / number
+
+
+def main(n_layers=500, number=20):
+    spec = ExperimentSpecification.read(get_experiment_content(n_layers))
+    cases = [
+        ('build', spec.config.build),
+        ('experiment {} layers'.format(n_layers), spec.config),
+    ]
+    for name, config in cases:
+        json_duration = timeit_func(dump_and_encode, config, number)
+        fingerprint_duration = timeit_cold_fingerprint(config, number)
+        memoised_duration = timeit_func(lambda c: c.fingerprint(), config, number)
+        print('{:<22} json: {:8.3f} ms  fingerprint: {:8.3f} ms ({:.1f}x)  '
+              'memoised layers: {:8.3f} ms'.format(
+                  name, json_duration * 1000, fingerprint_duration * 1000,
+                  json_duration / fingerprint_duration, memoised_duration * 1000))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
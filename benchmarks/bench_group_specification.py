@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the construction of a group specification with a large model section.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_group_specification.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.specs import GroupSpecification  # noqa isort:skip
+
+
+def get_group_content(n_layers):
+    return {
+        'version': 1,
+        'kind': 'group',
+        'hptuning': {
+            'concurrency': 2,
+            'matrix': {
+                'lr': {'logspace': '0.01:0.1:5'},
+                'loss': {'values': ['MeanSquaredError', 'AbsoluteDifference']},
+            },
+        },
+        'environment': {
+            'resources': {'cpu': {'requests': 1, 'limits': 2}},
+            'persistence': {'data': ['data1']},
+        },
+        'build': {'image': 'my_image'},
+        'run': {'cmd': 'train --lr={{ lr }} --loss={{ loss }}'},
+        'model': {
+            'model_type': 'classifier',
+            'loss': {'MeanSquaredError': None},
+            'optimizer': {'Adam': {'learning_rate': 0.21}},
+            'graph': {
+                'input_layers': 'images',
+                'layers': [
+                    {'Dense': {'units': 64, 'activation': 'relu'}} for _ in range(n_layers)
+                ],
+                'output_layers': ['dense_{}'.format(n_layers - 1)],
+            },
+        },
+    }
+
+
+def main(n_layers=500, number=5):
+    content = get_group_content(n_layers)
+
+    def construct():
+        spec = GroupSpecification.read(content)
+        # Derived properties should reuse the construction's intermediate results
+        return spec.environment, spec.build, spec.persistence, spec.config
+
+    construct()
+    duration = min(timeit.repeat(construct, number=number, repeat=3)) / number
+    print('GroupSpecification with {} layers: {:.2f} ms'.format(n_layers, duration * 1000))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Measures the memory retained by all the experiments of a grid, with and without interning.
+
+The grid extends the matrix of `tests/fixtures/matrix_file.yml` to `n_points` experiments,
+optionally with a model of `n_layers` layers not depending on the matrix.
+
+Usage (from the repository root, python 3):
+
+    python benchmarks/bench_interning.py [n_points] [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import gc
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas import base  # noqa isort:skip
+from polyaxon_schemas.specs import GroupSpecification  # noqa isort:skip
+from polyaxon_schemas.specs.libs import reader  # noqa isort:skip
+
+
+def get_group_content(n_points, n_layers):
+    content = reader.read(os.path.abspath('tests/fixtures/matrix_file.yml'))
+    content['hptuning']['matrix']['lr'] = {'logspace': '0.01:0.1:{}'.format(n_points // 2)}
+    if n_layers:
+        content['model'] = {
+            'model_type': 'classifier',
+            'loss': {'MeanSquaredError': None},
+            'optimizer': {'Adam': {'learning_rate': 0.21}},
+            'graph': {
+                'input_layers': 'images',
+                'layers': [{'Dense': {
+                    'units': 64,
+                    'activation': 'relu',
+                    'kernel_initializer': {'GlorotUniform': None},
+                    'kernel_regularizer': {'L2': {'l': 0.01}},
+                }} for _ in range(n_layers)],
+                'output_layers': ['Dense_{}'.format(n_layers)],
+            },
+        }
+    return content
+
+
+def get_matrix_declarations(spec):
+    names = sorted(spec.matrix)
+    values = [spec.matrix[name].to_numpy() for name in names]
+    return [dict(zip(names, point)) for point in itertools.product(*values)]
+
+
+def measure(spec, declarations, intern_configs):
+    base.INTERN_CONFIGS = intern_configs
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    configs = [spec.get_experiment_spec(declaration).config for declaration in declarations]
+    duration = time.time() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return configs, retained, duration
+
+
+def main(n_points=5000, n_layers=0):
+    spec = GroupSpecification.read(get_group_content(n_points, n_layers))
+    declarations = get_matrix_declarations(spec)
+    spec.get_experiment_spec(declarations[0])
+
+    results = {}
+    for intern_configs in (False, True):
+        configs, retained, duration = measure(spec, declarations, intern_configs)
+        results[intern_configs] = retained
+        print('{} experiments, {} layers, interning {:<5}: {:8.2f} MiB retained, {:.2f} s'.format(
+            len(configs), n_layers, str(intern_configs), retained / 1024 ** 2, duration))
+        del configs
+    print('saved: {:.2f} MiB ({:.1f}%)'.format(
+        (results[False] - results[True]) / 1024 ** 2,
+        100. * (results[False] - results[True]) / results[False]))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
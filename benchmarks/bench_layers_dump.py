@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the dump of a classifier with a large graph, similar to the models of `tests/test_ml`.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_layers_dump.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.ml.losses import SoftmaxCrossEntropyConfig  # noqa isort:skip
+from polyaxon_schemas.ml.metrics import AccuracyConfig  # noqa isort:skip
+from polyaxon_schemas.ml.models import ClassifierConfig  # noqa isort:skip
+from polyaxon_schemas.ml.optimizers import AdamConfig  # noqa isort:skip
+
+
+def get_layer(i):
+    name = 'layer_{}'.format(i)
+    inbound_nodes = ['layer_{}'.format(i - 1) if i else 'image']
+    if i % 3 == 0:
+        return {'Conv2D': {'filters': 64, 'strides': [1, 1], 'kernel_size': [2, 2],
+                           'activation': 'relu', 'name': name, 'inbound_nodes': inbound_nodes}}
+    if i % 3 == 1:
+        return {'BatchNormalization': {'name': name, 'inbound_nodes': inbound_nodes}}
+    return {'Dense': {'units': 17, 'name': name, 'inbound_nodes': inbound_nodes}}
+
+
+def get_classifier_content(n_layers):
+    output_layer = ['layer_{}'.format(n_layers - 1), 0, 0]
+    return {
+        'graph': {
+            'input_layers': ['image'],
+            'output_layers': [output_layer[0]],
+            'layers': [get_layer(i) for i in range(n_layers)],
+        },
+        'one_hot_encode': True,
+        'n_classes': 10,
+        'loss': SoftmaxCrossEntropyConfig(['image', 0, 0], output_layer=output_layer).to_schema(),
+        'optimizer': AdamConfig(learning_rate=0.01).to_schema(),
+        'metrics': [
+            AccuracyConfig(input_layer=['image', 0, 0], output_layer=output_layer).to_schema(),
+        ],
+        'name': 'model',
+    }
+
+
+def main(n_layers=2000, number=3):
+    config = ClassifierConfig.from_dict(get_classifier_content(n_layers))
+    config.to_dict()
+    duration = min(timeit.repeat(config.to_dict, number=number, repeat=3)) / number
+    print('{} layers: {:.3f} s per dump'.format(n_layers, duration))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the scheduler's path on a model-heavy experiment, eager, lazy, and scheduling-only.
+
+The scheduler only reads the environment, the build, and the replicas of an experiment,
+the lazy mode skips loading the model, the scheduling-only mode skips parsing it too.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_lazy_sections.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.specs import ExperimentSpecification  # noqa isort:skip
+
+
+def get_experiment_content(n_layers):
+    return {
+        'version': 1,
+        'kind': 'experiment',
+        'framework': 'tensorflow',
+        'environment': {
+            'resources': {'cpu': {'requests': 1, 'limits': 2}},
+            'replicas': {'n_workers': 4, 'n_ps': 1},
+        },
+        'build': {'image': 'my_image'},
+        'run': {'cmd': 'train'},
+        'model': {
+            'classifier': {
+                'loss': {'MeanSquaredError': None},
+                'optimizer': {'Adam': {'learning_rate': 0.21}},
+                'graph': {
+                    'input_layers': 'images',
+                    'layers': [{'Dense': {
+                        'units': 64,
+                        'activation': 'relu',
+                        'kernel_initializer': {'GlorotUniform': None},
+                        'kernel_regularizer': {'L2': {'l': 0.01}},
+                    }} for _ in range(n_layers)],
+                },
+            },
+        },
+    }
+
+
+def schedule(content, **kwargs):
+    spec = ExperimentSpecification.read(content, **kwargs)
+    return spec.environment, spec.build, spec.cluster_def, spec.total_resources
+
+
+def main(n_layers=1000, number=5):
+    content = get_experiment_content(n_layers)
+    cases = [
+        ('eager', {}),
+        ('lazy', {'lazy': True}),
+        ('scheduling sections', {'sections': ExperimentSpecification.SCHEDULING_SECTIONS}),
+    ]
+    eager_duration = None
+    for name, kwargs in cases:
+        schedule(content, **kwargs)
+        duration = min(timeit.repeat(lambda: schedule(content, **kwargs),
+                                     number=number,
+                                     repeat=3)) / number
+        eager_duration = eager_duration or duration
+        print('{} layers, {:<20}: {:8.2f} ms ({:.1f}x)'.format(
+            n_layers, name, duration * 1000, eager_duration / duration))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the loading of the polyaxonfiles in `tests/fixtures`, with rhea and the reader.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_loading.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rhea  # noqa isort:skip
+
+from polyaxon_schemas.specs.libs import reader  # noqa isort:skip
+
+
+def get_large_content(n_layers):
+    return {
+        'version': 1,
+        'kind': 'experiment',
+        'run': {'cmd': 'train'},
+        'model': {
+            'model_type': 'classifier',
+            'graph': {
+                'input_layers': 'images',
+                'layers': [{'Dense': {'units': i, 'activation': 'relu'}} for i in range(n_layers)],
+            },
+        },
+    }
+
+
+def timeit_read(read, values, number=5):
+    return min(timeit.repeat(lambda: [read(v) for v in values], number=number, repeat=3)) / number
+
+
+def main(n_layers=2000):
+    print('libyaml: {}'.format(reader.SafeLoader is not yaml.SafeLoader))
+    fixtures = sorted(glob.glob(os.path.abspath('tests/fixtures/*.yml')))
+    fixtures += sorted(glob.glob(os.path.abspath('tests/fixtures/*.json')))
+
+    dirpath = tempfile.mkdtemp()
+    try:
+        content = get_large_content(n_layers)
+        large_yaml = os.path.join(dirpath, 'large.yml')
+        large_json = os.path.join(dirpath, 'large.json')
+        with open(large_yaml, 'w') as f:
+            yaml.safe_dump(content, f)
+        with open(large_json, 'w') as f:
+            json.dump(content, f)
+
+        cases = [
+            ('fixtures', fixtures),
+            ('{} layers yaml'.format(n_layers), [large_yaml]),
+            ('{} layers json'.format(n_layers), [large_json]),
+            ('{} layers dict'.format(n_layers), [content]),
+        ]
+        for name, values in cases:
+            rhea_duration = timeit_read(rhea.read, values)
+            reader_duration = timeit_read(reader.read, values)
+            print('{:<20} rhea: {:8.2f} ms  reader: {:8.2f} ms  ({:.1f}x)'.format(
+                name, rhea_duration * 1000, reader_duration * 1000,
+                rhea_duration / reader_duration))
+    finally:
+        shutil.rmtree(dirpath)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the loading of a large graph, i.e. the dispatch of the multi schemas' items.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_multi_schema.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.ml.graph import GraphConfig  # noqa isort:skip
+
+
+def get_graph_content(n_layers):
+    layers = []
+    for i in range(n_layers):
+        layers.append({'Dense': {
+            'name': 'dense_{}'.format(i),
+            'units': 64,
+            'activation': 'relu',
+            'kernel_initializer': {'glorot_uniform': None},
+            'bias_initializer': {'Zeros': None},
+            'kernel_regularizer': {'l1_l2': {'l1': 0.01}},
+            'inbound_nodes': ['dense_{}'.format(i - 1) if i else 'images'],
+        }})
+    return {
+        'input_layers': ['images'],
+        'layers': layers,
+        'output_layers': ['dense_{}'.format(n_layers - 1)],
+    }
+
+
+def main(n_layers=5000, number=3):
+    content = get_graph_content(n_layers)
+    GraphConfig.from_dict(content)
+    duration = min(timeit.repeat(lambda: GraphConfig.from_dict(content),
+                                 number=number, repeat=3)) / number
+    print('{} layers: {:.3f} s per graph'.format(n_layers, duration))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
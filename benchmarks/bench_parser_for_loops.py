@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the parsing of graphs generated by (nested) `for` operators.
+
+The declarations namespace grows with the number of tags and declared values,
+the parsing time should scale linearly with the number of generated layers.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_parser_for_loops.py [n_declarations]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.specs import ExperimentSpecification  # noqa isort:skip
+from polyaxon_schemas.specs.libs.parser import Parser  # noqa isort:skip
+
+
+def get_loop(length, depth, level=0):
+    index = 'i{}'.format(level)
+    if level == depth - 1:
+        do = {'Dense': {'units': '{{ units }}', 'tags': ['tag_{{ %s }}' % index]}}
+    else:
+        do = get_loop(length, depth, level + 1)
+    return {'for': {'len': length, 'index': index, 'do': do}}
+
+
+def get_graph(length, depth):
+    return {'graph': {'input_layers': ['images'], 'layers': [get_loop(length, depth)]}}
+
+
+def main(n_declarations=1000, number=1):
+    declarations = {'value_{}'.format(i): i for i in range(n_declarations)}
+    declarations['units'] = 32
+
+    def parse(graph):
+        return Parser.parse_expression(
+            ExperimentSpecification, graph, declarations, check_operators=True, check_graph=True)
+
+    for length, depth in [(64, 1), (256, 1), (1024, 1), (16, 2), (32, 2), (8, 3)]:
+        graph = get_graph(length, depth)
+        n_layers = len(parse(graph)['graph']['layers'])
+        duration = min(timeit.repeat(lambda: parse(graph), number=number, repeat=3)) / number
+        print('length={:<5} depth={} layers={:<5} {:.2f} ms ({:.1f} us/layer)'.format(
+            length, depth, n_layers, duration * 1000, duration * 1e6 / n_layers))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
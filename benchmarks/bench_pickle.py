@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the pickle size and time of an experiment specification and of its config.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_pickle.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import pickle
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.specs import ExperimentSpecification  # noqa isort:skip
+
+
+def get_experiment_content(n_layers):
+    return {
+        'version': 1,
+        'kind': 'experiment',
+        'framework': 'tensorflow',
+        'environment': {
+            'resources': {'cpu': {'requests': 1, 'limits': 2}},
+            'replicas': {'n_workers': 4, 'n_ps': 1},
+        },
+        'build': {'image': 'my_image'},
+        'run': {'cmd': 'train'},
+        'model': {
+            'classifier': {
+                'loss': {'MeanSquaredError': None},
+                'optimizer': {'Adam': {'learning_rate': 0.21}},
+                'graph': {
+                    'input_layers': 'images',
+                    'layers': [{'Dense': {
+                        'units': i,
+                        'activation': 'relu',
+                        'kernel_initializer': {'GlorotUniform': None},
+                        'kernel_regularizer': {'L2': {'l': 0.01}},
+                    }} for i in range(n_layers)],
+                },
+            },
+        },
+    }
+
+
+def get_spec(content):
+    spec = ExperimentSpecification.read(content)
+    # The cached properties usually computed by the users of a specification
+    spec.environment, spec.build, spec.run, spec.model, spec.cluster_def  # noqa
+    return spec
+
+
+def use_spec(spec):
+    return spec.cluster_def, spec.model
+
+
+def measure(name, obj, use, number):
+    protocol = pickle.HIGHEST_PROTOCOL
+    payload = pickle.dumps(obj, protocol)
+    dump_duration = min(timeit.repeat(lambda: pickle.dumps(obj, protocol),
+                                      number=number, repeat=3)) / number
+    load_duration = min(timeit.repeat(lambda: use(pickle.loads(payload)),
+                                      number=number, repeat=3)) / number
+    print('{:<32} size: {:9.1f} KiB  dumps: {:7.2f} ms  loads and use: {:7.2f} ms'.format(
+        name, len(payload) / 1024., dump_duration * 1000, load_duration * 1000))
+
+
+def main(n_layers=500, number=10):
+    content = get_experiment_content(n_layers)
+    spec = get_spec(content)
+    measure('config', spec.config, lambda config: config.model, number)
+    measure('specification', spec, use_spec, number)
+    if hasattr(ExperimentSpecification, 'PICKLE_PARSED_STATE'):
+        ExperimentSpecification.PICKLE_PARSED_STATE = True
+        measure('specification with parsed state', spec, use_spec, number)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
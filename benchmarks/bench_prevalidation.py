@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the rejection of malformed polyaxonfiles, with and without the prevalidation.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_prevalidation.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.exceptions import PolyaxonfileError  # noqa isort:skip
+from polyaxon_schemas.specs import SPECIFICATION_BY_KIND  # noqa isort:skip
+from polyaxon_schemas.specs.libs import reader  # noqa isort:skip
+
+FIXTURES = [
+    'advanced_file.yml',
+    'distributed_tensorflow_file.yml',
+    'matrix_file.yml',
+    'run_exec_simple_file.yml',
+]
+
+
+def make_malformed(data):
+    data = dict(data)
+    data['environment'] = dict(data.get('environment') or {}, resources={'cpu': [1]})
+    return data
+
+
+def reject(func, data):
+    try:
+        func(data)
+    except Exception:  # pylint:disable=broad-except
+        return
+    raise PolyaxonfileError('The data was not rejected.')
+
+
+def main():
+    for fixture in FIXTURES:
+        data = reader.read(os.path.abspath(os.path.join('tests', 'fixtures', fixture)))
+        spec = SPECIFICATION_BY_KIND[data['kind']]
+        spec.prevalidate(data)  # the schema is built and compiled once
+        malformed = make_malformed(data)
+        number = 200
+        full = min(timeit.repeat(lambda: reject(spec, malformed), number=number, repeat=3))
+        pre = min(timeit.repeat(lambda: reject(spec.prevalidate, malformed),
+                                number=number, repeat=3))
+        valid = min(timeit.repeat(lambda: spec.prevalidate(data), number=number, repeat=3))
+        print('{:<35} reject parsing: {:8.1f} us  reject prevalidating: {:6.1f} us  '
+              'prevalidate valid: {:6.1f} us'.format(fixture,
+                                                     full / number * 1e6,
+                                                     pre / number * 1e6,
+                                                     valid / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
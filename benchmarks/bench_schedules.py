@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the vectorised evaluation of learning rate schedules against a per config,
+per step python loop.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_schedules.py [n_configs] [n_steps]
+"""
+from __future__ import absolute_import, division, print_function
+
+import math
+import numpy as np
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.ml.optimizers import AdamConfig  # noqa isort:skip
+from polyaxon_schemas.ml.schedules import evaluate_schedules  # noqa isort:skip
+
+DECAY_TYPES = ['exponential_decay', 'inverse_time_decay', 'natural_exp_decay',
+               'piecewise_constant', 'polynomial_decay']
+
+
+def get_configs(n_configs):
+    return [AdamConfig(learning_rate=0.1 / (1 + i % 10),
+                       decay_type=DECAY_TYPES[i % len(DECAY_TYPES)],
+                       decay_rate=0.5,
+                       decay_steps=100 * (1 + i % 7),
+                       start_decay_at=i % 3 * 10,
+                       staircase=bool(i % 2)) for i in range(n_configs)]
+
+
+def loop_schedule(config, step):
+    decay_step = min(step - config.start_decay_at,
+                     config.stop_decay_at - config.start_decay_at)
+    if decay_step < 0:
+        return config.learning_rate
+    if config.decay_type == 'polynomial_decay':
+        progress = min(decay_step, config.decay_steps) / config.decay_steps
+        value = ((config.learning_rate - config.decay_rate) * (1 - progress) +
+                 config.decay_rate)
+    else:
+        progress = decay_step / config.decay_steps
+        if config.staircase or config.decay_type == 'piecewise_constant':
+            progress = math.floor(progress)
+        if config.decay_type in ('exponential_decay', 'piecewise_constant'):
+            value = config.learning_rate * config.decay_rate ** progress
+        elif config.decay_type == 'inverse_time_decay':
+            value = config.learning_rate / (1 + config.decay_rate * progress)
+        else:
+            value = config.learning_rate * math.exp(-config.decay_rate * progress)
+    return max(value, config.min_learning_rate)
+
+
+def loop_schedules(configs, steps):
+    return [[loop_schedule(config, step) for step in steps] for config in configs]
+
+
+def main(n_configs=2000, n_steps=1000, number=3):
+    configs = get_configs(n_configs)
+    steps = list(range(0, 10 * n_steps, 10))
+    np.testing.assert_allclose(evaluate_schedules(configs, steps), loop_schedules(configs, steps))
+
+    loop_duration = min(timeit.repeat(lambda: loop_schedules(configs, steps),
+                                      number=number, repeat=3)) / number
+    duration = min(timeit.repeat(lambda: evaluate_schedules(configs, steps),
+                                 number=number, repeat=3)) / number
+    print('{} configs x {} steps, loop: {:8.2f} ms  vectorised: {:8.2f} ms ({:.1f}x)'.format(
+        n_configs, n_steps, loop_duration * 1000, duration * 1000, loop_duration / duration))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Measures the time and memory allocated to create an experiment specification.
+
+Usage (from the repository root, python 3):
+
+    python benchmarks/bench_specification_allocations.py [n_layers]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.specs import ExperimentSpecification  # noqa isort:skip
+
+
+def get_experiment_content(n_layers):
+    return {
+        'version': 1,
+        'kind': 'experiment',
+        'environment': {'resources': {'cpu': {'requests': 1, 'limits': 2}}},
+        'build': {'image': 'my_image'},
+        'run': {'cmd': 'train'},
+        'model': {
+            'model_type': 'classifier',
+            'loss': {'MeanSquaredError': None},
+            'optimizer': {'Adam': {'learning_rate': 0.21}},
+            'graph': {
+                'input_layers': 'images',
+                'layers': [
+                    {'Dense': {'units': 64, 'activation': 'relu', 'kernel_regularizer': {
+                        'L2': {'l': 0.01}}}} for _ in range(n_layers)
+                ],
+            },
+        },
+    }
+
+
+def main(n_layers=500, number=3):
+    content = get_experiment_content(n_layers)
+    ExperimentSpecification.read(content)
+
+    tracemalloc.start()
+    spec = ExperimentSpecification.read(content)  # noqa, kept alive to measure its memory
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    duration = min(timeit.repeat(lambda: ExperimentSpecification.read(content),
+                                 number=number,
+                                 repeat=3)) / number
+    print('ExperimentSpecification with {} layers: {:.2f} ms, '
+          'peak memory {:.2f} MiB, retained memory {:.2f} MiB'.format(
+              n_layers, duration * 1000, peak / 1024 ** 2, retained / 1024 ** 2))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
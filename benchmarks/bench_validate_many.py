@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks the throughput of `validate_many` with an increasing number of workers.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_validate_many.py [n_files]
+"""
+from __future__ import absolute_import, division, print_function
+
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polyaxon_schemas.polyaxonfile import validate_many  # noqa isort:skip
+
+FIXTURES = [
+    'advanced_file.yml',
+    'distributed_tensorflow_file.yml',
+    'matrix_file.yml',
+    'simple_file.yml',
+]
+
+
+def main(n_files=400):
+    fixtures = [os.path.abspath(os.path.join('tests', 'fixtures', f)) for f in FIXTURES]
+    paths = [fixtures[i % len(fixtures)] for i in range(n_files)]
+
+    workers = 1
+    while workers <= multiprocessing.cpu_count():
+        start = time.time()
+        n_errors = sum(len(result.errors) for result in validate_many(paths, workers=workers))
+        duration = time.time() - start
+        print('workers={:<3} {:.1f} files/s ({} errors)'.format(
+            workers, n_files / duration, n_errors))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1,19 +1,241 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import binascii
+import datetime
+import hashlib
+import numpy as np
+import operator
+import re
 import six
+import weakref
 
 from collections import Mapping, OrderedDict
 
+from hestia.cached_property import cached_property
 from hestia.humanize import humanize_timesince
 from hestia.tz_utils import get_time_zone
 from hestia.units import to_percentage, to_unit_memory
 from marshmallow import RAISE, Schema, ValidationError, post_dump, post_load
+from marshmallow.decorators import VALIDATES_SCHEMA
+from marshmallow.schema import SchemaMeta
 from marshmallow.utils import EXCLUDE, utc
 
 from polyaxon_schemas.exceptions import PolyaxonSchemaError
 from polyaxon_schemas.utils import to_camel_case
 
+# Whether the loaded configs with `INTERNED = True` are shared when identical, opt-in:
+# the interned configs are read only, and their nested values, e.g. lists, are shared as well
+INTERN_CONFIGS = False
+
+_interned_configs = weakref.WeakValueDictionary()
+
+# The fingerprinted fields by config
+_fingerprint_fields = {}
+
+# The attributes pickled by position, and the cached properties, by config
+_pickled_attributes = {}
+
+
+class _Missing(object):
+    def __reduce__(self):
+        # Pickled by reference, the unpickled sentinel is the same object
+        return '_MISSING'
+
+
+_MISSING = _Missing()
+
+# The structural prevalidators of the lazy sections by config and attribute
+_lazy_prevalidators = {}
+# The names of the `validates_schema` methods by schema
+_schema_validators = {}
+
+
+def _new_hash():
+    # blake2b is not available on python 2
+    if hasattr(hashlib, 'blake2b'):
+        return hashlib.blake2b(digest_size=16)  # pylint:disable=no-member
+    return hashlib.sha256()
+
+
+def _freeze(value):
+    """Returns a hashable structural key of a loaded value.
+
+    Nested configs are keyed by identity, they are loaded, and interned, before their parents.
+    Raises `TypeError` for values that cannot be keyed.
+    """
+    if isinstance(value, BaseConfig):
+        return value
+    if isinstance(value, Mapping):
+        return Mapping, frozenset((key, _freeze(item)) for key, item in six.iteritems(value))
+    if isinstance(value, (list, tuple)):
+        return value.__class__, tuple(_freeze(item) for item in value)
+    hash(value)
+    # The type is part of the key, e.g. `1`, `1.0`, and `True` are equal
+    return value.__class__, value
+
+
+def intern_config(config, data):
+    """Returns the shared instance of a config loaded from data, creating it the first time.
+
+    Identical configs, e.g. the initializers or the environment of all the experiments
+    of a group, are held once, as long as they are used.
+    Interned configs are shared, setting their attributes raises, their copies can be mutated.
+    """
+    try:
+        key = (config, _freeze(data))
+    except TypeError:
+        return config(**data)
+
+    obj = _interned_configs.get(key)
+    if obj is None:
+        if '__setattr__' not in vars(BaseConfig):
+            # Installed with the first interned config, the configs do not pay for the check
+            # on every attribute set otherwise
+            BaseConfig.__setattr__ = _set_config_attr
+            BaseConfig.__delattr__ = _del_config_attr
+        obj = config(**data)
+        obj.__dict__['_interned'] = True
+        _interned_configs[key] = obj
+    return obj
+
+
+def _get_pickled_attributes(config):
+    """Returns the fields' attributes in schema order, as a tuple and a set, the names
+    of the cached properties of a config, and a getter of all the attributes."""
+    attrs = _pickled_attributes.get(config)
+    if attrs is None:
+        _, fields = _get_fingerprint_fields(config)
+        attrs = tuple(attr for attr, _ in fields)
+        cached_properties = frozenset(
+            name for klass in config.__mro__ for name, value in six.iteritems(vars(klass))
+            if isinstance(value, cached_property)
+        )
+        # Fetches all the attributes at once, when the config sets all its fields
+        getter = operator.itemgetter(*attrs) if len(attrs) > 1 else None
+        attrs = (attrs, frozenset(attrs), cached_properties, getter)
+        _pickled_attributes[config] = attrs
+    return attrs
+
+
+def unpickle_config(config, values, extras):
+    """Rebuilds a config pickled by `BaseConfig.__reduce__`, without calling its `__init__`."""
+    obj = config.__new__(config)
+    state = obj.__dict__
+    for attr, value in zip(_get_pickled_attributes(config)[0], values):
+        if value is not _MISSING:
+            state[attr] = value
+    if extras:
+        state.update(extras)
+    return obj
+
+
+def _set_config_attr(config, name, value):
+    if '_interned' in config.__dict__:
+        raise PolyaxonSchemaError(
+            'Cannot set `{}`, the loaded `{}` is shared by identical configs, '
+            'set it on a copy instead.'.format(name, config.__class__.__name__))
+    object.__setattr__(config, name, value)
+
+
+def _del_config_attr(config, name):
+    if '_interned' in config.__dict__:
+        raise PolyaxonSchemaError(
+            'Cannot delete `{}`, the loaded `{}` is shared by identical configs, '
+            'delete it on a copy instead.'.format(name, config.__class__.__name__))
+    object.__delattr__(config, name)
+
+
+def make_config(config, data):
+    """Creates a config from loaded data, interned if the config is `INTERNED`."""
+    if config.INTERNED and INTERN_CONFIGS:
+        return intern_config(config, data)
+    return config(**data)
+
+
+def _get_fingerprint_fields(config):
+    """Returns the attributes of a config's declared fields in schema order, with their chunks.
+
+    The chunks are the encoded attributes, prefixed by the encoded config's path.
+    """
+    fields = _fingerprint_fields.get(config)
+    if fields is None:
+        attrs = []
+        if config.SCHEMA is not None:
+            attrs = [
+                field.attribute or name
+                for name, field in six.iteritems(config.SCHEMA._declared_fields)  # noqa
+            ]
+        fields = (_get_value_bytes('{}.{}'.format(config.__module__, config.__name__)),
+                  [(attr, _get_value_bytes(attr)) for attr in attrs])
+        _fingerprint_fields[config] = fields
+    return fields
+
+
+def _get_value_bytes(value):
+    chunks = []
+    _hash_value(chunks.append, value)
+    return b''.join(chunks)
+
+
+def _hash_value(update, value):  # noqa, too-many-branches
+    """Feeds a tagged, unambiguous, encoding of a value to `update`."""
+    value_type = type(value)
+    # The most common types are checked first, by exact type
+    if value is None:
+        update(b'N')
+    elif value_type is bool:
+        update(b'T' if value else b'F')
+    elif value_type is str or value_type is six.text_type:
+        if value_type is six.text_type:
+            value = value.encode('utf-8')
+        update('S{}:'.format(len(value)).encode('ascii'))
+        update(value)
+    elif value_type in six.integer_types:
+        update('I{};'.format(value).encode('ascii'))
+    elif value_type is float:
+        update('R{!r};'.format(value).encode('ascii'))
+    elif isinstance(value, BaseConfig):
+        update(b'C')
+        update(value.get_fingerprint_digest())
+    elif isinstance(value, (list, tuple)):
+        update('L{};'.format(len(value)).encode('ascii'))
+        for item in value:
+            _hash_value(update, item)
+    elif isinstance(value, Mapping):
+        # Sorted by encoded keys, the keys can have different types
+        items = sorted((_get_value_bytes(key), item) for key, item in six.iteritems(value))
+        update('D{};'.format(len(items)).encode('ascii'))
+        for key, item in items:
+            update(key)
+            _hash_value(update, item)
+    elif isinstance(value, np.bool_):
+        _hash_value(update, bool(value))
+    elif isinstance(value, six.integer_types + (np.integer, )):
+        _hash_value(update, int(value))
+    elif isinstance(value, (float, np.floating)):
+        _hash_value(update, float(value))
+    elif isinstance(value, six.string_types):
+        _hash_value(update, six.text_type(value))
+    elif isinstance(value, (set, frozenset)):
+        items = sorted(_get_value_bytes(item) for item in value)
+        update('E{};'.format(len(items)).encode('ascii'))
+        for item in items:
+            update(item)
+    elif isinstance(value, np.ndarray):
+        update('A{}{};'.format(value.dtype.str, value.shape).encode('ascii'))
+        update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        update('W{};'.format(value.isoformat()).encode('ascii'))
+    else:
+        # Functions, classes, and dtypes are identified by their names, e.g. activations
+        name = getattr(value, '__name__', None) or getattr(value, 'name', None)
+        if not isinstance(name, six.string_types):
+            raise PolyaxonSchemaError(
+                'Cannot fingerprint the value `{}` of type `{}`.'.format(value, type(value)))
+        update(b'X')
+        _hash_value(update, name)
+
 
 class BaseSchema(Schema):
     """Base schema."""
@@ -24,7 +246,7 @@ class BaseSchema(Schema):
 
     @post_load
     def make(self, data):
-        return self.schema_config()(**data)
+        return make_config(self.schema_config(), data)
 
     @post_dump
     def unmake(self, data):
@@ -34,6 +256,28 @@ class BaseSchema(Schema):
     def schema_config():
         raise NotImplementedError()
 
+    @classmethod
+    def get_schema_validators(cls):
+        """Returns the names of the `validates_schema` methods of the schema."""
+        validators = _schema_validators.get(cls)
+        if validators is None:
+            validators = tuple(
+                name for name in dir(cls)
+                if (VALIDATES_SCHEMA, False) in (
+                    getattr(getattr(cls, name, None), '__marshmallow_hook__', None) or {}))
+            _schema_validators[cls] = validators
+        return validators
+
+    def validate_loaded_data(self, data):
+        """Runs the `validates_schema` methods on already deserialized data,
+        e.g. the fields of a patched config that were not loaded together."""
+        for name in self.get_schema_validators():
+            try:
+                getattr(self, name)(data)
+            except ValidationError as e:
+                # Keyed as the errors of `load`
+                raise ValidationError(e.normalized_messages())
+
 
 class BaseConfig(object):
     """Base for config classes."""
@@ -46,9 +290,23 @@ class BaseConfig(object):
     DATETIME_ATTRIBUTES = []
     MEM_SIZE_ATTRIBUTES = []
     PERCENT_ATTRIBUTES = []
+    INTERNED = False  # Identical loaded configs are shared, for immutable configs.
+    LAZY_ATTRIBUTES = []  # Nested sections kept as raw data until accessed, with `lazy=True`.
     ROUNDING = 2
     UNKNOWN_BEHAVIOUR = RAISE
 
+    def __getattr__(self, name):
+        # Only called for missing attributes, i.e. the lazy sections not materialised yet
+        lazy_sections = self.__dict__.get('_lazy_sections')
+        if not lazy_sections or name not in lazy_sections:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                self.__class__.__name__, name))
+        schema, data = lazy_sections[name]
+        value = schema.fields[name].deserialize(data)
+        setattr(self, name, value)
+        lazy_sections.pop(name, None)
+        return value
+
     def to_light_dict(self,
                       humanize_values=False,
                       include_attrs=None,
@@ -112,10 +370,59 @@ class BaseConfig(object):
         return {cls.IDENTIFIER: cls.obj_to_dict(obj)}
 
     @classmethod
-    def from_dict(cls, value, unknown=None):
+    def from_dict(cls, value, unknown=None, lazy=False):
         unknown = unknown or cls.UNKNOWN_BEHAVIOUR
+        if lazy and cls.LAZY_ATTRIBUTES:
+            return cls.lazy_from_dict(value, unknown=unknown)
         return cls.SCHEMA(unknown=unknown).load(value)  # pylint: disable=not-callable
 
+    @classmethod
+    def get_lazy_prevalidator(cls, attr):
+        """Returns the compiled structural prevalidator of a lazy section."""
+        prevalidator = _lazy_prevalidators.get((cls, attr))
+        if prevalidator is None:
+            # The prevalidator module depends on this module
+            from polyaxon_schemas.specs.libs.prevalidator import (
+                compile_jsonschema,
+                get_field_jsonschema
+            )
+
+            field = cls.SCHEMA().fields[attr]  # pylint: disable=not-callable
+            prevalidator = compile_jsonschema(get_field_jsonschema(field))
+            _lazy_prevalidators[(cls, attr)] = prevalidator
+        return prevalidator
+
+    @classmethod
+    def lazy_from_dict(cls, value, unknown=None):
+        """Loads a config, the `LAZY_ATTRIBUTES` sections are materialised on first access.
+
+        The lazy sections are only validated structurally, i.e. their keys and value types,
+        the other errors are raised when they are accessed.
+        """
+        unknown = unknown or cls.UNKNOWN_BEHAVIOUR
+        value = dict(value)
+        lazy_values = OrderedDict()
+        for attr in cls.LAZY_ATTRIBUTES:
+            if value.get(attr) is not None:
+                lazy_values[attr] = value.pop(attr)
+
+        errors = {}
+        for attr, data in six.iteritems(lazy_values):
+            attr_errors = cls.get_lazy_prevalidator(attr)(data)
+            if attr_errors:
+                errors[attr] = attr_errors
+        if errors:
+            raise ValidationError(errors)
+
+        schema = cls.SCHEMA(unknown=unknown)  # pylint: disable=not-callable
+        config = schema.load(value)
+        for attr in lazy_values:
+            config.__dict__.pop(attr, None)
+        config._lazy_sections = {  # pylint: disable=protected-access
+            attr: (schema, data) for attr, data in six.iteritems(lazy_values)
+        }
+        return config
+
     @staticmethod
     def localize_date(dt):
         if not dt:
@@ -124,6 +431,66 @@ class BaseConfig(object):
             dt = utc.localize(dt)
         return dt.astimezone(get_time_zone())
 
+    def __reduce__(self):
+        """Pickles the config as its class and the values of its fields in schema order.
+
+        The fields' names are not pickled, the other attributes, e.g. set by `__init__`,
+        are pickled by name, the cached properties are not pickled.
+        The lazy sections are materialised first, the copies of interned configs are not shared.
+        """
+        lazy_sections = self.__dict__.get('_lazy_sections')
+        if lazy_sections:
+            for name in list(lazy_sections):
+                getattr(self, name)
+        attrs, attrs_set, cached_properties, getter = _get_pickled_attributes(self.__class__)
+        state = self.__dict__
+        try:
+            values = getter(state)
+        except (KeyError, TypeError):
+            values = tuple([state.get(attr, _MISSING) for attr in attrs])
+        extras = None
+        if not attrs_set.issuperset(state):
+            extras = {
+                key: value for key, value in six.iteritems(state)
+                if key not in attrs_set and key not in cached_properties and
+                key not in ('_lazy_sections', '_fingerprint_digest', '_interned')
+            } or None
+        return unpickle_config, (self.__class__, values, extras)
+
+    def get_fingerprint_digest(self):
+        """Returns the structural fingerprint of this config as bytes, see `fingerprint`."""
+        # Memoised on the instance, configs can be equal without the same structure
+        digest = self.__dict__.get('_fingerprint_digest')
+        if digest is not None:
+            return digest
+
+        config_path, fields = _get_fingerprint_fields(self.__class__)
+        chunks = [config_path]
+        update = chunks.append
+        for attr, attr_chunk in fields:
+            value = getattr(self, attr, _MISSING)
+            if value is _MISSING:
+                continue
+            update(attr_chunk)
+            _hash_value(update, value)
+        hash_obj = _new_hash()
+        hash_obj.update(b''.join(chunks))
+        digest = hash_obj.digest()
+
+        if '_interned' in self.__dict__:
+            self.__dict__['_fingerprint_digest'] = digest
+        return digest
+
+    def fingerprint(self):
+        """Returns a stable structural fingerprint of this config, e.g. for cache keys.
+
+        The values of the declared fields are streamed in schema order into a blake2b hash,
+        sha256 on python 2, without dumping the config.
+        Configs with the same class and the same values have the same fingerprint,
+        the fingerprints of the interned configs are memoised, they cannot be mutated.
+        """
+        return binascii.hexlify(self.get_fingerprint_digest()).decode('ascii')
+
     @classmethod
     def to_jsonschema(cls):
         from marshmallow_jsonschema import JSONSchema  # pylint:disable=import-error
@@ -131,21 +498,94 @@ class BaseConfig(object):
         return JSONSchema().dump(cls.SCHEMA())  # pylint:disable=not-callable
 
 
+class MultiSchemaMeta(SchemaMeta):
+    """Builds the alias table of a multi schema once, when the class is created."""
+
+    def __init__(cls, name, bases, attrs):  # noqa, N805
+        super(MultiSchemaMeta, cls).__init__(name, bases, attrs)
+        cls.__aliases__ = cls.get_aliases()
+        # The other spellings converted to a config the first time they are used
+        cls.__converted_aliases__ = {}
+        # The schemas loading the configs' items, created once per config
+        cls.__schemas__ = {}
+
+
+@six.add_metaclass(MultiSchemaMeta)
 class BaseMultiSchema(Schema):
     __multi_schema_name__ = None
     __configs__ = None
     # to support snake case identifier, e.g. glorot_uniform and GlorotUniform
     __support_snake_case__ = False
+    _MAX_CONVERTED_ALIASES = 1024
 
     class Meta:
         unknown = EXCLUDE
 
+    @classmethod
+    def get_aliases(cls):
+        """Returns the table of the accepted spellings of the configs' identifiers.
+
+        With snake case support, every spelling converted by `to_camel_case` to a config
+        is accepted, the table holds the configs' names and their usual spellings,
+        e.g. `GlorotUniform`, `glorotuniform`, and `glorot_uniform`,
+        the other spellings are converted the first time they are used, see `get_config`.
+        """
+        configs = cls.__configs__ or {}
+        if not cls.__support_snake_case__:
+            return dict(configs)
+
+        aliases = {}
+        for key in configs:
+            snake_key = re.sub(r'(?<!^)(?=[A-Z])', '_', key).lower()
+            for alias in (key, key.lower(), snake_key):
+                if to_camel_case(alias) in configs:
+                    aliases[alias] = configs[to_camel_case(alias)]
+        return aliases
+
+    @classmethod
+    def get_config(cls, key):
+        """Returns the config class of an identifier, or None if the identifier is not valid."""
+        config = cls.__aliases__.get(key)
+        if config is None and cls.__support_snake_case__ and isinstance(key, six.string_types):
+            config = cls.__converted_aliases__.get(key)
+            if config is None:
+                config = cls.__configs__.get(to_camel_case(key))
+                if config is not None:
+                    if len(cls.__converted_aliases__) >= cls._MAX_CONVERTED_ALIASES:
+                        cls.__converted_aliases__.clear()
+                    cls.__converted_aliases__[key] = config
+        return config
+
+    @classmethod
+    def get_config_schema(cls, config):
+        """Returns the schema of a config, created once and reused for all the items.
+
+        Loading and dumping do not keep any state on the schema, so the same schema instance
+        can handle all the items, e.g. all the layers of a graph, instead of one per item.
+        """
+        schema = cls.__schemas__.get(config)
+        if schema is None:
+            schema = config.SCHEMA(unknown=EXCLUDE)
+            cls.__schemas__[config] = schema
+        return schema
+
+    @classmethod
+    def load_config(cls, config, value):
+        """Loads an item's config, same as `config.from_dict(value, unknown=EXCLUDE)`."""
+        return cls.get_config_schema(config).load(value)
+
+    @classmethod
+    def dump_config(cls, obj):
+        """Dumps an item's config, same as `obj.to_schema()`."""
+        config = obj.__class__
+        return {config.IDENTIFIER: cls.get_config_schema(config).dump(obj)}
+
     @post_dump(pass_original=True, pass_many=True)
     def handle_multi_schema_dump(self, data, pass_many, original):
         def handle_item(item):
             if hasattr(item, 'get_config'):
                 return self.__configs__[item.__class__.__name__].obj_to_schema(item)
-            return item.to_schema()
+            return self.dump_config(item)
 
         if pass_many:
             return [handle_item(item) for item in original]
@@ -155,13 +595,12 @@ class BaseMultiSchema(Schema):
     @post_load(pass_original=True, pass_many=True)
     def handle_multi_schema_load(self, data, pass_many, original):
         def make(key, val=None):
-            key = to_camel_case(key) if self.__support_snake_case__ else key
-            try:
-                return (self.__configs__[key].from_dict(val, unknown=EXCLUDE) if val else
-                        self.__configs__[key]())
-            except KeyError:
+            config = self.get_config(key)
+            if config is None:
+                key = to_camel_case(key) if self.__support_snake_case__ else key
                 raise ValidationError("`{}` is not a valid value for schema `{}`".format(
                     key, self.__multi_schema_name__))
+            return self.load_config(config, val) if val else make_config(config, {})
 
         def handle_item(item):
             if isinstance(item, six.string_types):
@@ -171,9 +610,11 @@ class BaseMultiSchema(Schema):
                 if 'class_name' in item:
                     return make(item['class_name'], item['config'])
                 if 'model_type' in item:
-                    return make(item.pop('model_type'), item)
+                    # The loaded data is not mutated, it can be shared with other configs
+                    return make(item['model_type'],
+                                {k: v for k, v in six.iteritems(item) if k != 'model_type'})
                 assert len(item) == 1
-                key, val = list(six.iteritems(item))[0]
+                key, val = next(six.iteritems(item))
                 return make(key, val)
 
         if pass_many:
@@ -0,0 +1,729 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import copy
+import six
+
+from collections import OrderedDict, namedtuple
+
+from hestia.list_utils import to_list
+
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
+from polyaxon_schemas.ml.layers.advanced_activations import (
+    ELUConfig,
+    LeakyReLUConfig,
+    PReLUConfig,
+    ThresholdedReLUConfig
+)
+from polyaxon_schemas.ml.layers.convolutional import (
+    Conv1DConfig,
+    Conv2DConfig,
+    Conv2DTransposeConfig,
+    Conv3DConfig,
+    Conv3DTransposeConfig,
+    Cropping1DConfig,
+    Cropping2DConfig,
+    Cropping3DConfig,
+    SeparableConv2DConfig,
+    UpSampling1DConfig,
+    UpSampling2DConfig,
+    UpSampling3DConfig,
+    ZeroPadding1DConfig,
+    ZeroPadding2DConfig,
+    ZeroPadding3DConfig
+)
+from polyaxon_schemas.ml.layers.convolutional_recurrent import ConvLSTM2DConfig
+from polyaxon_schemas.ml.layers.core import (
+    ActivationConfig,
+    ActivityRegularizationConfig,
+    CastConfig,
+    DenseConfig,
+    DropoutConfig,
+    FlattenConfig,
+    MaskingConfig,
+    PermuteConfig,
+    RepeatVectorConfig,
+    ReshapeConfig,
+    SpatialDropout1DConfig,
+    SpatialDropout2DConfig,
+    SpatialDropout3DConfig
+)
+from polyaxon_schemas.ml.layers.embeddings import EmbeddingConfig
+from polyaxon_schemas.ml.layers.local import LocallyConnected1DConfig, LocallyConnected2DConfig
+from polyaxon_schemas.ml.layers.merge import (
+    AddConfig,
+    AverageConfig,
+    ConcatenateConfig,
+    DotConfig,
+    MaximumConfig,
+    MultiplyConfig,
+    SubtractConfig
+)
+from polyaxon_schemas.ml.layers.noise import (
+    AlphaDropoutConfig,
+    GaussianDropoutConfig,
+    GaussianNoiseConfig
+)
+from polyaxon_schemas.ml.layers.normalization import BatchNormalizationConfig
+from polyaxon_schemas.ml.layers.pooling import (
+    AveragePooling1DConfig,
+    AveragePooling2DConfig,
+    AveragePooling3DConfig,
+    GlobalAveragePooling1DConfig,
+    GlobalAveragePooling2DConfig,
+    GlobalAveragePooling3DConfig,
+    GlobalMaxPooling1DConfig,
+    GlobalMaxPooling2DConfig,
+    GlobalMaxPooling3DConfig,
+    MaxPooling1DConfig,
+    MaxPooling2DConfig,
+    MaxPooling3DConfig
+)
+from polyaxon_schemas.ml.layers.recurrent import GRUConfig, LSTMConfig, SimpleRNNConfig
+from polyaxon_schemas.ml.layers.wrappers import BidirectionalConfig, TimeDistributedConfig
+
+LayerEstimation = namedtuple(
+    'LayerEstimation', 'name identifier input_shapes output_shape params flops')
+
+
+def _prod(values):
+    """Returns the product of the values, or None if a value is unknown."""
+    result = 1
+    for value in values:
+        if value is None:
+            return None
+        result *= value
+    return result
+
+
+def _sum(values):
+    """Returns the sum of the values, or None if a value is unknown."""
+    values = list(values)
+    if any(value is None for value in values):
+        return None
+    return sum(values)
+
+
+def _mul(*values):
+    return _prod(values)
+
+
+def _to_tuple(value, rank):
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value, ) * rank
+
+
+def _split_channels(shape, config, rank):
+    """Returns the spatial dimensions and the channels of a shape without the batch dimension."""
+    if getattr(config, 'data_format', None) == 'channels_first':
+        return tuple(shape[1:rank + 1]), shape[0]
+    return tuple(shape[:rank]), shape[rank]
+
+
+def _join_channels(spatial, channels, config):
+    if getattr(config, 'data_format', None) == 'channels_first':
+        return (channels, ) + tuple(spatial)
+    return tuple(spatial) + (channels, )
+
+
+def conv_output_length(length, kernel_size, padding, stride, dilation=1):
+    """Returns the output length of a convolution, same as keras' `conv_output_length`."""
+    if length is None:
+        return None
+    dilated_kernel_size = (kernel_size - 1) * dilation + 1
+    padding = padding.lower()
+    if padding in ('same', 'causal'):
+        output_length = length
+    elif padding == 'full':
+        output_length = length + dilated_kernel_size - 1
+    else:
+        output_length = length - dilated_kernel_size + 1
+    return (output_length + stride - 1) // stride
+
+
+def deconv_output_length(length, kernel_size, padding, stride):
+    """Returns the output length of a transposed convolution."""
+    if length is None:
+        return None
+    padding = padding.lower()
+    if padding == 'same':
+        return length * stride
+    if padding == 'full':
+        return length * stride - (stride + kernel_size - 2)
+    return length * stride + max(kernel_size - stride, 0)
+
+
+def _identity(config, input_shapes):
+    return input_shapes[0], 0, 0
+
+
+def _elementwise(config, input_shapes):
+    return input_shapes[0], 0, _prod(input_shapes[0])
+
+
+def _dense(config, input_shapes):
+    shape = input_shapes[0]
+    units = config.units
+    params = _sum([_mul(shape[-1], units), units if config.use_bias else 0])
+    flops = _mul(2, _prod(shape[:-1]), shape[-1], units)
+    return tuple(shape[:-1]) + (units, ), params, flops
+
+
+def _get_conv(rank, transpose=False):
+    def estimate(config, input_shapes):
+        spatial, channels = _split_channels(input_shapes[0], config, rank)
+        kernel_size = _to_tuple(config.kernel_size, rank)
+        strides = _to_tuple(config.strides, rank)
+        dilation_rate = _to_tuple(getattr(config, 'dilation_rate', 1), rank)
+        if transpose:
+            output_spatial = tuple(
+                deconv_output_length(length, kernel, config.padding, stride)
+                for length, kernel, stride in zip(spatial, kernel_size, strides))
+            positions = _prod(spatial)
+        else:
+            output_spatial = tuple(
+                conv_output_length(length, kernel, config.padding, stride, dilation)
+                for length, kernel, stride, dilation in zip(
+                    spatial, kernel_size, strides, dilation_rate))
+            positions = _prod(output_spatial)
+        kernel_params = _mul(_prod(kernel_size), channels, config.filters)
+        params = _sum([kernel_params, config.filters if config.use_bias else 0])
+        flops = _mul(2, kernel_params, positions)
+        return _join_channels(output_spatial, config.filters, config), params, flops
+
+    return estimate
+
+
+def _separable_conv_2d(config, input_shapes):
+    spatial, channels = _split_channels(input_shapes[0], config, 2)
+    kernel_size = _to_tuple(config.kernel_size, 2)
+    strides = _to_tuple(config.strides, 2)
+    output_spatial = tuple(
+        conv_output_length(length, kernel, config.padding, stride)
+        for length, kernel, stride in zip(spatial, kernel_size, strides))
+    depthwise_params = _mul(_prod(kernel_size), channels, config.depth_multiplier)
+    pointwise_params = _mul(channels, config.depth_multiplier, config.filters)
+    params = _sum([depthwise_params, pointwise_params, config.filters if config.use_bias else 0])
+    flops = _mul(2, _sum([depthwise_params, pointwise_params]), _prod(output_spatial))
+    return _join_channels(output_spatial, config.filters, config), params, flops
+
+
+def _get_locally_connected(rank):
+    def estimate(config, input_shapes):
+        spatial, channels = _split_channels(input_shapes[0], config, rank)
+        kernel_size = _to_tuple(config.kernel_size, rank)
+        strides = _to_tuple(config.strides, rank)
+        output_spatial = tuple(
+            conv_output_length(length, kernel, config.padding, stride)
+            for length, kernel, stride in zip(spatial, kernel_size, strides))
+        positions = _prod(output_spatial)
+        kernel_params = _mul(positions, _prod(kernel_size), channels, config.filters)
+        params = _sum([kernel_params, _mul(positions, config.filters) if config.use_bias else 0])
+        flops = _mul(2, kernel_params)
+        return _join_channels(output_spatial, config.filters, config), params, flops
+
+    return estimate
+
+
+def _get_pooling(rank):
+    def estimate(config, input_shapes):
+        spatial, channels = _split_channels(input_shapes[0], config, rank)
+        pool_size = _to_tuple(config.pool_size, rank)
+        strides = _to_tuple(config.strides, rank) if config.strides else pool_size
+        output_spatial = tuple(
+            conv_output_length(length, pool, config.padding, stride)
+            for length, pool, stride in zip(spatial, pool_size, strides))
+        flops = _mul(_prod(output_spatial), _prod(pool_size), channels)
+        return _join_channels(output_spatial, channels, config), 0, flops
+
+    return estimate
+
+
+def _get_global_pooling(rank):
+    def estimate(config, input_shapes):
+        _, channels = _split_channels(input_shapes[0], config, rank)
+        return (channels, ), 0, _prod(input_shapes[0])
+
+    return estimate
+
+
+def _get_resize(rank, resize):
+    def estimate(config, input_shapes):
+        spatial, channels = _split_channels(input_shapes[0], config, rank)
+        output_spatial = tuple(
+            resize(length, value) if length is not None else None
+            for length, value in zip(spatial, resize_values(config)))
+        return _join_channels(output_spatial, channels, config), 0, 0
+
+    def resize_values(config):
+        for attr in ('size', 'padding', 'cropping'):
+            if hasattr(config, attr):
+                return _to_tuple(getattr(config, attr), rank)
+
+    return estimate
+
+
+def _pad(length, padding):
+    return length + (sum(padding) if isinstance(padding, (list, tuple)) else 2 * padding)
+
+
+def _crop(length, cropping):
+    return length - (sum(cropping) if isinstance(cropping, (list, tuple)) else 2 * cropping)
+
+
+def _flatten(config, input_shapes):
+    return (_prod(input_shapes[0]), ), 0, 0
+
+
+def _reshape(config, input_shapes):
+    target_shape = tuple(config.target_shape)
+    if -1 in target_shape:
+        size = _prod(input_shapes[0])
+        known = _prod(d for d in target_shape if d != -1)
+        target_shape = tuple(
+            (size // known if size is not None else None) if d == -1 else d
+            for d in target_shape)
+    return target_shape, 0, 0
+
+
+def _permute(config, input_shapes):
+    return tuple(input_shapes[0][d - 1] for d in config.dims), 0, 0
+
+
+def _repeat_vector(config, input_shapes):
+    return (config.n, ) + tuple(input_shapes[0]), 0, 0
+
+
+def _embedding(config, input_shapes):
+    shape = input_shapes[0] or (config.input_length, )
+    return tuple(shape) + (config.output_dim, ), _mul(config.input_dim, config.output_dim), 0
+
+
+def _get_recurrent(gates):
+    def estimate(config, input_shapes):
+        timesteps, features = input_shapes[0][0], input_shapes[0][-1]
+        units = config.units
+        gate_params = _sum([_mul(features, units), units * units])
+        params = _mul(gates, _sum([gate_params, units if config.use_bias else 0]))
+        flops = _mul(2, timesteps, gates, gate_params)
+        output_shape = (timesteps, units) if config.return_sequences else (units, )
+        return output_shape, params, flops
+
+    return estimate
+
+
+def _conv_lstm_2d(config, input_shapes):
+    timesteps = input_shapes[0][0]
+    output_shape, _, _ = _get_conv(2)(config, [input_shapes[0][1:]])
+    spatial, channels = _split_channels(input_shapes[0][1:], config, 2)
+    kernel_size = _prod(_to_tuple(config.kernel_size, 2))
+    gate_params = _mul(kernel_size, _sum([channels, config.filters]), config.filters)
+    params = _mul(4, _sum([gate_params, config.filters if config.use_bias else 0]))
+    flops = _mul(2, timesteps, 4, gate_params, _prod(output_shape) // config.filters
+                 if _prod(output_shape) is not None else None)
+    if config.return_sequences:
+        output_shape = (timesteps, ) + output_shape
+    return output_shape, params, flops
+
+
+def _batch_normalization(config, input_shapes):
+    channels = input_shapes[0][config.axis if config.axis < 0 else config.axis - 1]
+    n_weights = 2 + int(bool(config.center)) + int(bool(config.scale))
+    return input_shapes[0], _mul(n_weights, channels), _mul(2, _prod(input_shapes[0]))
+
+
+def _prelu(config, input_shapes):
+    shared_axes = set(to_list(config.shared_axes or [], check_none=True))
+    params = _prod(d for i, d in enumerate(input_shapes[0]) if i + 1 not in shared_axes)
+    return input_shapes[0], params, _prod(input_shapes[0])
+
+
+def _merge(config, input_shapes):
+    flops = _mul(len(input_shapes) - 1, _prod(input_shapes[0]))
+    return input_shapes[0], 0, flops
+
+
+def _concatenate(config, input_shapes):
+    axis = config.axis if config.axis < 0 else config.axis - 1
+    output_shape = list(input_shapes[0])
+    output_shape[axis] = _sum(shape[axis] for shape in input_shapes)
+    return tuple(output_shape), 0, 0
+
+
+def _dot(config, input_shapes):
+    axes = _to_tuple(config.axes, 2)
+    shapes = []
+    for shape, axis in zip(input_shapes, axes):
+        axis = axis if axis < 0 else axis - 1
+        shapes.append(tuple(d for i, d in enumerate(shape) if i != axis % len(shape)))
+    output_shape = (shapes[0] + shapes[1]) or (1, )
+    return output_shape, 0, _mul(2, _prod(input_shapes[0]), _prod(shapes[1]))
+
+
+def _time_distributed(config, input_shapes):
+    timesteps = input_shapes[0][0]
+    output_shape, params, flops = estimate_layer(config.layer, [input_shapes[0][1:]])
+    return (timesteps, ) + tuple(output_shape), params, _mul(timesteps, flops)
+
+
+def _bidirectional(config, input_shapes):
+    output_shape, params, flops = estimate_layer(config.layer, input_shapes)
+    output_shape = tuple(output_shape[:-1]) + (_mul(2, output_shape[-1]), )
+    return output_shape, _mul(2, params), _mul(2, flops)
+
+
+ESTIMATORS = {
+    # Shape preserving layers
+    ActivationConfig: _elementwise,
+    ActivityRegularizationConfig: _identity,
+    CastConfig: _identity,
+    DropoutConfig: _elementwise,
+    MaskingConfig: _elementwise,
+    SpatialDropout1DConfig: _elementwise,
+    SpatialDropout2DConfig: _elementwise,
+    SpatialDropout3DConfig: _elementwise,
+    AlphaDropoutConfig: _elementwise,
+    GaussianDropoutConfig: _elementwise,
+    GaussianNoiseConfig: _elementwise,
+    ELUConfig: _elementwise,
+    LeakyReLUConfig: _elementwise,
+    ThresholdedReLUConfig: _elementwise,
+    PReLUConfig: _prelu,
+    BatchNormalizationConfig: _batch_normalization,
+    # Core
+    DenseConfig: _dense,
+    FlattenConfig: _flatten,
+    ReshapeConfig: _reshape,
+    PermuteConfig: _permute,
+    RepeatVectorConfig: _repeat_vector,
+    EmbeddingConfig: _embedding,
+    # Convolutions
+    Conv1DConfig: _get_conv(1),
+    Conv2DConfig: _get_conv(2),
+    Conv3DConfig: _get_conv(3),
+    Conv2DTransposeConfig: _get_conv(2, transpose=True),
+    Conv3DTransposeConfig: _get_conv(3, transpose=True),
+    SeparableConv2DConfig: _separable_conv_2d,
+    LocallyConnected1DConfig: _get_locally_connected(1),
+    LocallyConnected2DConfig: _get_locally_connected(2),
+    UpSampling1DConfig: _get_resize(1, lambda length, size: length * size),
+    UpSampling2DConfig: _get_resize(2, lambda length, size: length * size),
+    UpSampling3DConfig: _get_resize(3, lambda length, size: length * size),
+    ZeroPadding1DConfig: _get_resize(1, _pad),
+    ZeroPadding2DConfig: _get_resize(2, _pad),
+    ZeroPadding3DConfig: _get_resize(3, _pad),
+    Cropping1DConfig: _get_resize(1, _crop),
+    Cropping2DConfig: _get_resize(2, _crop),
+    Cropping3DConfig: _get_resize(3, _crop),
+    # Pooling
+    MaxPooling1DConfig: _get_pooling(1),
+    MaxPooling2DConfig: _get_pooling(2),
+    MaxPooling3DConfig: _get_pooling(3),
+    AveragePooling1DConfig: _get_pooling(1),
+    AveragePooling2DConfig: _get_pooling(2),
+    AveragePooling3DConfig: _get_pooling(3),
+    GlobalMaxPooling1DConfig: _get_global_pooling(1),
+    GlobalMaxPooling2DConfig: _get_global_pooling(2),
+    GlobalMaxPooling3DConfig: _get_global_pooling(3),
+    GlobalAveragePooling1DConfig: _get_global_pooling(1),
+    GlobalAveragePooling2DConfig: _get_global_pooling(2),
+    GlobalAveragePooling3DConfig: _get_global_pooling(3),
+    # Recurrent
+    SimpleRNNConfig: _get_recurrent(1),
+    GRUConfig: _get_recurrent(3),
+    LSTMConfig: _get_recurrent(4),
+    ConvLSTM2DConfig: _conv_lstm_2d,
+    # Merge
+    AddConfig: _merge,
+    SubtractConfig: _merge,
+    MultiplyConfig: _merge,
+    AverageConfig: _merge,
+    MaximumConfig: _merge,
+    ConcatenateConfig: _concatenate,
+    DotConfig: _dot,
+    # Wrappers
+    TimeDistributedConfig: _time_distributed,
+    BidirectionalConfig: _bidirectional,
+}
+
+
+def estimate_layer(config, input_shapes):
+    """Returns the `(output_shape, params, flops)` of a layer config.
+
+    The shapes do not include the batch dimension, unknown values are None,
+    e.g. the output shape of a layer without an estimator.
+
+    Args:
+        config: `BaseLayerConfig`. The layer's config.
+        input_shapes: `list(tuple)`. The shapes of the layer's inputs.
+    """
+    estimator = ESTIMATORS.get(config.__class__)
+    if estimator is None or any(shape is None for shape in input_shapes):
+        return None, None, None
+    try:
+        return estimator(config, input_shapes)
+    except (TypeError, ValueError, IndexError, AttributeError, ZeroDivisionError) as e:
+        raise PolyaxonSchemaError('Could not estimate the layer `{}` with inputs {}: {}'.format(
+            config.IDENTIFIER, input_shapes, e))
+
+
+class GraphEstimation(object):
+    """The estimation of a graph's shapes, parameters, activations, and flops.
+
+    All values are per example, i.e. without the batch dimension,
+    a total is None if any of its layers' values is unknown.
+
+    Args:
+        layers: `list(LayerEstimation)`. The layers' estimations in topological order.
+        output_shapes: `dict`. The shapes of the graph's output layers.
+    """
+
+    def __init__(self, layers, output_shapes):
+        self.layers = layers
+        self.output_shapes = output_shapes
+
+    @property
+    def params(self):
+        return _sum(layer.params for layer in self.layers)
+
+    @property
+    def flops(self):
+        return _sum(layer.flops for layer in self.layers)
+
+    @property
+    def activations(self):
+        """The number of values of all the layers' outputs, for one example."""
+        return _sum(_prod(layer.output_shape) if layer.output_shape is not None else None
+                    for layer in self.layers)
+
+    def get_params_memory(self, dtype_size=4):
+        """Returns the memory in bytes of the parameters."""
+        return _mul(self.params, dtype_size)
+
+    def get_activations_memory(self, batch_size=1, dtype_size=4):
+        """Returns the memory in bytes of the activations of a batch."""
+        return _mul(self.activations, batch_size, dtype_size)
+
+    def get_memory(self, batch_size=1, dtype_size=4):
+        """Returns the memory in bytes of the parameters and the activations of a batch.
+
+        This is a lower bound of the memory needed to train the graph,
+        the gradients and the optimizer's slots need as much memory as the parameters each.
+        """
+        return _sum([self.get_params_memory(dtype_size),
+                     self.get_activations_memory(batch_size, dtype_size)])
+
+    def get_flops(self, batch_size=1):
+        """Returns the approximate flops of a forward pass of a batch."""
+        return _mul(self.flops, batch_size)
+
+
+def _get_node_name(node):
+    """Returns the layer name of an inbound node, i.e. a name or a `[name, node, tensor]`."""
+    if isinstance(node, (list, tuple)):
+        return node[0]
+    return node
+
+
+def _get_nodes(nodes):
+    if not nodes:
+        return []
+    if isinstance(nodes, (list, tuple)) and isinstance(nodes[0], six.string_types):
+        if len(nodes) == 3 and not isinstance(nodes[1], six.string_types):
+            return [nodes[0]]
+    return [_get_node_name(node) for node in to_list(nodes)]
+
+
+def get_layers_names(graph):
+    """Returns the names of the graph's layers, and their inbound layers' names.
+
+    Layers without names are named and connected the same way the parser does,
+    i.e. `{IDENTIFIER}_{count}`, and to the previous layer or the single input layer.
+    """
+    input_layers = _get_nodes(graph.input_layers)
+    counters = {}
+    names = []
+    inbound_names = []
+    for i, layer in enumerate(graph.layers):
+        name = layer.name
+        if not name:
+            counters[layer.IDENTIFIER] = counters.get(layer.IDENTIFIER, 0) + 1
+            name = '{}_{}'.format(layer.IDENTIFIER, counters[layer.IDENTIFIER])
+        inbound = _get_nodes(layer.inbound_nodes)
+        if not inbound:
+            inbound = [names[i - 1]] if i else input_layers[:1]
+        names.append(name)
+        inbound_names.append(inbound)
+    return names, inbound_names
+
+
+class GraphIndex(object):
+    """The DAG index of a graph: its layers by name, their edges, and their order.
+
+    The index is built once, in O(V + E), and raises a `PolyaxonSchemaError`
+    if a layer name is used twice, if an inbound or output layer does not exist,
+    or if the layers have a cycle.
+
+    Args:
+        graph: `GraphConfig`. The graph to index.
+
+    Attributes:
+        input_layers: `list(str)`. The names of the graph's inputs.
+        output_layers: `list(str)`. The names of the graph's outputs, by default the last layer.
+        layers: `OrderedDict`. The layers by name, in the graph's order.
+        inbound: `dict`. The names of the inbound layers or inputs of every layer.
+        outbound: `dict`. The names of the layers using every layer or input.
+        topological_order: `list(str)`. The layers' names in execution order,
+            the independent layers are kept in the graph's order.
+        reachable: `set(str)`. The names of the layers and inputs reaching an output.
+    """
+
+    def __init__(self, graph):
+        self.input_layers = _get_nodes(graph.input_layers)
+        names, inbound_names = get_layers_names(graph)
+
+        self.layers = OrderedDict()
+        for name, layer in zip(names, graph.layers):
+            if name in self.layers or name in self.input_layers:
+                raise PolyaxonSchemaError(
+                    'The name `{}` is used 2 times in the graph.'.format(name))
+            self.layers[name] = layer
+
+        self.inbound = dict(zip(names, inbound_names))
+        self.outbound = {name: [] for name in self.input_layers + names}
+        for name, inbound in zip(names, inbound_names):
+            for inbound_name in inbound:
+                if inbound_name not in self.outbound:
+                    raise PolyaxonSchemaError(
+                        'The layer `{}` has a non existing inbound node `{}`.'.format(
+                            name, inbound_name))
+                self.outbound[inbound_name].append(name)
+
+        self.output_layers = _get_nodes(graph.output_layers) or names[-1:]
+        for name in self.output_layers:
+            if name not in self.outbound:
+                raise PolyaxonSchemaError(
+                    'The output layer `{}` does not exist.'.format(name))
+
+        self.topological_order = self._get_topological_order()
+        self.reachable = self._get_reachable()
+
+    def _get_topological_order(self):
+        # Kahn's algorithm, the ready layers are walked in the graph's order
+        in_degrees = {
+            name: sum(1 for inbound_name in inbound if inbound_name in self.layers)
+            for name, inbound in six.iteritems(self.inbound)
+        }
+        ready = [name for name in self.layers if not in_degrees[name]]
+        ready.reverse()
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in reversed(self.outbound[name]):
+                in_degrees[dependent] -= 1
+                if not in_degrees[dependent]:
+                    ready.append(dependent)
+
+        if len(order) != len(self.layers):
+            raise PolyaxonSchemaError('The graph has a cycle between the layers {}.'.format(
+                [name for name in self.layers if in_degrees[name]]))
+        return order
+
+    def _get_reachable(self):
+        reachable = set(self.output_layers)
+        stack = list(self.output_layers)
+        while stack:
+            for inbound_name in self.inbound.get(stack.pop(), []):
+                if inbound_name not in reachable:
+                    reachable.add(inbound_name)
+                    stack.append(inbound_name)
+        return reachable
+
+    @property
+    def dead_layers(self):
+        """The names of the layers not reaching any output, in the graph's order."""
+        return [name for name in self.layers if name not in self.reachable]
+
+    def get_ancestors(self, name):
+        """Returns the names of the layers and inputs that a layer depends on."""
+        ancestors = set()
+        stack = [name]
+        while stack:
+            for inbound_name in self.inbound.get(stack.pop(), []):
+                if inbound_name not in ancestors:
+                    ancestors.add(inbound_name)
+                    stack.append(inbound_name)
+        return ancestors
+
+    def get_descendants(self, name):
+        """Returns the names of the layers depending on a layer or an input."""
+        descendants = set()
+        stack = [name]
+        while stack:
+            for outbound_name in self.outbound.get(stack.pop(), []):
+                if outbound_name not in descendants:
+                    descendants.add(outbound_name)
+                    stack.append(outbound_name)
+        return descendants
+
+    def get_pruned_layers(self):
+        """Returns copies of the layers reaching an output, with explicit names and inbound nodes.
+
+        The names and inbound nodes are set explicitly since the defaults of
+        the layers following a dead layer depend on their positions.
+        """
+        layers = []
+        for name, layer in six.iteritems(self.layers):
+            if name not in self.reachable:
+                continue
+            layer = copy.copy(layer)
+            layer.name = name
+            layer.inbound_nodes = list(self.inbound[name])
+            layers.append(layer)
+        return layers
+
+
+def estimate_graph(graph, input_shapes):
+    """Infers the shapes, and estimates the parameters and flops of a graph's layers.
+
+    The layers are walked in topological order,
+    every layer's output shape is inferred from its inbound layers' output shapes.
+
+    Args:
+        graph: `GraphConfig`. The graph to estimate.
+        input_shapes: `dict | tuple`. The shapes of the graph's input layers, without
+            the batch dimension, a single shape can be passed for a graph with one input.
+
+    Returns:
+        GraphEstimation
+    """
+    index = graph.index
+    if not isinstance(input_shapes, dict):
+        if len(index.input_layers) != 1:
+            raise PolyaxonSchemaError(
+                'The graph has {} input layers, `input_shapes` must be a dict.'.format(
+                    len(index.input_layers)))
+        input_shapes = {index.input_layers[0]: input_shapes}
+    shapes = {name: tuple(shape) for name, shape in six.iteritems(input_shapes)}
+    missing_inputs = set(index.input_layers) - set(shapes)
+    if missing_inputs:
+        raise PolyaxonSchemaError('Missing the shapes of the input layers {}.'.format(
+            sorted(missing_inputs)))
+
+    layers = []
+    for name in index.topological_order:
+        layer = index.layers[name]
+        layer_input_shapes = [shapes[inbound_name] for inbound_name in index.inbound[name]]
+        output_shape, params, flops = estimate_layer(layer, layer_input_shapes)
+        shapes[name] = tuple(output_shape) if output_shape is not None else None
+        layers.append(LayerEstimation(name=name,
+                                      identifier=layer.IDENTIFIER,
+                                      input_shapes=layer_input_shapes,
+                                      output_shape=shapes[name],
+                                      params=params,
+                                      flops=flops))
+
+    return GraphEstimation(layers=layers,
+                           output_shapes={name: shapes[name] for name in index.output_layers})
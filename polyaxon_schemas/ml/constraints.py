@@ -78,6 +78,7 @@ class MaxNormConfig(BaseConfig):
     """
     IDENTIFIER = 'MaxNorm'
     SCHEMA = MaxNormSchema
+    INTERNED = True
 
     def __init__(self, max_value=2, axis=0):
         self.max_value = max_value
@@ -115,6 +116,7 @@ class NonNegConfig(BaseConfig):
     """
     IDENTIFIER = 'NonNeg'
     SCHEMA = NonNegSchema
+    INTERNED = True
 
     def __init__(self, w):
         self.w = w
@@ -181,6 +183,7 @@ class UnitNormConfig(BaseConfig):
     """
     IDENTIFIER = 'UnitNorm'
     SCHEMA = UnitNormSchema
+    INTERNED = True
 
     def __init__(self, axis=0):
         self.axis = axis
@@ -268,6 +271,7 @@ class MinMaxNormConfig(BaseConfig):
     """
     IDENTIFIER = 'MinMaxNorm'
     SCHEMA = MinMaxNormSchema
+    INTERNED = True
 
     def __init__(self, min_value=0.0, max_value=1.0, rate=1.0, axis=0):
         self.min_value = min_value
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+from hestia.cached_property import cached_property
 from marshmallow import EXCLUDE, fields
 
 from polyaxon_schemas.base import BaseConfig, BaseSchema
+from polyaxon_schemas.ml.analysis import GraphIndex, estimate_graph
 from polyaxon_schemas.ml.layers import LayerSchema
 from polyaxon_schemas.utils import ObjectOrListObject, Tensor
 
@@ -162,3 +164,31 @@ class GraphConfig(BaseConfig):
         self.output_layers = output_layers
         self.layers = layers
         self.name = name
+
+    @cached_property
+    def index(self):
+        """The `GraphIndex` of the layers, built on first access.
+
+        The index is not updated if the layers are mutated afterwards.
+        """
+        return GraphIndex(self)
+
+    def prune(self):
+        """Returns a new graph without the layers that do not reach any output."""
+        return GraphConfig(input_layers=self.input_layers,
+                           output_layers=self.output_layers,
+                           layers=self.index.get_pruned_layers(),
+                           name=self.name)
+
+    def estimate(self, input_shapes):
+        """Infers the layers' output shapes, and estimates the graph's parameters and flops.
+
+        Args:
+            input_shapes: `dict | tuple`. The shapes of the input layers without the batch
+                dimension, a single shape can be passed for a graph with one input layer.
+
+        Returns:
+            `GraphEstimation`, layers without estimators and their dependents are unknown,
+            i.e. `None`.
+        """
+        return estimate_graph(self, input_shapes)
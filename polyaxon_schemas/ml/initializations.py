@@ -52,6 +52,7 @@ class ZerosInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'Zeros'
     SCHEMA = ZerosInitializerSchema
+    INTERNED = True
 
     def __init__(self, dtype='float32'):
         self.dtype = dtype
@@ -100,6 +101,7 @@ class OnesInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'Ones'
     SCHEMA = OnesInitializerSchema
+    INTERNED = True
 
     def __init__(self, dtype='float32'):
         self.dtype = dtype
@@ -160,6 +162,7 @@ class ConstantInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'Constant'
     SCHEMA = ConstantInitializerSchema
+    INTERNED = True
 
     def __init__(self, value=0, dtype='float32'):
         self.dtype = dtype
@@ -222,6 +225,7 @@ class UniformInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'Uniform'
     SCHEMA = UniformInitializerSchema
+    INTERNED = True
 
     def __init__(self, minval=0, maxval=None, seed=None, dtype='float32'):
         self.seed = seed
@@ -285,6 +289,7 @@ class NormalInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'Normal'
     SCHEMA = NormalInitializerSchema
+    INTERNED = True
 
     def __init__(self, mean=0., stddev=1., seed=None, dtype='float32'):
         self.seed = seed
@@ -351,6 +356,7 @@ class TruncatedNormalInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'TruncatedNormal'
     SCHEMA = TruncatedNormalInitializerSchema
+    INTERNED = True
 
     def __init__(self, mean=0., stddev=1., seed=None, dtype='float32'):
         self.seed = seed
@@ -427,6 +433,7 @@ class VarianceScalingInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'VarianceScaling'
     SCHEMA = VarianceScalingInitializerSchema
+    INTERNED = True
 
     def __init__(self, scale=1., mode='fan_in', distribution="normal", dtype='float32'):
         self.scale = scale
@@ -484,6 +491,7 @@ class IdentityInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'Identity'
     SCHEMA = IdentityInitializerSchema
+    INTERNED = True
 
     def __init__(self, gain=1.):
         self.gain = gain
@@ -551,6 +559,7 @@ class OrthogonalInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'Orthogonal'
     SCHEMA = OrthogonalInitializerSchema
+    INTERNED = True
 
     def __init__(self, gain=1., seed=None, dtype='float32'):
         self.seed = seed
@@ -610,6 +619,7 @@ class GlorotUniformInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'GlorotUniform'
     SCHEMA = GlorotUniformInitializerSchema
+    INTERNED = True
 
     def __init__(self, seed=None):
         self.seed = seed
@@ -667,6 +677,7 @@ class GlorotNormalInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'GlorotNormal'
     SCHEMA = GlorotNormalInitializerSchema
+    INTERNED = True
 
     def __init__(self, seed=None):
         self.seed = seed
@@ -722,6 +733,7 @@ class HeUniformInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'HeUniform'
     SCHEMA = HeUniformInitializerSchema
+    INTERNED = True
 
     def __init__(self, seed=None):
         self.seed = seed
@@ -777,6 +789,7 @@ class HeNormalInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'HeNormal'
     SCHEMA = HeNormalInitializerSchema
+    INTERNED = True
 
     def __init__(self, seed=None):
         self.seed = seed
@@ -833,6 +846,7 @@ class LecunUniformInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'LecunUniform'
     SCHEMA = LecunUniformInitializerSchema
+    INTERNED = True
 
     def __init__(self, seed=None):
         self.seed = seed
@@ -890,6 +904,7 @@ class LecunNormalInitializerConfig(BaseConfig):
     """
     IDENTIFIER = 'LecunNormal'
     SCHEMA = LecunNormalInitializerSchema
+    INTERNED = True
 
     def __init__(self, seed=None):
         self.seed = seed
@@ -4,7 +4,7 @@ from __future__ import absolute_import, division, print_function
 from marshmallow import EXCLUDE, fields
 
 from polyaxon_schemas.base import BaseConfig, BaseSchema
-from polyaxon_schemas.utils import DType, ObjectOrListObject, Tensor, get_value
+from polyaxon_schemas.utils import DType, ObjectOrListObject, Tensor, get_value_accessor
 
 
 class BaseLayerSchema(BaseSchema):
@@ -17,12 +17,25 @@ class BaseLayerSchema(BaseSchema):
         unknown = EXCLUDE
         ordered = True
 
+    # The accessors of the dumped attributes, by schema class and attribute
+    _accessors = {}
+
     def get_attribute(self, obj, attr, default):
-        return get_value(attr, obj, default)
+        key = (self.__class__, attr)
+        accessor = self._accessors.get(key)
+        if accessor is None:
+            accessor = self.get_accessor(attr)
+            self._accessors[key] = accessor
+        return accessor(obj, default)
+
+    def get_accessor(self, attr):
+        """Returns the accessor of an attribute, created once per schema class."""
+        return get_value_accessor(attr)
 
 
 class BaseLayerConfig(BaseConfig):
     REDUCED_ATTRIBUTES = ['name']
+    INTERNED = True
     UNKNOWN_BEHAVIOUR = EXCLUDE
 
     def __init__(self, name=None, trainable=True, dtype='float32', inbound_nodes=None):
@@ -17,6 +17,7 @@ class BaseRegularizerSchema(BaseSchema):
 
 class BaseRegularizerConfig(BaseConfig):
     REDUCED_ATTRIBUTES = ['name']
+    INTERNED = True
 
     def __init__(self, name, collect=True):
         self.name = name
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+from collections import namedtuple
+
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
+from polyaxon_schemas.ml.optimizers import BaseOptimizerConfig
+from polyaxon_schemas.ml.rl.explorations import DecayExplorationConfig, RandomDecayExplorationConfig
+
+NO_DECAY = 0
+EXPONENTIAL_DECAY = 1
+INVERSE_TIME_DECAY = 2
+NATURAL_EXP_DECAY = 3
+PIECEWISE_CONSTANT = 4
+POLYNOMIAL_DECAY = 5
+
+DECAY_TYPES = {
+    None: NO_DECAY,
+    '': NO_DECAY,
+    'exponential_decay': EXPONENTIAL_DECAY,
+    'inverse_time_decay': INVERSE_TIME_DECAY,
+    'natural_exp_decay': NATURAL_EXP_DECAY,
+    'piecewise_constant': PIECEWISE_CONSTANT,
+    'polynomial_decay': POLYNOMIAL_DECAY,
+}
+
+
+class ScheduleParams(namedtuple('ScheduleParams', [
+        'initial', 'decay_type', 'decay_rate', 'decay_steps', 'start_decay_at',
+        'stop_decay_at', 'minimum', 'staircase'])):
+    """The parameters of many schedules, as arrays with one value per schedule."""
+    __slots__ = ()
+
+
+def get_decay_type(decay_type):
+    """Returns the code of a decay type, a `tf.train` decay function name,
+    with or without the `_decay` suffix."""
+    code = DECAY_TYPES.get(decay_type)
+    if code is None and decay_type:
+        code = DECAY_TYPES.get('{}_decay'.format(decay_type))
+    if code is None:
+        raise PolyaxonSchemaError('Unsupported decay type `{}`, expected one of {}.'.format(
+            decay_type, sorted(key for key in DECAY_TYPES if key)))
+    return code
+
+
+def get_schedule_values(config):
+    """Returns the values of a schedule config as a tuple in `ScheduleParams` order.
+
+    The random decay explorations start from a random action at every step, i.e. a rate of 1.
+    The decaying schedules require a positive `decay_steps`.
+    """
+    if isinstance(config, BaseOptimizerConfig):
+        initial, minimum = config.learning_rate, config.min_learning_rate
+    elif isinstance(config, DecayExplorationConfig):
+        initial, minimum = config.exploration_rate, config.min_exploration_rate
+    elif isinstance(config, RandomDecayExplorationConfig):
+        initial, minimum = 1., config.min_exploration_rate
+    else:
+        raise PolyaxonSchemaError('Config `{}` does not describe a schedule.'.format(
+            config.__class__.__name__))
+    decay_type = get_decay_type(config.decay_type)
+    if decay_type != NO_DECAY and not (config.decay_steps and config.decay_steps > 0):
+        raise PolyaxonSchemaError(
+            'Config `{}` with decay type `{}` requires a positive `decay_steps`, got `{}`.'.format(
+                config.__class__.__name__, config.decay_type, config.decay_steps))
+    return (initial,
+            decay_type,
+            config.decay_rate,
+            config.decay_steps,
+            config.start_decay_at,
+            config.stop_decay_at,
+            minimum,
+            config.staircase)
+
+
+def get_schedule_params(configs):
+    """Gathers the parameters of optimizers and decay explorations configs in arrays.
+
+    The missing, i.e. `None`, values of the configs are replaced by 0 and `False`,
+    except `stop_decay_at` which defaults to never stopping.
+    """
+    columns = list(zip(*[get_schedule_values(config) for config in configs])) or [()] * 8
+
+    def to_array(values, dtype, default):
+        return np.array([default if value is None else value for value in values], dtype=dtype)
+
+    return ScheduleParams(initial=to_array(columns[0], np.float64, 0.),
+                          decay_type=np.array(columns[1], dtype=np.int8),
+                          decay_rate=to_array(columns[2], np.float64, 0.),
+                          decay_steps=to_array(columns[3], np.float64, 0.),
+                          start_decay_at=to_array(columns[4], np.float64, 0.),
+                          stop_decay_at=to_array(columns[5], np.float64, np.inf),
+                          minimum=to_array(columns[6], np.float64, 0.),
+                          staircase=to_array(columns[7], np.bool_, False))
+
+
+def _decay(code, initial, decay_rate, decay_steps, decay_step, staircase):
+    """Decays the initial values of some schedules, as the `tf.train` function `code`,
+    over a `(n_schedules, n_steps)` array of steps since the start of the decay."""
+    if code == POLYNOMIAL_DECAY:
+        # The decay rate is the end value reached after `decay_steps` steps, with a power of 1
+        progress = np.minimum(decay_step, decay_steps) / decay_steps
+        return (initial - decay_rate) * (1 - progress) + decay_rate
+
+    progress = decay_step / decay_steps
+    if code == PIECEWISE_CONSTANT:
+        # The configs have no boundaries, the value is multiplied by the decay rate
+        # at every `decay_steps` steps
+        return initial * decay_rate ** np.floor(progress)
+    progress = np.where(staircase, np.floor(progress), progress)
+    if code == EXPONENTIAL_DECAY:
+        return initial * decay_rate ** progress
+    if code == INVERSE_TIME_DECAY:
+        return initial / (1 + decay_rate * progress)
+    return initial * np.exp(-decay_rate * progress)
+
+
+def evaluate_schedule_params(params, steps):
+    """Evaluates many schedules at many steps in one vectorised pass by decay type.
+
+    The schedules follow the `tf.train` decay functions: the value is the initial value
+    before `start_decay_at`, is then decayed over the steps since `start_decay_at`,
+    frozen after `stop_decay_at`, and never goes below the minimum.
+
+    Args:
+        params: `ScheduleParams`.
+        steps: `int | list | array`. The global steps.
+
+    Returns:
+        A float array of shape `(n_schedules, n_steps)`.
+    """
+    steps = np.asarray(steps, dtype=np.float64).reshape(-1)
+    values = np.repeat(params.initial[:, None], steps.size, axis=1)
+    for code in np.unique(params.decay_type):
+        if code == NO_DECAY:
+            continue
+        rows = np.flatnonzero(params.decay_type == code)
+        # The parameters of the schedules of this decay type, as columns
+        selected = ScheduleParams(*[array[rows, None] for array in params])
+        decay_step = np.minimum(steps - selected.start_decay_at,
+                                selected.stop_decay_at - selected.start_decay_at)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            decayed = _decay(code,
+                             initial=selected.initial,
+                             decay_rate=selected.decay_rate,
+                             decay_steps=selected.decay_steps,
+                             decay_step=decay_step,
+                             staircase=selected.staircase)
+        decayed = np.maximum(decayed, selected.minimum)
+        values[rows] = np.where(decay_step < 0, selected.initial, decayed)
+    return values
+
+
+def evaluate_schedules(configs, steps):
+    """Evaluates the learning rates of optimizers, or the exploration rates of decay
+    explorations, e.g. of all the experiments of a group, at many steps.
+
+    Args:
+        configs: `list`. `BaseOptimizerConfig`, `DecayExplorationConfig`, and
+            `RandomDecayExplorationConfig` configs.
+        steps: `int | list | array`. The global steps.
+
+    Returns:
+        A float array of shape `(n_configs, n_steps)`, with the curve of each config.
+    """
+    return evaluate_schedule_params(get_schedule_params(configs), steps)
+
+
+def evaluate_schedule(config, steps):
+    """Evaluates the schedule of a single config, see `evaluate_schedules`."""
+    return evaluate_schedules([config], steps)[0]
@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import six
+
+from collections import Mapping, OrderedDict, namedtuple
+
+from hestia.cached_property import cached_property
 from marshmallow import fields
 
 from polyaxon_schemas.base import BaseConfig, BaseSchema
 from polyaxon_schemas.ops.environments.base import EnvironmentConfig, EnvironmentSchema
 from polyaxon_schemas.ops.environments.pods import PodEnvironmentSchema
+from polyaxon_schemas.utils import TaskType
 
 
 class TensorflowClusterSchema(BaseSchema):
@@ -136,13 +142,105 @@ class MXNetClusterConfig(BaseConfig):
         self.server = server
 
 
+ReplicaEnvironment = namedtuple('ReplicaEnvironment',
+                                'resources node_selector affinity tolerations')
+
+
+class ReplicaEnvironmentIndex(Mapping):
+    """Read only index of the resolved environment of every replica by `(task_type, index)`.
+
+    Replicas without a specific environment share the same `ReplicaEnvironment`,
+    which references the default pod environment values without copying them.
+    """
+
+    def __init__(self, environments, defaults=None):
+        self._environments = environments
+        self._defaults = defaults or {}
+        self._by_task_type = OrderedDict()
+        for (task_type, index), environment in six.iteritems(environments):
+            self._by_task_type.setdefault(task_type, []).append((index, environment))
+
+    def __getitem__(self, key):
+        return self._environments[key]
+
+    def __iter__(self):
+        return iter(self._environments)
+
+    def __len__(self):
+        return len(self._environments)
+
+    def get_values(self, task_type, field, n_replicas=None):
+        """Returns the `{index: value}` of a field for a task type, missing values are omitted.
+
+        With `n_replicas`, e.g. the replicas of the cluster definition, the default value is used
+        for the first `n_replicas` replicas instead of the replicas of the config.
+        """
+        default = self._defaults.get(task_type)
+        values = {}
+        for index, environment in self._by_task_type.get(task_type, []):
+            if n_replicas is not None and environment is default and index >= n_replicas:
+                continue
+            value = getattr(environment, field)
+            if value is not None:
+                values[index] = value
+        default_value = getattr(default, field, None)
+        if n_replicas is not None and default_value is not None:
+            for index in range(n_replicas):
+                values.setdefault(index, default_value)
+        return values
+
+
 class FrameworkEnvironmentMixin(object):
+    # The task types of the workers and ps in the cluster definition
+    TASK_WORKER = TaskType.WORKER
+    TASK_PS = TaskType.PS
+
     @staticmethod
     def _get_env_indexed_property(obj, getter):
         if not obj:
             return {}
         return {o.index: getter(o) for o in obj if getter(o)}
 
+    @staticmethod
+    def _get_replica_environment(pod_environment, default=None):
+        default = default or ReplicaEnvironment(None, None, None, None)
+        return ReplicaEnvironment(*[
+            getattr(pod_environment, field, None) or getattr(default, field)
+            for field in ReplicaEnvironment._fields
+        ])
+
+    @cached_property
+    def replica_environments(self):
+        """The `ReplicaEnvironmentIndex` of the workers and ps of this config.
+
+        A replica uses the values of its indexed environment, e.g. `worker`,
+        and falls back to the values of the default environment, e.g. `default_worker`.
+        """
+        environments = OrderedDict()
+        defaults = {}
+        tasks = (
+            (self.TASK_WORKER, 'n_workers', 'default_worker', 'worker'),
+            (self.TASK_PS, 'n_ps', 'default_ps', 'ps'),
+        )
+        for task_type, n_replicas, default, indexed in tasks:
+            n_replicas = getattr(self, n_replicas, None) or 0
+            default = self._get_replica_environment(getattr(self, default, None))
+            defaults[task_type] = default
+            indexed = {o.index: o for o in getattr(self, indexed, None) or []}
+            for index in range(n_replicas):
+                if index in indexed:
+                    environments[(task_type, index)] = self._get_replica_environment(
+                        indexed[index], default)
+                else:
+                    environments[(task_type, index)] = default
+            # Indexed environments outside of the replicas range do not use the default values
+            for index, pod_environment in six.iteritems(indexed):
+                if (task_type, index) not in environments:
+                    environments[(task_type, index)] = self._get_replica_environment(
+                        pod_environment)
+
+        return ReplicaEnvironmentIndex(environments, defaults)
+
     # @property
     # def default_worker_config(self):
     #     return self.default_worker.config if self.default_worker else None
@@ -399,6 +497,7 @@ class MXNetConfig(BaseConfig, FrameworkEnvironmentMixin):
     """
     IDENTIFIER = 'mxnet'
     SCHEMA = MXNetSchema
+    TASK_PS = TaskType.SERVER
 
     def __init__(self,
                  n_workers=0,
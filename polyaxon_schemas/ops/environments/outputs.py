@@ -30,6 +30,7 @@ class OutputsConfig(BaseConfig):
     """
     IDENTIFIER = 'outputs'
     SCHEMA = OutputsSchema
+    INTERNED = True
 
     def __init__(self, jobs=None, experiments=None):
         self.jobs = jobs
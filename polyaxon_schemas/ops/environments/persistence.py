@@ -27,6 +27,7 @@ class PersistenceConfig(BaseConfig):
     """
     IDENTIFIER = 'persistence'
     SCHEMA = PersistenceSchema
+    INTERNED = True
 
     def __init__(self, data=None, outputs=None):
         self.data = data
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import six
+
+from collections import Mapping, OrderedDict
+
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
+from polyaxon_schemas.ops.environments.resources import K8SResourcesConfig, PodResourcesConfig
+
+
+class ResourceMatrix(object):
+    """Packs the resources of many pods in a single numpy array.
+
+    The values are stored in an array of shape `(n_pods, len(RESOURCES), len(BOUNDS))`,
+    a missing value (e.g. no gpu requested) is stored as `nan`
+    so that it can be told apart from an explicit 0.
+
+    Args:
+        values: `array`. The packed resources.
+        labels: `dict(str, list)`. Optional labels with one value per pod,
+            e.g. `{'project': [...], 'node': [...], 'task_type': [...]}`.
+    """
+    CPU = 'cpu'
+    MEMORY = 'memory'
+    GPU = 'gpu'
+    TPU = 'tpu'
+    RESOURCES = (CPU, MEMORY, GPU, TPU)
+
+    REQUESTS = 'requests'
+    LIMITS = 'limits'
+    BOUNDS = (REQUESTS, LIMITS)
+
+    # `ClusterNodeConfig.memory` is in bytes while pod memory resources are in Mi.
+    NODE_MEMORY_UNIT = 1024 ** 2
+
+    def __init__(self, values, labels=None):
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 3 or values.shape[1:] != (len(self.RESOURCES), len(self.BOUNDS)):
+            raise PolyaxonSchemaError(
+                'ResourceMatrix expects an array of shape (n, {}, {}), received {}.'.format(
+                    len(self.RESOURCES), len(self.BOUNDS), values.shape))
+        self._values = values
+        self._labels = OrderedDict()
+        for key, label_values in six.iteritems(labels or {}):
+            label_values = np.asarray(label_values, dtype=object)
+            if label_values.shape != (len(values),):
+                raise PolyaxonSchemaError(
+                    'The label `{}` must have one value per pod, '
+                    'received {} values for {} pods.'.format(key, len(label_values), len(values)))
+            self._labels[key] = label_values
+
+    @classmethod
+    def _get_resources_row(cls, resources):
+        row = np.full((len(cls.RESOURCES), len(cls.BOUNDS)), np.nan)
+        if not resources:
+            return row
+
+        for i, resource in enumerate(cls.RESOURCES):
+            if isinstance(resources, Mapping):
+                entry = resources.get(resource)
+            else:
+                entry = getattr(resources, resource, None)
+            if not entry:
+                continue
+            for j, bound in enumerate(cls.BOUNDS):
+                if isinstance(entry, Mapping):
+                    value = entry.get(bound)
+                else:
+                    value = getattr(entry, bound, None)
+                if value is not None:
+                    row[i, j] = value
+        return row
+
+    @classmethod
+    def from_resources(cls, resources, **labels):
+        """Creates a matrix from an iterable of `PodResourcesConfig` or resources dicts.
+
+        The dicts have the same shape as `PodResourcesConfig.to_dict()`,
+        e.g. the value returned by `ExperimentSpecification.total_resources`.
+        """
+        resources = list(resources)
+        values = np.full((len(resources), len(cls.RESOURCES), len(cls.BOUNDS)), np.nan)
+        for i, pod_resources in enumerate(resources):
+            values[i] = cls._get_resources_row(pod_resources)
+        return cls(values=values, labels=labels)
+
+    @property
+    def values(self):
+        return self._values
+
+    @property
+    def labels(self):
+        return self._labels
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, resource, bound=REQUESTS):
+        """Returns the column of `resource`/`bound` values, missing values are `nan`."""
+        return self._values[:, self.RESOURCES.index(resource), self.BOUNDS.index(bound)]
+
+    @staticmethod
+    def _reduce(values, axis=0):
+        total = np.nansum(values, axis=axis)
+        total[np.isnan(values).all(axis=axis)] = np.nan
+        return total
+
+    def sum(self):
+        """Returns the total resources as an array of shape `(len(RESOURCES), len(BOUNDS))`."""
+        return self._reduce(self._values)
+
+    def group_by(self, label):
+        """Returns a new matrix with one row per distinct value of `label`.
+
+        The rows are ordered by label value, and the new matrix is labeled by `label` only.
+        """
+        if label not in self._labels:
+            raise PolyaxonSchemaError('The matrix has no label `{}`.'.format(label))
+
+        keys, inverse = np.unique(self._labels[label].astype(str), return_inverse=True)
+        missing = np.isnan(self._values)
+        totals = np.zeros((len(keys),) + self._values.shape[1:])
+        counts = np.zeros((len(keys),) + self._values.shape[1:])
+        np.add.at(totals, inverse, np.where(missing, 0, self._values))
+        np.add.at(counts, inverse, ~missing)
+        totals[counts == 0] = np.nan
+
+        # Keep the original label values instead of their string representation
+        first_indices = np.zeros(len(keys), dtype=int)
+        first_indices[inverse[::-1]] = np.arange(len(inverse))[::-1]
+        return self.__class__(values=totals,
+                              labels={label: self._labels[label][first_indices]})
+
+    @classmethod
+    def get_nodes_capacity(cls, nodes):
+        """Returns the capacity of `ClusterNodeConfig`s as an array `(n_nodes, len(RESOURCES))`.
+
+        Nodes do not report tpus, the tpu capacity is `nan`.
+        """
+        capacity = np.full((len(nodes), len(cls.RESOURCES)), np.nan)
+        for i, node in enumerate(nodes):
+            if node.cpu is not None:
+                capacity[i, 0] = node.cpu
+            if node.memory is not None:
+                capacity[i, 1] = node.memory / cls.NODE_MEMORY_UNIT
+            n_gpus = node.n_gpus if node.n_gpus is not None else len(node.gpus or [])
+            capacity[i, 2] = n_gpus
+        return capacity
+
+    def headroom(self, nodes, bound=REQUESTS, label='node'):
+        """Returns the free resources per node as an array `(n_nodes, len(RESOURCES))`.
+
+        Pods are assigned to nodes by matching the `label` values with the nodes' names,
+        pods that are not assigned to any of the nodes are ignored.
+
+        Args:
+            nodes: `list(ClusterNodeConfig)`. The nodes to compute the headroom for.
+            bound: `str`. The resources bound to use, `requests` or `limits`.
+            label: `str`. The label holding the node name of every pod.
+        """
+        if label not in self._labels:
+            raise PolyaxonSchemaError('The matrix has no label `{}`.'.format(label))
+
+        capacity = self.get_nodes_capacity(nodes)
+        node_indices = {node.name: i for i, node in enumerate(nodes)}
+        pod_nodes = np.array([node_indices.get(n, -1) for n in self._labels[label]], dtype=int)
+        assigned = pod_nodes >= 0
+
+        used = np.zeros_like(capacity)
+        values = self._values[assigned, :, self.BOUNDS.index(bound)]
+        np.add.at(used, pod_nodes[assigned], np.nan_to_num(values))
+        return capacity - used
+
+    def _to_pod_resources(self, row):
+        resources = {}
+        for i, resource in enumerate(self.RESOURCES):
+            if np.isnan(row[i]).all():
+                resources[resource] = None
+                continue
+            bounds = {
+                bound: None if np.isnan(row[i, j]) else row[i, j].item()
+                for j, bound in enumerate(self.BOUNDS)
+            }
+            resources[resource] = K8SResourcesConfig(**bounds)
+        return PodResourcesConfig(**resources)
+
+    def to_pod_resources(self, index=None):
+        """Returns a new `PodResourcesConfig` for the pod at `index`, or for the total if None."""
+        if index is None:
+            return self._to_pod_resources(self.sum())
+        return self._to_pod_resources(self._values[index])
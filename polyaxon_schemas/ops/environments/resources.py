@@ -1,15 +1,146 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
-from marshmallow import fields
+import functools
+import re
+
+from decimal import ROUND_CEILING, Decimal
+
+from marshmallow import ValidationError, fields
 
 from polyaxon_schemas.base import BaseConfig, BaseSchema
 from polyaxon_schemas.utils import FloatOrStr, IntOrStr
 
+QUANTITY_SUFFIXES = {
+    'Ki': Decimal(1024),
+    'Mi': Decimal(1024 ** 2),
+    'Gi': Decimal(1024 ** 3),
+    'Ti': Decimal(1024 ** 4),
+    'Pi': Decimal(1024 ** 5),
+    'Ei': Decimal(1024 ** 6),
+    'n': Decimal('1e-9'),
+    'u': Decimal('1e-6'),
+    'm': Decimal('1e-3'),
+    '': Decimal(1),
+    'k': Decimal('1e3'),
+    'M': Decimal('1e6'),
+    'G': Decimal('1e9'),
+    'T': Decimal('1e12'),
+    'P': Decimal('1e15'),
+    'E': Decimal('1e18'),
+}
+
+QUANTITY_PATTERN = re.compile(r'^([0-9]*\.?[0-9]+(?:[eE][+-]?[0-9]+)?|[0-9]+\.)([a-zA-Z]*)$')
+
+# Parsed quantities by raw value, the same few values are used by most pods
+_CPU_QUANTITIES = {}
+_MEMORY_QUANTITIES = {}
+_MAX_CACHED_QUANTITIES = 1024
+
+# k8s quantities are int64 in their smallest unit
+_MAX_QUANTITY = Decimal(2 ** 63 - 1)
+
+
+def parse_quantity(value):
+    """Returns the decimal value of a k8s quantity, e.g. `500m`, `2Gi`, `1.5`, `1e3` or 2."""
+    if isinstance(value, (int, float)):
+        # `not value >= 0` also rejects nan
+        if not value >= 0 or value == float('inf'):
+            raise ValueError('`{}` is not a valid quantity.'.format(value))
+        return Decimal(repr(value))
+
+    match = QUANTITY_PATTERN.match(value.strip())
+    if not match or match.group(2) not in QUANTITY_SUFFIXES:
+        raise ValueError('`{}` is not a valid quantity.'.format(value))
+    try:
+        return Decimal(match.group(1)) * QUANTITY_SUFFIXES[match.group(2)]
+    except ArithmeticError:  # The decimal errors, e.g. `InvalidOperation` and `Overflow`
+        raise ValueError('`{}` is not a valid quantity.'.format(value))
+
+
+def _to_int(value):
+    # k8s rounds quantities up to the smallest unit
+    if value > _MAX_QUANTITY:
+        raise ValueError('`{}` is too large for a quantity.'.format(value))
+    return int(value.to_integral_value(rounding=ROUND_CEILING))
+
+
+def _get_cached_quantity(cache, value, scale):
+    if value is None:
+        return None
+    # Checked before the lookup since `True == 1`
+    if isinstance(value, bool):
+        raise ValueError('`{}` is not a valid quantity.'.format(value))
+    if value not in cache:
+        if len(cache) >= _MAX_CACHED_QUANTITIES:
+            cache.clear()
+        try:
+            cache[value] = _to_int(parse_quantity(value) * scale)
+        except ArithmeticError:
+            raise ValueError('`{}` is not a valid quantity.'.format(value))
+    return cache[value]
+
+
+def get_cpu_millicores(value):
+    """Returns the cpu quantity in millicores, e.g. `500m` -> 500, 1.5 -> 1500."""
+    return _get_cached_quantity(_CPU_QUANTITIES, value, 1000)
+
+
+def get_memory_bytes(value):
+    """Returns the memory quantity in bytes, e.g. `1Ki` -> 1024, `1k` -> 1000."""
+    return _get_cached_quantity(_MEMORY_QUANTITIES, value, 1)
+
+
+def to_cpu_quantity(millicores):
+    """Returns the canonical k8s string of a cpu in millicores."""
+    if millicores is None:
+        return None
+    if millicores % 1000 == 0:
+        return '{}'.format(millicores // 1000)
+    return '{}m'.format(millicores)
+
+
+class CpuQuantity(FloatOrStr):
+    default_error_messages = {
+        'invalid': 'Not a valid cpu quantity.',
+        'invalid_utf8': 'Not a valid utf-8 string.'
+    }
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        value = super(CpuQuantity, self)._deserialize(value=value, attr=attr, data=data)
+        try:
+            get_cpu_millicores(value)
+        except ValueError as e:
+            raise ValidationError('{}'.format(e))
+        return value
+
+
+class MemoryQuantity(IntOrStr):
+    default_error_messages = {
+        'invalid': 'Not a valid memory quantity.',
+        'invalid_utf8': 'Not a valid utf-8 string.'
+    }
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        value = super(MemoryQuantity, self)._deserialize(value=value, attr=attr, data=data)
+        try:
+            get_memory_bytes(value)
+        except ValueError as e:
+            raise ValidationError('{}'.format(e))
+        return value
+
+
+def _add_values(value1, value2):
+    if value1 is None:
+        return value2
+    if value2 is None:
+        return value1
+    return value1 + value2
+
 
 class K8SResourcesEntrySchema(BaseSchema):
-    cpu = FloatOrStr(allow_none=True)
-    memory = IntOrStr(allow_none=True)
+    cpu = CpuQuantity(allow_none=True)
+    memory = MemoryQuantity(allow_none=True)
     gpu = fields.Int(allow_none=True)
     tpu = fields.Int(allow_none=True)
 
@@ -18,7 +149,20 @@ class K8SResourcesEntrySchema(BaseSchema):
         return K8SResourcesEntryConfig
 
 
+@functools.total_ordering
 class K8SResourcesEntryConfig(BaseConfig):
+    """
+    K8S resources entry config.
+
+    The `cpu` and `memory` quantities are kept as provided for dumping,
+    and normalized once in `cpu_millicores` and `memory_bytes`.
+
+    Args:
+        cpu: `float | str`. e.g. 0.5 or `500m`.
+        memory: `int | str`. e.g. 1024 or `2Gi`.
+        gpu: `int`.
+        tpu: `int`.
+    """
     SCHEMA = K8SResourcesEntrySchema
     REDUCED_ATTRIBUTES = ['cpu', 'memory', 'gpu', 'tpu']
 
@@ -28,6 +172,74 @@ class K8SResourcesEntryConfig(BaseConfig):
         self.gpu = gpu
         self.tpu = tpu
 
+    @property
+    def cpu(self):
+        return self._cpu
+
+    @cpu.setter
+    def cpu(self, value):
+        self._cpu_millicores = get_cpu_millicores(value)
+        self._cpu = value
+
+    @property
+    def memory(self):
+        return self._memory
+
+    @memory.setter
+    def memory(self, value):
+        self._memory_bytes = get_memory_bytes(value)
+        self._memory = value
+
+    @property
+    def cpu_millicores(self):
+        return self._cpu_millicores
+
+    @property
+    def memory_bytes(self):
+        return self._memory_bytes
+
+    @property
+    def quantities(self):
+        return self._cpu_millicores, self._memory_bytes, self.gpu, self.tpu
+
+    @property
+    def sort_key(self):
+        """The quantities where missing values count as 0."""
+        return tuple(q or 0 for q in self.quantities)
+
+    @classmethod
+    def from_quantities(cls, cpu_millicores=None, memory_bytes=None, gpu=None, tpu=None):
+        return cls(cpu=to_cpu_quantity(cpu_millicores), memory=memory_bytes, gpu=gpu, tpu=tpu)
+
+    def __eq__(self, other):
+        if not isinstance(other, K8SResourcesEntryConfig):
+            return NotImplemented
+        return self.quantities == other.quantities
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __lt__(self, other):
+        if not isinstance(other, K8SResourcesEntryConfig):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __hash__(self):
+        return hash(self.quantities)
+
+    def __add__(self, other):
+        if not other:
+            return self
+        return self.from_quantities(
+            *[_add_values(q1, q2) for q1, q2 in zip(self.quantities, other.quantities)])
+
+    def __radd__(self, other):
+        # Supports `sum(entries)`
+        if other == 0:
+            return self
+        return self.__add__(other)
+
 
 class K8SContainerResourcesSchema(BaseSchema):
     limits = fields.Nested(K8SResourcesEntrySchema, allow_none=True)
@@ -38,10 +250,14 @@ class K8SContainerResourcesSchema(BaseSchema):
         return K8SContainerResourcesConfig
 
 
+@functools.total_ordering
 class K8SContainerResourcesConfig(BaseConfig):
     """
     K8S container resources config.
 
+    Containers resources can be compared, sorted (by requests then limits) and summed,
+    the sum returns a new config.
+
     Args:
         limits: `K8SResourcesEntry`.
         requests: `K8SResourcesEntry`.
@@ -54,6 +270,45 @@ class K8SContainerResourcesConfig(BaseConfig):
         self.limits = limits
         self.requests = requests
 
+    @property
+    def quantities(self):
+        return (self.requests.quantities if self.requests else None,
+                self.limits.quantities if self.limits else None)
+
+    @property
+    def sort_key(self):
+        return (self.requests.sort_key if self.requests else (0, 0, 0, 0),
+                self.limits.sort_key if self.limits else (0, 0, 0, 0))
+
+    def __eq__(self, other):
+        if not isinstance(other, K8SContainerResourcesConfig):
+            return NotImplemented
+        return self.quantities == other.quantities
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __lt__(self, other):
+        if not isinstance(other, K8SContainerResourcesConfig):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __hash__(self):
+        return hash(self.quantities)
+
+    def __add__(self, other):
+        if not other:
+            return self
+        return K8SContainerResourcesConfig(limits=_add_values(self.limits, other.limits),
+                                           requests=_add_values(self.requests, other.requests))
+
+    def __radd__(self, other):
+        # Supports `sum(resources)`
+        if other == 0:
+            return self
+        return self.__add__(other)
+
 
 class K8SResourcesSchema(BaseSchema):
     limits = fields.Float(allow_none=True)
@@ -97,6 +97,7 @@ class ExperimentConfig(BaseRunConfig):
     SCHEMA = ExperimentSchema
     IDENTIFIER = 'experiment'
     REDUCED_ATTRIBUTES = BaseRunConfig.REDUCED_ATTRIBUTES + ['backend', 'framework']
+    LAZY_ATTRIBUTES = ['run', 'model', 'train', 'eval']
 
     def __init__(self,
                  kind=None,
@@ -29,9 +29,10 @@ class ForConfig(BaseConfig):
         parsed_data = []
         length = parser.parse_expression(spec, self.len, declarations, check_operators=True)
         length = int(length)
+        # The enclosing declarations take precedence over the loop index
+        declarations = parser.get_scope(declarations)
         for i in range(length):
-            i_declarations = {self.index: i}
-            i_declarations.update(declarations)
+            i_declarations = declarations.with_defaults({self.index: i})
             parsed_data.append(
                 parser.parse_expression(spec, self.do, i_declarations, check_operators=True))
         if parsed_data and isinstance(parsed_data[0], (list, tuple)):
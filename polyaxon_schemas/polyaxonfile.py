@@ -1,15 +1,25 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import multiprocessing
 import os
+import six
+import time
 
-import rhea
+from collections import namedtuple
 
 from hestia.list_utils import to_list
+from rhea import RheaError
 
 from polyaxon_schemas.exceptions import PolyaxonConfigurationError, PolyaxonfileError
 from polyaxon_schemas.specs import SPECIFICATION_BY_KIND
 from polyaxon_schemas.specs.base import BaseSpecification
+from polyaxon_schemas.specs.libs import reader
+
+try:
+    from os import scandir
+except ImportError:  # python 2
+    scandir = None
 
 DEFAULT_POLYAXON_FILE_NAME = [
     'polyaxon',
@@ -25,6 +35,16 @@ DEFAULT_POLYAXON_FILE_EXTENSION = [
     'json'
 ]
 
+# The default file names, in order of precedence
+DEFAULT_POLYAXON_FILES = [
+    '{}.{}'.format(filename, ext)
+    for filename in DEFAULT_POLYAXON_FILE_NAME
+    for ext in DEFAULT_POLYAXON_FILE_EXTENSION
+]
+
+ValidationResult = namedtuple('ValidationResult', 'filepaths kind errors duration')
+CatalogEntry = namedtuple('CatalogEntry', 'filepath mtime kind specification errors')
+
 
 class PolyaxonFile(object):
     """Parses Polyaxonfiles, and validate that it respects the current file specification"""
@@ -35,7 +55,7 @@ class PolyaxonFile(object):
             if not os.path.isfile(filepath):
                 raise PolyaxonfileError("`{}` must be a valid file".format(filepath))
         self._filenames = [os.path.basename(filepath) for filepath in filepaths]
-        data = rhea.read(filepaths)
+        data = reader.read(filepaths)
         kind = BaseSpecification.get_kind(data=data)
         try:
             self.specification = SPECIFICATION_BY_KIND[kind](data)
@@ -49,8 +69,231 @@ class PolyaxonFile(object):
     @staticmethod
     def check_default_path(path):
         path = os.path.abspath(path)
-        for filename in DEFAULT_POLYAXON_FILE_NAME:
-            for ext in DEFAULT_POLYAXON_FILE_EXTENSION:
-                filepath = os.path.join(path, '{}.{}'.format(filename, ext))
+        try:
+            filenames = set(os.listdir(path))
+        except OSError:
+            return None
+        for filename in DEFAULT_POLYAXON_FILES:
+            if filename in filenames:
+                filepath = os.path.join(path, filename)
                 if os.path.isfile(filepath):
                     return filepath
+
+
+def prevalidate(values):
+    """Checks the structure of polyaxonfile values against the JSON Schema of their kind.
+
+    Malformed values are rejected before parsing their templates and loading their configs.
+
+    Args:
+        values: `str | dict | list(str | dict)`. The values of the polyaxonfile.
+
+    Returns:
+        dict: the data read, to be used to create the specification.
+
+    Raises:
+        PolyaxonfileError
+    """
+    try:
+        data = reader.read(values)
+    except RheaError as e:
+        raise PolyaxonfileError(e)
+    kind = BaseSpecification.get_kind(data=data)
+    SPECIFICATION_BY_KIND[kind].prevalidate(data)
+    return data
+
+
+def validate_file(filepaths):
+    """Validates a polyaxonfile and returns a `ValidationResult` instead of raising.
+
+    Args:
+        filepaths: `str | list(str)`. The path(s) of the polyaxonfile, same as `PolyaxonFile`.
+    """
+    start = time.time()
+    kind = None
+    errors = []
+    try:
+        kind = PolyaxonFile(filepaths).specification.kind
+    except Exception as e:  # pylint:disable=broad-except
+        errors.append('{}: {}'.format(e.__class__.__name__, e))
+    return ValidationResult(filepaths=filepaths,
+                            kind=kind,
+                            errors=errors,
+                            duration=time.time() - start)
+
+
+def validate_many(paths, workers=None, chunksize=None):
+    """Validates many polyaxonfiles in a pool of processes.
+
+    The parsing and validation are CPU bound, so the files are validated in `workers`
+    processes, each process keeps its templates and quantities caches for all its files.
+    The results are yielded as soon as they are available, i.e. not in the order of `paths`.
+
+    Args:
+        paths: `list(str | list(str))`. The polyaxonfiles to validate.
+        workers: `int`. The number of processes, defaults to the number of cpus,
+            with 1 the files are validated in the current process.
+        chunksize: `int`. The number of files sent to a process at once,
+            defaults to a quarter of the files per process.
+
+    Returns:
+        generator(ValidationResult)
+    """
+    return _imap_unordered(validate_file, paths, workers=workers, chunksize=chunksize)
+
+
+def _imap_unordered(func, items, workers=None, chunksize=None):
+    items = list(items)
+    workers = min(workers or multiprocessing.cpu_count(), len(items))
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    chunksize = chunksize or max(1, len(items) // (workers * 4))
+    pool = multiprocessing.Pool(workers)
+    try:
+        for result in pool.imap_unordered(func, items, chunksize):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _iter_dir(path):
+    """Yields the `(name, path, is_dir, is_file)` of a directory's entries.
+
+    Symlinks to directories are not followed, so that walking a tree never loops.
+    """
+    if scandir is not None:
+        for entry in scandir(path):
+            is_dir = entry.is_dir(follow_symlinks=False)
+            yield entry.name, entry.path, is_dir, not is_dir and entry.is_file()
+        return
+
+    for name in os.listdir(path):
+        entry_path = os.path.join(path, name)
+        is_dir = os.path.isdir(entry_path) and not os.path.islink(entry_path)
+        yield name, entry_path, is_dir, not is_dir and os.path.isfile(entry_path)
+
+
+def find_polyaxonfiles(path, filenames=None, skip_hidden=True):
+    """Walks a tree once, and yields the `(filepath, mtime)` of the polyaxonfiles under it.
+
+    Args:
+        path: `str`. The root of the tree.
+        filenames: `list(str)`. The file names to look for, defaults to all default names.
+        skip_hidden: `bool`. Whether to skip the hidden directories, e.g. `.git`.
+    """
+    filenames = frozenset(DEFAULT_POLYAXON_FILES if filenames is None else filenames)
+    stack = [os.path.abspath(path)]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            entries = list(_iter_dir(dirpath))
+        except OSError:
+            continue
+        for name, entry_path, is_dir, is_file in entries:
+            if is_dir:
+                if not (skip_hidden and name.startswith('.')):
+                    stack.append(entry_path)
+            elif is_file and name in filenames:
+                try:
+                    yield entry_path, os.stat(entry_path).st_mtime
+                except OSError:
+                    continue
+
+
+def load_file(filepath_mtime):
+    """Loads a polyaxonfile and returns a `CatalogEntry` instead of raising.
+
+    Args:
+        filepath_mtime: `tuple(str, float)`. The path of the polyaxonfile and its mtime.
+    """
+    filepath, mtime = filepath_mtime
+    kind = None
+    specification = None
+    errors = []
+    try:
+        specification = PolyaxonFile(filepath).specification
+        kind = specification.kind
+        # Returned from a pool process, the specification is not parsed again in the parent
+        specification.PICKLE_PARSED_STATE = True
+    except Exception as e:  # pylint:disable=broad-except
+        errors.append('{}: {}'.format(e.__class__.__name__, e))
+    return CatalogEntry(filepath=filepath,
+                        mtime=mtime,
+                        kind=kind,
+                        specification=specification,
+                        errors=errors)
+
+
+class PolyaxonFilesCatalog(object):
+    """A catalogue of the polyaxonfiles under a directory, indexed by kind.
+
+    The tree is walked once per scan, and the new or modified files are parsed in a pool
+    of processes. A re-scan only parses the files whose mtime changed since the last scan,
+    and drops the files that were removed.
+
+    Args:
+        path: `str`. The root of the tree.
+        workers: `int`. The number of processes used to parse the files, see `validate_many`.
+        filenames: `list(str)`. The file names to look for, defaults to all default names.
+        skip_hidden: `bool`. Whether to skip the hidden directories, e.g. `.git`.
+    """
+
+    def __init__(self, path, workers=None, filenames=None, skip_hidden=True):
+        self.path = os.path.abspath(path)
+        self.workers = workers
+        self.filenames = filenames
+        self.skip_hidden = skip_hidden
+        self._entries = {}
+        self._by_kind = {}
+
+    def scan(self):
+        """Scans the tree, and returns the paths of the files that were (re)parsed."""
+        mtimes = dict(find_polyaxonfiles(self.path,
+                                         filenames=self.filenames,
+                                         skip_hidden=self.skip_hidden))
+        for filepath in set(self._entries) - set(mtimes):
+            self._remove(filepath)
+
+        changed = sorted(
+            (filepath, mtime) for filepath, mtime in six.iteritems(mtimes)
+            if filepath not in self._entries or self._entries[filepath].mtime != mtime)
+        for entry in _imap_unordered(load_file, changed, workers=self.workers):
+            self._remove(entry.filepath)
+            self._entries[entry.filepath] = entry
+            if entry.kind:
+                self._by_kind.setdefault(entry.kind, {})[entry.filepath] = entry.specification
+        return [filepath for filepath, _ in changed]
+
+    def _remove(self, filepath):
+        entry = self._entries.pop(filepath, None)
+        if entry and entry.kind:
+            self._by_kind[entry.kind].pop(filepath, None)
+            if not self._by_kind[entry.kind]:
+                del self._by_kind[entry.kind]
+
+    @property
+    def entries(self):
+        return self._entries
+
+    @property
+    def kinds(self):
+        return set(self._by_kind)
+
+    @property
+    def errors(self):
+        return {filepath: entry.errors
+                for filepath, entry in six.iteritems(self._entries) if entry.errors}
+
+    def get_specifications(self, kind):
+        """Returns the `{filepath: specification}` of the valid polyaxonfiles of a kind."""
+        return self._by_kind.get(kind, {})
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, filepath):
+        return os.path.abspath(filepath) in self._entries
@@ -2,7 +2,6 @@
 from __future__ import absolute_import, division, print_function
 
 import abc
-import copy
 import six
 
 from collections import Mapping
@@ -11,15 +10,34 @@ import rhea
 
 from hestia.cached_property import cached_property
 from hestia.list_utils import to_list
-from marshmallow import EXCLUDE, ValidationError
+from marshmallow import EXCLUDE, ValidationError, missing
+from rhea.utils import deep_update
 
 from polyaxon_schemas.exceptions import PolyaxonConfigurationError, PolyaxonfileError
 from polyaxon_schemas.ops.environments.base import EnvironmentConfig
 from polyaxon_schemas.ops.operators import ForConfig, IfConfig
-from polyaxon_schemas.specs.libs import validator
+from polyaxon_schemas.specs.libs import prevalidator, reader, validator
+from polyaxon_schemas.specs.libs.dependencies import DependenciesIndex
 from polyaxon_schemas.specs.libs.parser import Parser
 
 
+def unpickle_specification(spec, data, lazy, sections, parsed_state):
+    """Rebuilds a specification pickled by `BaseSpecification.__reduce__`.
+
+    Without a parsed state, the data is parsed again on the first access to the specification.
+    """
+    obj = spec.__new__(spec)
+    obj._data = data  # pylint:disable=protected-access
+    obj._values = [data]  # pylint:disable=protected-access
+    obj._lazy = lazy  # pylint:disable=protected-access
+    obj._sections = sections  # pylint:disable=protected-access
+    if parsed_state:
+        obj.__dict__.update(parsed_state)
+    else:
+        obj._pickled = True  # pylint:disable=protected-access
+    return obj
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BaseSpecification(object):
     """Base abstract specification for plyaxonfiles and configurations."""
@@ -57,6 +75,11 @@ class BaseSpecification(object):
     STD_PARSING_SECTIONS = (BACKEND, FRAMEWORK, ENVIRONMENT, LOGGING, TAGS, HP_TUNING)
     OP_PARSING_SECTIONS = (BUILD, RUN, )
 
+    # The sections needed to admit or queue a run, e.g. `read(values, sections=...)`
+    SCHEDULING_SECTIONS = (
+        VERSION, KIND, LOGGING, TAGS, BACKEND, FRAMEWORK, ENVIRONMENT, BUILD, HP_TUNING
+    )
+
     HEADER_SECTIONS = (
         VERSION, KIND, LOGGING, TAGS
     )
@@ -79,11 +102,55 @@ class BaseSpecification(object):
     ENVIRONMENT_CONFIG = EnvironmentConfig
     CONFIG = None
 
-    def __init__(self, values):
+    # Whether pickling includes the parsed state, so that it is not parsed again when unpickled,
+    # can be set per specification, e.g. for the specifications sent back by a pool process
+    PICKLE_PARSED_STATE = False
+    PARSED_STATE_ATTRIBUTES = (
+        '_headers',
+        '_parsed_data',
+        '_validated_data',
+        '_config',
+        '_test_parsed_data',
+        '_test_validated_data',
+    )
+
+    def __init__(self, values, lazy=False, sections=None):
+        self._lazy = lazy
+        self._sections = self.get_parsing_sections(sections)
+        self._set_data(values)
+        self._parsed_data = None
+        self._validated_data = None
+        self._config = None
+        self._set_parsed_data()
+        self._extra_validation()
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, an unpickled specification is rebuilt once
+        if not self.__dict__.pop('_pickled', False):
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                self.__class__.__name__, name))
+        self.__init__(self._data, lazy=self._lazy, sections=self._sections)
+        return getattr(self, name)
+
+    def __reduce__(self):
+        """Pickles the specification as its read data, and optionally its parsed state.
+
+        The cached properties, and the raw values, are not pickled.
+        """
+        parsed_state = None
+        if self.PICKLE_PARSED_STATE and not self.__dict__.get('_pickled'):
+            parsed_state = {
+                attr: self.__dict__[attr] for attr in self.PARSED_STATE_ATTRIBUTES
+                if attr in self.__dict__
+            }
+        return unpickle_specification, (
+            self.__class__, self._data, self._lazy, self._sections, parsed_state)
+
+    def _set_data(self, values):
         self._values = to_list(values)
 
         try:
-            self._data = rhea.read(self._values)
+            self._data = reader.read(self._values)
         except rhea.RheaError as e:
             raise PolyaxonConfigurationError(e)
         self.check_data()
@@ -92,11 +159,6 @@ class BaseSpecification(object):
             self._headers = validator.validate_headers(spec=self, data=headers)
         except ValidationError as e:
             raise PolyaxonConfigurationError(e)
-        self._parsed_data = None
-        self._validated_data = None
-        self._config = None
-        self._set_parsed_data()
-        self._extra_validation()
 
     def _extra_validation(self):
         pass
@@ -106,10 +168,24 @@ class BaseSpecification(object):
         return self._config
 
     def _set_config(self, data):
-        self._config = self.CONFIG.from_dict(copy.deepcopy(data))
+        # Loading a config does not mutate the data, the parsed data is shared not copied
+        # With `lazy`, the config's lazy sections are materialised on first access
+        self._config = self.CONFIG.from_dict(data, lazy=self._lazy)
+
+    @classmethod
+    def get_parsing_sections(cls, sections):
+        """Returns the sections to parse, the version and kind are always parsed."""
+        if sections is None:
+            return None
+        return frozenset(sections) | {cls.VERSION, cls.KIND}
+
+    @property
+    def sections(self):
+        """The parsed sections, or None if all the sections are parsed."""
+        return self._sections
 
     def _set_parsed_data(self):
-        parsed_data = Parser.parse(self, self._data, None)
+        parsed_data = Parser.parse(self, self._data, None, sections=self._sections)
         if self.CONFIG:
             self._set_config(parsed_data)
         else:
@@ -162,9 +238,118 @@ class BaseSpecification(object):
                 raise PolyaxonfileError("{} is a required section for a valid Polyaxonfile".format(
                     key))
 
+    @classmethod
+    def get_jsonschema(cls):
+        """Returns the JSON Schema of the raw data of this specification, built once."""
+        return prevalidator.get_jsonschema(cls)
+
+    @classmethod
+    def prevalidate(cls, data):
+        """Checks the structure of the raw data, i.e. before parsing the data.
+
+        The sections, the keys and the types of the values are checked with the compiled
+        JSON Schema of this specification, so that malformed data can be rejected early.
+        Data passing the prevalidation can still be invalid.
+        """
+        errors = prevalidator.get_prevalidator(cls)(data)
+        if errors:
+            raise PolyaxonfileError("The Polyaxonfile is not valid for kind `{}`: {}".format(
+                cls._SPEC_KIND, ' '.join(errors)))
+
     def patch(self, values):
-        values = [self._parsed_data] + to_list(values)
-        return self.read(values=values)
+        """Returns a new specification with the values merged on top of this specification's data.
+
+        Only the sections changed by the values, and the sections referencing declarations
+        whose values changed, are parsed and validated again,
+        the parsed data and the config objects of the other sections are reused.
+        """
+        values = [self._data] + to_list(values)
+        if not self.CONFIG or self._parsed_data is None:
+            return self.read(values=values)
+
+        spec = self.__class__.__new__(self.__class__)
+        spec._lazy = self._lazy  # pylint:disable=protected-access
+        spec._sections = self._sections  # pylint:disable=protected-access
+        spec._set_data(values)  # pylint:disable=protected-access
+        spec._set_patched_data(self)  # pylint:disable=protected-access
+        spec._extra_validation()  # pylint:disable=protected-access
+        return spec
+
+    def upgrade(self, sections=None):
+        """Returns a specification with more parsed sections, by default all the sections.
+
+        The data is not read again, the parsed data and the config objects
+        of the sections already parsed by this specification are reused.
+        """
+        if self._sections is None:
+            return self
+        sections = None if sections is None else self._sections | set(sections)
+        if not self.CONFIG or self._parsed_data is None:
+            return self.__class__(self._data, lazy=self._lazy, sections=sections)
+
+        spec = self.__class__.__new__(self.__class__)
+        spec._lazy = self._lazy  # pylint:disable=protected-access
+        spec._sections = sections  # pylint:disable=protected-access
+        spec._values = self._values  # pylint:disable=protected-access
+        spec._data = self._data  # pylint:disable=protected-access
+        spec._headers = self._headers  # pylint:disable=protected-access
+        new_sections = {
+            section for section in self._data
+            if section not in self._sections and (sections is None or section in sections)
+        }
+        spec._set_sections_data(  # pylint:disable=protected-access
+            self, new_sections, declarations=self.parsed_data.get(self.DECLARATIONS) or {})
+        spec._extra_validation()  # pylint:disable=protected-access
+        return spec
+
+    def get_changed_sections(self, spec):
+        """Returns the sections to parse again compared to the data of `spec`."""
+        sections = {
+            section for section in set(self._data) | set(spec.data)
+            if self._data.get(section) != spec.data.get(section)
+        }
+        if self.DECLARATIONS not in sections:
+            return sections
+
+        old_declarations = spec.parsed_data.get(self.DECLARATIONS) or {}
+        declarations = Parser.parse_declarations(spec=self, data=self._data)
+        changed_names = {
+            name for name in set(old_declarations) | set(declarations)
+            if name not in old_declarations or name not in declarations or
+            old_declarations[name] != declarations[name]
+        }
+        return sections | self.dependencies.get_sections(changed_names)
+
+    def _set_patched_data(self, spec):
+        sections = self.get_changed_sections(spec)
+        if self._sections is not None:
+            sections &= self._sections
+        self._set_sections_data(spec, sections)
+
+    def _set_sections_data(self, spec, sections, declarations=None):
+        """Parses and loads the sections, the other sections are reused from `spec`."""
+        parsed_data = Parser.parse(
+            self, self._data, None, sections=sections, declarations=declarations)
+        for section in self._data:
+            if section not in sections and section in spec.parsed_data:
+                parsed_data[section] = spec.parsed_data[section]
+
+        schema = self.CONFIG.SCHEMA()  # pylint:disable=not-callable
+        kwargs = {}
+        for name, field in six.iteritems(schema.fields):
+            if name not in sections:
+                kwargs[name] = getattr(spec.config, name)
+                continue
+            try:
+                value = field.deserialize(parsed_data.get(name, missing))
+            except ValidationError as e:
+                raise ValidationError({name: e.messages})
+            if value is not missing:
+                kwargs[name] = value
+
+        schema.validate_loaded_data(kwargs)
+        self._config = self.CONFIG(**kwargs)  # pylint:disable=not-callable
+        self._parsed_data = parsed_data
 
     @classmethod
     def get_kind(cls, data):
@@ -172,10 +357,18 @@ class BaseSpecification(object):
         return data[cls.KIND]
 
     @classmethod
-    def read(cls, values):
+    def read(cls, values, lazy=False, sections=None):
+        """Reads a specification.
+
+        Args:
+            values: the values of the specification, see `reader.read`.
+            lazy: `bool`. If True, the config's lazy sections are materialised on first access.
+            sections: `list`. Optional, only these sections are parsed and loaded,
+                e.g. `SCHEDULING_SECTIONS`, the others are `None` until `upgrade` is called.
+        """
         if isinstance(values, cls):
             return values
-        return cls(values)
+        return cls(values, lazy=lazy, sections=sections)
 
     @cached_property
     def is_experiment(self):
@@ -217,9 +410,19 @@ class BaseSpecification(object):
     def parsed_data(self):
         return self._parsed_data
 
+    @cached_property
+    def dependencies(self):
+        """The index of the data's templates by referenced name, e.g. declarations."""
+        return DependenciesIndex.from_data(
+            data=self._data,
+            sections=set(self._data) - {self.VERSION, self.KIND},
+            declarations_section=self.DECLARATIONS)
+
     @cached_property
     def raw_data(self):
-        return '{}'.format(self._data)
+        # The data is not copied when read, nested mappings (e.g. OrderedDict) are converted
+        # to dicts so that the raw data can be read again
+        return '{}'.format(deep_update({}, self._data))
 
     @cached_property
     def version(self):
@@ -3,17 +3,38 @@ from __future__ import absolute_import, division, print_function
 
 import six
 
-from polyaxon_schemas.ops.environments.resources import PodResourcesConfig
-from polyaxon_schemas.specs.utils import (
-    get_task_configs,
-    get_task_job_affinities,
-    get_task_job_node_selectors,
-    get_task_job_resources,
-    get_task_job_tolerations
-)
+from collections import OrderedDict
+
+from polyaxon_schemas.specs.utils import get_task_configs
 from polyaxon_schemas.utils import TaskType
 
 
+def sum_pod_resources(resources_counts):
+    """Returns the total of `(PodResourcesConfig, count)` pairs as a dict.
+
+    The result has the same values as adding the `PodResourcesConfig`s one by one, `count` times,
+    and calling `to_dict` on the total.
+    """
+    total = OrderedDict()
+    for resource in ('cpu', 'memory', 'gpu', 'tpu'):
+        total[resource] = None
+        for pod_resources, count in resources_counts:
+            k8s_resources = getattr(pod_resources, resource)
+            if not k8s_resources:
+                continue
+            if total[resource] is None:
+                total[resource] = OrderedDict([('limits', None), ('requests', None)])
+            for bound in total[resource]:
+                value = getattr(k8s_resources, bound)
+                if value:
+                    total[resource][bound] = (total[resource][bound] or 0) + value * count
+
+        for bound in total[resource] or {}:
+            if total[resource][bound] is not None:
+                total[resource][bound] = float(total[resource][bound])
+    return total
+
+
 class DistributedSpecificationInterface(object):
     TASK_WORKER = TaskType.WORKER
     TASK_PS = TaskType.PS
@@ -52,104 +73,136 @@ class DistributedSpecificationInterface(object):
                                 default_config=environment.default_ps_config,
                                 task_type=cls.TASK_PS)
 
+    @staticmethod
+    def _get_replica_values(environment, cluster, is_distributed, task_type, field):
+        if not is_distributed:
+            return {}
+        return environment.replica_environments.get_values(
+            task_type=task_type, field=field, n_replicas=cluster.get(task_type, 0))
+
     @classmethod
     def get_worker_resources(cls, environment, cluster, is_distributed):
         if not environment:
             return None
 
-        return get_task_job_resources(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            resources=environment.worker_resources,
-            default_resources=environment.default_worker_resources,
-            task_type=cls.TASK_WORKER)
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_WORKER,
+                                       field='resources')
 
     @classmethod
     def get_ps_resources(cls, environment, cluster, is_distributed):
         if not environment:
             return None
-        return get_task_job_resources(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            resources=environment.ps_resources,
-            default_resources=environment.default_ps_resources,
-            task_type=cls.TASK_PS)
+
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_PS,
+                                       field='resources')
+
+    @staticmethod
+    def _get_task_resources_counts(n_replicas, resources, default_resources):
+        """Returns the `(resources, count)` pairs of a task's replicas.
+
+        The replicas without specific resources use the default resources.
+        """
+        resources_counts = [(r, 1) for r in six.itervalues(resources)]
+        if default_resources:
+            n_specific = len([i for i in resources
+                              if isinstance(i, six.integer_types) and 0 <= i < n_replicas])
+            resources_counts.append((default_resources, n_replicas - n_specific))
+        return resources_counts
 
     @classmethod
     def get_total_resources(cls, master_resources, environment, cluster, is_distributed):
-        pass
+        resources_counts = []
+        if master_resources:
+            resources_counts.append((master_resources, 1))
+
+        if environment and is_distributed:
+            resources_counts += cls._get_task_resources_counts(
+                n_replicas=cluster.get(cls.TASK_WORKER, 0),
+                resources=environment.worker_resources,
+                default_resources=environment.default_worker_resources)
+            if cls.TASK_PS in cluster:
+                resources_counts += cls._get_task_resources_counts(
+                    n_replicas=cluster[cls.TASK_PS],
+                    resources=environment.ps_resources,
+                    default_resources=environment.default_ps_resources)
+
+        resources_counts = [(r, count) for r, count in resources_counts if count > 0]
+        if not resources_counts:
+            return None
+
+        return sum_pod_resources(resources_counts)
 
     @classmethod
     def get_worker_node_selectors(cls, environment, cluster, is_distributed):
         if not environment:
             return {}
 
-        return get_task_job_node_selectors(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            node_selectors=environment.worker_node_selectors,
-            default_node_selector=environment.default_worker_node_selector,
-            task_type=cls.TASK_WORKER)
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_WORKER,
+                                       field='node_selector')
 
     @classmethod
     def get_ps_node_selectors(cls, environment, cluster, is_distributed):
         if not environment:
             return {}
 
-        return get_task_job_node_selectors(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            node_selectors=environment.ps_node_selectors,
-            default_node_selector=environment.default_ps_node_selector,
-            task_type=cls.TASK_PS)
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_PS,
+                                       field='node_selector')
 
     @classmethod
     def get_worker_tolerations(cls, environment, cluster, is_distributed):
         if not environment:
             return {}
 
-        return get_task_job_tolerations(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            tolerations=environment.worker_tolerations,
-            default_tolerations=environment.default_worker_tolerations,
-            task_type=cls.TASK_WORKER)
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_WORKER,
+                                       field='tolerations')
 
     @classmethod
     def get_ps_tolerations(cls, environment, cluster, is_distributed):
         if not environment:
             return {}
 
-        return get_task_job_tolerations(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            tolerations=environment.ps_tolerations,
-            default_tolerations=environment.default_ps_tolerations,
-            task_type=cls.TASK_PS)
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_PS,
+                                       field='tolerations')
 
     @classmethod
     def get_worker_affinities(cls, environment, cluster, is_distributed):
         if not environment:
             return {}
 
-        return get_task_job_affinities(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            affinities=environment.worker_affinities,
-            default_affinity=environment.default_worker_affinity,
-            task_type=cls.TASK_WORKER)
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_WORKER,
+                                       field='affinity')
 
     @classmethod
     def get_ps_affinities(cls, environment, cluster, is_distributed):
         if not environment:
             return {}
 
-        return get_task_job_affinities(
-            cluster=cluster,
-            is_distributed=is_distributed,
-            affinities=environment.ps_affinities,
-            default_affinity=environment.default_ps_affinity,
-            task_type=cls.TASK_PS)
+        return cls._get_replica_values(environment=environment,
+                                       cluster=cluster,
+                                       is_distributed=is_distributed,
+                                       task_type=cls.TASK_PS,
+                                       field='affinity')
 
 
 class TensorflowSpecification(DistributedSpecificationInterface):
@@ -176,34 +229,6 @@ class TensorflowSpecification(DistributedSpecificationInterface):
 
         return cluster, is_distributed
 
-    @classmethod
-    def get_total_resources(cls, master_resources, environment, cluster, is_distributed):
-        worker_resources = cls.get_worker_resources(
-            environment=environment,
-            cluster=cluster,
-            is_distributed=is_distributed,
-        )
-        ps_resources = cls.get_ps_resources(
-            environment=environment,
-            cluster=cluster,
-            is_distributed=is_distributed,
-        )
-        if not any([master_resources, worker_resources, ps_resources]):
-            return None
-
-        total_resources = PodResourcesConfig()
-
-        if master_resources:
-            total_resources += master_resources
-
-        for w_resources in six.itervalues(worker_resources or {}):
-            total_resources += w_resources
-
-        for p_resources in six.itervalues(ps_resources or {}):
-            total_resources += p_resources
-
-        return total_resources.to_dict()
-
 
 class HorovodSpecification(DistributedSpecificationInterface):
     @staticmethod
@@ -228,27 +253,6 @@ class HorovodSpecification(DistributedSpecificationInterface):
 
         return cluster, is_distributed
 
-    @classmethod
-    def get_total_resources(cls, master_resources, environment, cluster, is_distributed):
-        worker_resources = cls.get_worker_resources(
-            environment=environment,
-            cluster=cluster,
-            is_distributed=is_distributed,
-        )
-
-        if not any([master_resources, worker_resources]):
-            return None
-
-        total_resources = PodResourcesConfig()
-
-        if master_resources:
-            total_resources += master_resources
-
-        for w_resources in six.itervalues(worker_resources or {}):
-            total_resources += w_resources
-
-        return total_resources.to_dict()
-
 
 class PytorchSpecification(DistributedSpecificationInterface):
     @staticmethod
@@ -273,27 +277,6 @@ class PytorchSpecification(DistributedSpecificationInterface):
 
         return cluster, is_distributed
 
-    @classmethod
-    def get_total_resources(cls, master_resources, environment, cluster, is_distributed):
-        worker_resources = cls.get_worker_resources(
-            environment=environment,
-            cluster=cluster,
-            is_distributed=is_distributed,
-        )
-
-        if not any([master_resources, worker_resources]):
-            return None
-
-        total_resources = PodResourcesConfig()
-
-        if master_resources:
-            total_resources += master_resources
-
-        for w_resources in six.itervalues(worker_resources or {}):
-            total_resources += w_resources
-
-        return total_resources.to_dict()
-
 
 class MXNetSpecification(DistributedSpecificationInterface):
     TASK_PS = TaskType.SERVER
@@ -321,34 +304,6 @@ class MXNetSpecification(DistributedSpecificationInterface):
 
         return cluster, is_distributed
 
-    @classmethod
-    def get_total_resources(cls, master_resources, environment, cluster, is_distributed):
-        worker_resources = cls.get_worker_resources(
-            environment=environment,
-            cluster=cluster,
-            is_distributed=is_distributed,
-        )
-        ps_resources = cls.get_ps_resources(
-            environment=environment,
-            cluster=cluster,
-            is_distributed=is_distributed,
-        )
-        if not any([master_resources, worker_resources, ps_resources]):
-            return None
-
-        total_resources = PodResourcesConfig()
-
-        if master_resources:
-            total_resources += master_resources
-
-        for w_resources in six.itervalues(worker_resources or {}):
-            total_resources += w_resources
-
-        for p_resources in six.itervalues(ps_resources or {}):
-            total_resources += p_resources
-
-        return total_resources.to_dict()
-
 
 class MPISpecification(DistributedSpecificationInterface):
     @staticmethod
@@ -372,24 +327,3 @@ class MPISpecification(DistributedSpecificationInterface):
             is_distributed = True
 
         return cluster, is_distributed
-
-    @classmethod
-    def get_total_resources(cls, master_resources, environment, cluster, is_distributed):
-        worker_resources = cls.get_worker_resources(
-            environment=environment,
-            cluster=cluster,
-            is_distributed=is_distributed,
-        )
-
-        if not any([master_resources, worker_resources]):
-            return None
-
-        total_resources = PodResourcesConfig()
-
-        if master_resources:
-            total_resources += master_resources
-
-        for w_resources in six.itervalues(worker_resources or {}):
-            total_resources += w_resources
-
-        return total_resources.to_dict()
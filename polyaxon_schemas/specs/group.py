@@ -6,8 +6,6 @@ import six
 from hestia.cached_property import cached_property
 
 from polyaxon_schemas.exceptions import PolyaxonConfigurationError
-from polyaxon_schemas.ops.build import BuildConfig
-from polyaxon_schemas.ops.environments.persistence import PersistenceConfig
 from polyaxon_schemas.ops.group import GroupConfig
 from polyaxon_schemas.ops.hptuning import SearchAlgorithms
 from polyaxon_schemas.specs.base import BaseSpecification
@@ -57,8 +55,19 @@ class GroupSpecification(BaseSpecification):
     )
     CONFIG = GroupConfig
 
-    def __init__(self, values):
-        super(GroupSpecification, self).__init__(values)
+    # The sections validated with the same configs as the group config's sections
+    SHARED_CONFIG_SECTIONS = (
+        BaseSpecification.BUILD,
+        BaseSpecification.RUN,
+        MODEL,
+        TRAIN,
+        EVAL,
+    )
+
+    def __init__(self, values, lazy=False, sections=None):
+        self._test_parsed_data = None
+        self._test_validated_data = None
+        super(GroupSpecification, self).__init__(values, lazy=lazy, sections=sections)
         self._set_config(self._data)
 
     def _extra_validation(self):
@@ -66,16 +75,46 @@ class GroupSpecification(BaseSpecification):
             raise PolyaxonConfigurationError(
                 'A matrix definition is required for group specification.')
 
+    def _set_config(self, data):
+        # The hptuning section is already validated with the headers
+        data = {
+            k: v for k, v in six.iteritems(data)
+            if k != self.HP_TUNING and (self._sections is None or k in self._sections)
+        }
+        # The sections without templates do not depend on the test declarations,
+        # their validated configs are reused instead of validating them again
+        templated_sections = {path[0] for path in self.dependencies.references}
+        validated_sections = {}
+        for section in self.SHARED_CONFIG_SECTIONS:
+            validated_section = self._test_validated_data.get(section)
+            if validated_section is not None and section not in templated_sections:
+                validated_sections[section] = validated_section
+                del data[section]
+        super(GroupSpecification, self)._set_config(data)
+        for section, validated_section in six.iteritems(validated_sections):
+            setattr(self._config, section, validated_section)
+        self._config.hptuning = self.hptuning
+
     def _set_parsed_data(self):
         # We need to validate that the data is correct
-        # For that we just use a matrix declaration test
-        parsed_data = Parser.parse(self, self._data, self.matrix_declaration_test)
-        validator.validate(spec=self, data=parsed_data)
+        # For that we just use a matrix declaration test,
+        # the result is kept for the properties that do not depend on the matrix values
+        parsed_data = Parser.parse(
+            self, self._data, self.matrix_declaration_test, sections=self._sections)
+        self._test_validated_data = validator.validate(spec=self, data=parsed_data)
+        self._test_parsed_data = parsed_data
 
     def get_experiment_spec(self, matrix_declaration):
         """Returns an experiment spec for this group spec and the given matrix declaration."""
-        parsed_data = Parser.parse(self, self._data, matrix_declaration)
-        del parsed_data[self.HP_TUNING]
+        # Only the sections depending on the matrix values are parsed
+        sections = self.dependencies.get_sections(matrix_declaration or {})
+        if self._sections is not None:
+            # The sections not parsed by this spec are required by the experiment
+            sections |= set(self._data) - self._sections - {self.HP_TUNING}
+        parsed_data = Parser.parse(self, self._data, matrix_declaration, sections=sections)
+        for section, value in six.iteritems(self._test_parsed_data):
+            parsed_data.setdefault(section, value)
+        parsed_data.pop(self.HP_TUNING, None)
         validator.validate(spec=self, data=parsed_data)
         return ExperimentSpecification(values=[parsed_data, {'kind': self._EXPERIMENT}])
 
@@ -83,18 +122,17 @@ class GroupSpecification(BaseSpecification):
         """Returns a build spec for this group spec."""
         if BaseSpecification.BUILD not in self._data:
             return None
-        return BuildConfig.from_dict(self._data[BaseSpecification.BUILD])
+        # The config's build is validated from the same raw build section
+        return self.config.build
 
     @cached_property
     def build(self):
-        build_spec = self.get_build_spec()
-        return self.get_build_spec() if build_spec else None
+        return self.get_build_spec()
 
     @cached_property
     def environment(self):
         # This is a hack, in the future we need to gather the paths of the experiments
-        parsed_data = Parser.parse(self, self._data, self.matrix_declaration_test)
-        return parsed_data.get(self.ENVIRONMENT, None)
+        return self._test_parsed_data.get(self.ENVIRONMENT, None)
 
     @cached_property
     def secret_refs(self):
@@ -106,8 +144,8 @@ class GroupSpecification(BaseSpecification):
 
     @cached_property
     def persistence(self):
-        persistence = self.environment.get('persistence') if self.environment else None
-        return PersistenceConfig.from_dict(persistence) if persistence else None
+        environment = self._test_validated_data.get(self.ENVIRONMENT)
+        return environment.persistence if environment else None
 
     @cached_property
     def hptuning(self):
@@ -119,6 +157,13 @@ class GroupSpecification(BaseSpecification):
             return self.hptuning.matrix
         return None
 
+    @cached_property
+    def unused_matrix_declarations(self):
+        """The matrix values that are not used by any section, directly or through declarations."""
+        if not self.matrix:
+            return set()
+        return self.dependencies.get_unused_names(self.matrix)
+
     @cached_property
     def matrix_space(self):
         if not self.matrix:
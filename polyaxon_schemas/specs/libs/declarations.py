@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+from collections import Mapping
+
+
+class DeclarationsScope(Mapping):
+    """A layered, read-only view over declarations, similar to `ChainMap`.
+
+    Lookups go through the layers in order, the first layer declaring a key wins.
+    Creating a nested scope, e.g. for every iteration of a `for` operator,
+    only adds a layer and never copies the enclosing declarations.
+
+    The scope can be used directly as the context of a jinja template.
+    """
+
+    def __init__(self, *maps):
+        self.maps = list(maps) or [{}]
+
+    @classmethod
+    def get_scope(cls, declarations):
+        """Returns the declarations if they are already a scope, otherwise a scope wrapping them."""
+        if isinstance(declarations, cls):
+            return declarations
+        return cls(declarations if declarations is not None else {})
+
+    def new_child(self, values=None):
+        """Returns a new scope where `values` take precedence over this scope's declarations."""
+        return self.__class__(values if values is not None else {}, *self.maps)
+
+    def with_defaults(self, values):
+        """Returns a new scope where `values` are only used for keys not declared in this scope."""
+        return self.__class__(*(self.maps + [values]))
+
+    def copy(self):
+        """Returns the declarations as a new dict, e.g. for jinja's error reporting."""
+        return dict(self)
+
+    def __getitem__(self, key):
+        for mapping in self.maps:
+            if key in mapping:
+                return mapping[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(key in mapping for mapping in self.maps)
+
+    def __iter__(self):
+        seen = set()
+        for mapping in self.maps:
+            for key in mapping:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self):
+        return len(set().union(*self.maps))
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, ', '.join(repr(m) for m in self.maps))
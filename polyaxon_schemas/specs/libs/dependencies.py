@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import six
+
+from collections import Mapping
+
+from polyaxon_schemas.specs.libs.parser import Parser
+
+
+class DependenciesIndex(object):
+    """Reverse index from the names referenced by templates to the templated leaves of some data.
+
+    A leaf is identified by its path, a tuple starting with the section,
+    followed by the keys and list indices leading to the templated value (or key).
+    The declarations' leaves are indexed as well,
+    so that the dependencies through other declarations can be followed.
+
+    Args:
+        references: `dict(tuple, set)`. The names referenced by every templated leaf's path.
+        declarations_section: `str`. The section holding the declarations.
+    """
+
+    def __init__(self, references, declarations_section='declarations'):
+        self.references = references
+        self.declarations_section = declarations_section
+        self._index = {}
+        for path, names in six.iteritems(references):
+            for name in names:
+                self._index.setdefault(name, set()).add(path)
+
+    @classmethod
+    def from_data(cls, data, sections=None, declarations_section='declarations'):
+        """Creates the index of the templated leaves of the data's sections, by default all."""
+        references = {}
+        stack = [((section,), value) for section, value in six.iteritems(data)
+                 if sections is None or section in sections]
+        while stack:
+            path, expression = stack.pop()
+            if isinstance(expression, Mapping):
+                for key, value in six.iteritems(expression):
+                    stack.append((path + (key,), key))
+                    stack.append((path + (key,), value))
+            elif isinstance(expression, (list, tuple)):
+                stack.extend((path + (i,), value) for i, value in enumerate(expression))
+            elif isinstance(expression, six.string_types):
+                names = Parser.get_referenced_names(expression)
+                if names:
+                    references.setdefault(path, set()).update(names)
+        return cls(references=references, declarations_section=declarations_section)
+
+    @property
+    def names(self):
+        """The names referenced by at least one leaf."""
+        return set(self._index)
+
+    def get_dependent_names(self, names):
+        """Returns the names and, transitively, the declarations depending on them."""
+        names = set(names)
+        queue = list(names)
+        while queue:
+            for path in self._index.get(queue.pop(), ()):
+                if path[0] == self.declarations_section and len(path) > 1:
+                    if path[1] not in names:
+                        names.add(path[1])
+                        queue.append(path[1])
+        return names
+
+    def get_paths(self, names):
+        """Returns the paths of the leaves depending, directly or through declarations, on names."""
+        paths = set()
+        for name in self.get_dependent_names(names):
+            paths |= self._index.get(name, set())
+        return paths
+
+    def get_sections(self, names):
+        """Returns the sections with at least one leaf depending on the names."""
+        return {path[0] for path in self.get_paths(names)}
+
+    def get_unused_names(self, names):
+        """Returns the names that no section, other than the declarations, depends on.
+
+        E.g. matrix values that are not used cost nothing to vary, and only multiply experiments.
+        """
+        return {
+            name for name in names
+            if not self.get_sections([name]) - {self.declarations_section}
+        }
@@ -2,17 +2,22 @@
 from __future__ import absolute_import, division, print_function
 
 import ast
-import copy
 import jinja2
 import numpy as np
 import six
 
 from collections import Mapping, defaultdict
+from jinja2 import meta
 
 from hestia.list_utils import to_list
 from rhea.utils import deep_update
 
 from polyaxon_schemas.exceptions import PolyaxonfileError
+from polyaxon_schemas.specs.libs.declarations import DeclarationsScope
+
+# Rendering with a shared context uses `Template.root_render_func`, which is not part of jinja's
+# public API, only with the jinja versions where it was checked
+JINJA_SHARED_CONTEXT = jinja2.__version__.split('.')[0] == '2'
 
 
 class Parser(object):
@@ -20,6 +25,21 @@ class Parser(object):
 
     env = jinja2.Environment()
 
+    # Compiled templates by source, the same expressions are rendered for every file and loop
+    _templates = {}
+    _MAX_CACHED_TEMPLATES = 1024
+
+    # The renders of an expression until it evaluates to itself, e.g. declarations referencing
+    # themselves never do
+    _MAX_RENDERS = 100
+
+    # The parsing tasks of `parse_expression`
+    _PARSE = 'parse'
+    _ITEM = 'item'
+    _TUPLE = 'tuple'
+
+    _GRAPH_KEYS = ('graph', 'encoder', 'decoder', 'feature_processors')
+
     @classmethod
     def get_headers(cls, spec, data):
         parsed_data = {
@@ -29,11 +49,35 @@ class Parser(object):
         return parsed_data
 
     @classmethod
-    def parse(cls, spec, data, matrix_declarations=None):  # pylint:disable=too-many-branches
-        declarations = copy.copy(data.get(spec.DECLARATIONS, {}))
-        matrix_declarations = copy.copy(matrix_declarations)
+    def parse_declarations(cls, spec, data, matrix_declarations=None):
+        declarations = data.get(spec.DECLARATIONS) or {}
         if matrix_declarations:
-            declarations = deep_update(matrix_declarations, declarations)
+            # Merged in a new dict, the declarations take precedence over the matrix values
+            declarations = deep_update(deep_update({}, matrix_declarations), declarations)
+
+        if declarations:
+            declarations = cls.parse_expression(spec, declarations, declarations)
+        return declarations
+
+    @classmethod
+    def parse(cls,  # pylint:disable=too-many-branches
+              spec,
+              data,
+              matrix_declarations=None,
+              sections=None,
+              declarations=None):
+        """Parses the data of a specification.
+
+        Args:
+            spec: `BaseSpecification`. The specification (class) of the data.
+            data: `dict`. The data to parse.
+            matrix_declarations: `dict`. Optional values to add to the declarations.
+            sections: `set`. Optional, only these sections are parsed,
+                the version, kind and declarations are always returned.
+            declarations: `dict`. Optional, the already parsed declarations of the data.
+        """
+        if declarations is None:
+            declarations = cls.parse_declarations(spec, data, matrix_declarations)
 
         parsed_data = {
             spec.VERSION: data[spec.VERSION],
@@ -41,29 +85,52 @@ class Parser(object):
         }
 
         if declarations:
-            declarations = cls.parse_expression(spec, declarations, declarations)
             parsed_data[spec.DECLARATIONS] = declarations
+        declarations = cls.get_scope(declarations)
+
+        def should_parse(section):
+            return section in data and (sections is None or section in sections)
 
         for section in spec.STD_PARSING_SECTIONS:
-            if section in data:
+            if should_parse(section):
                 parsed_data[section] = cls.parse_expression(spec, data[section], declarations)
 
         for section in spec.OP_PARSING_SECTIONS:
-            if section in data:
+            if should_parse(section):
                 parsed_data[section] = cls.parse_expression(
                     spec, data[section], declarations, True, False)
 
-        if spec.RUN in data:
+        if should_parse(spec.RUN):
             parsed_data[spec.RUN] = cls.parse_expression(
                 spec, data[spec.RUN], declarations, True, False)
 
         for section in spec.GRAPH_SECTIONS:
-            if section in data:
+            if should_parse(section):
                 parsed_data[section] = cls.parse_expression(
                     spec, data[section], declarations, True, True)
 
         return parsed_data
 
+    @classmethod
+    def get_referenced_names(cls, expression):
+        """Returns the names referenced by the templates of an expression.
+
+        The names include the declarations, but also e.g. the `for` operators' indices.
+        """
+        names = set()
+        stack = [expression]
+        while stack:
+            expression = stack.pop()
+            if isinstance(expression, Mapping):
+                for key, value in six.iteritems(expression):
+                    stack.append(key)
+                    stack.append(value)
+            elif isinstance(expression, (list, tuple)):
+                stack.extend(expression)
+            elif isinstance(expression, six.string_types) and '{' in expression:
+                names |= meta.find_undeclared_variables(cls.env.parse(expression))
+        return names
+
     @classmethod
     def parse_expression(cls,  # pylint:disable=too-many-branches
                          spec,
@@ -71,61 +138,142 @@ class Parser(object):
                          declarations,
                          check_operators=False,
                          check_graph=False):
-        if isinstance(expression, (int, float, complex, type(None))):
-            return expression
-        if isinstance(expression, np.integer):
-            return int(expression)
-        if isinstance(expression, np.floating):
-            return float(expression)
-        if isinstance(expression, Mapping):
-            if len(expression) == 1:
-                old_key, value = list(six.iteritems(expression))[0]
-                # always parse the keys, they must be base object or evaluate to base objects
-                key = cls.parse_expression(spec, old_key, declarations)
-                if check_operators and cls.is_operator(spec, key):
-                    return cls._parse_operator(spec, {key: value}, declarations)
-                if check_graph and key in ['graph', 'encoder', 'decoder']:
-                    return {key: cls._parse_graph(spec, value, declarations)}
-                if check_graph and key == 'feature_processors':  # noqa, no-else-return
-                    return {
-                        key: {
-                            cls.parse_expression(spec, f_key, declarations):
-                                cls._parse_graph(spec, f_vlaue, declarations)
-                            for f_key, f_vlaue in six.iteritems(value)
+        """Parses an expression, i.e. a value, a template, or a nested mapping/list of those.
+
+        The nested mappings and sequences are walked with an explicit stack,
+        and the parsed containers are created before their items and filled in place,
+        so the parsing depth of a document is not limited by the recursion limit.
+        Operators and graph sections are parsed as a whole when they are reached.
+        """
+        result = [None]
+        # Every task is (task, expression, check_operators, check_graph, container, key)
+        stack = [(cls._PARSE, expression, check_operators, check_graph, result, 0)]
+        while stack:
+            task, expression, check_operators, check_graph, container, key = stack.pop()
+            if task == cls._TUPLE:
+                # The items were parsed in the list `expression`
+                container[key] = tuple(expression)
+                continue
+
+            if task == cls._ITEM:
+                # A key/value item of a mapping with many keys,
+                # an operator's result is merged in the mapping
+                item_key, value = expression
+                item_key = cls.parse_expression(spec, item_key, declarations)
+                if check_operators and cls.is_operator(spec, item_key):
+                    container.update(cls._parse_operator(spec, {item_key: value}, declarations))
+                elif check_graph and item_key in cls._GRAPH_KEYS:
+                    container[item_key] = cls._parse_graph_section(
+                        spec, item_key, value, declarations)
+                else:
+                    stack.append((cls._PARSE, value, check_operators, check_graph,
+                                  container, item_key))
+                continue
+
+            if isinstance(expression, (int, float, complex, type(None))):
+                container[key] = expression
+            elif isinstance(expression, np.integer):
+                container[key] = int(expression)
+            elif isinstance(expression, np.floating):
+                container[key] = float(expression)
+            elif isinstance(expression, Mapping):
+                if len(expression) == 1:
+                    item_key, value = list(six.iteritems(expression))[0]
+                    # always parse the keys, they must be base object or evaluate to base objects
+                    item_key = cls.parse_expression(spec, item_key, declarations)
+                    if check_operators and cls.is_operator(spec, item_key):
+                        container[key] = cls._parse_operator(
+                            spec, {item_key: value}, declarations)
+                    elif check_graph and item_key in cls._GRAPH_KEYS:
+                        container[key] = {
+                            item_key: cls._parse_graph_section(spec, item_key, value, declarations)
                         }
-                    }
+                    else:
+                        container[key] = {item_key: None}
+                        stack.append((cls._PARSE, value, check_operators, check_graph,
+                                      container[key], item_key))
                 else:
-                    return {
-                        key: cls.parse_expression(
-                            spec, value, declarations, check_operators, check_graph)
-                    }
-
-            new_expression = {}
-            for k, v in six.iteritems(expression):
-                new_expression.update(
-                    cls.parse_expression(spec, {k: v}, declarations, check_operators, check_graph))
-            return new_expression
-
-        if isinstance(expression, list):
-            return list(cls.parse_expression(spec, v, declarations, check_operators, check_graph)
-                        for v in expression)
-        if isinstance(expression, tuple):
-            return tuple(cls.parse_expression(spec, v, declarations, check_operators, check_graph)
-                         for v in expression)
-        if isinstance(expression, six.string_types):
-            return cls._evaluate_expression(
-                spec, expression, declarations, check_operators, check_graph)
+                    container[key] = {}
+                    stack.extend(
+                        (cls._ITEM, item, check_operators, check_graph, container[key], None)
+                        for item in reversed(list(six.iteritems(expression))))
+            elif isinstance(expression, (list, tuple)):
+                items = [None] * len(expression)
+                if isinstance(expression, tuple):
+                    stack.append((cls._TUPLE, items, check_operators, check_graph, container, key))
+                else:
+                    container[key] = items
+                stack.extend(
+                    (cls._PARSE, expression[i], check_operators, check_graph, items, i)
+                    for i in reversed(range(len(expression))))
+            elif isinstance(expression, six.string_types):
+                container[key] = cls._evaluate_expression(
+                    spec, expression, declarations, check_operators, check_graph)
+            else:
+                container[key] = None
+
+        return result[0]
+
+    @staticmethod
+    def get_scope(declarations):
+        """Returns a `DeclarationsScope` over the declarations, without copying them."""
+        return DeclarationsScope.get_scope(declarations)
+
+    @classmethod
+    def get_template(cls, expression):
+        """Returns the compiled template of the expression, templates are cached by source."""
+        template = cls._templates.get(expression)
+        if template is None:
+            if len(cls._templates) >= cls._MAX_CACHED_TEMPLATES:
+                cls._templates.clear()
+            template = cls.env.from_string(expression)
+            cls._templates[expression] = template
+        return template
+
+    @classmethod
+    def render(cls, expression, declarations):
+        """Renders the expression with the declarations as the template context.
+
+        Same as `Template.render`, but with `JINJA_SHARED_CONTEXT`, the declarations are used
+        as a shared context instead of being copied to a new dict for every expression.
+        """
+        template = cls.get_template(expression)
+        context = cls.get_scope(declarations).with_defaults(template.globals)
+        if JINJA_SHARED_CONTEXT:
+            return u''.join(template.root_render_func(template.new_context(context, shared=True)))
+        return template.render(context)
 
     @classmethod
     def _evaluate_expression(cls, spec, expression, declarations, check_operators, check_graph):
-        result = cls.env.from_string(expression).render(**declarations)
-        if result == expression:
-            try:
-                return ast.literal_eval(result)
-            except (ValueError, SyntaxError):
-                pass
-            return result
-        return cls.parse_expression(spec, result, declarations, check_operators, check_graph)
+        # Templates are rendered until they evaluate to themselves
+        original_expression = expression
+        result = cls.render(expression, declarations)
+        n_renders = 1
+        while result != expression:
+            if n_renders >= cls._MAX_RENDERS:
+                raise PolyaxonfileError(
+                    'The expression `{}` does not resolve after {} renders, '
+                    'check the declarations {} for circular references.'.format(
+                        original_expression, n_renders,
+                        sorted(cls.get_referenced_names(original_expression))))
+            expression = result
+            result = cls.render(expression, declarations)
+            n_renders += 1
+        try:
+            return ast.literal_eval(result)
+        except (ValueError, SyntaxError):
+            pass
+        return result
+
+    @classmethod
+    def _parse_graph_section(cls, spec, key, value, declarations):
+        if key == 'feature_processors':
+            return {
+                cls.parse_expression(spec, f_key, declarations):
+                    cls._parse_graph(spec, f_value, declarations)
+                for f_key, f_value in six.iteritems(value)
+            }
+        return cls._parse_graph(spec, value, declarations)
 
     @classmethod
     def _parse_operator(cls, spec, expression, declarations):
@@ -164,8 +312,9 @@ class Parser(object):
 
             return layer_value['name']
 
-        layers_declarations = {}
-        layers_declarations.update(declarations)
+        # The tags are declared once the first layer is parsed
+        graph_declarations = {}
+        layers_declarations = cls.get_scope(declarations).new_child(graph_declarations)
 
         last_layer = None
         first_layer = True
@@ -228,7 +377,7 @@ class Parser(object):
                 layers.append({layer_type: layer_value})
 
                 # Update layers_declarations
-                layers_declarations['tags'] = tags
+                graph_declarations['tags'] = tags
 
                 # Update last_layer
                 last_layer = layer_value
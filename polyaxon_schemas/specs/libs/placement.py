@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import six
+
+from collections import namedtuple
+
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
+from polyaxon_schemas.ops.environments.resource_matrix import ResourceMatrix
+from polyaxon_schemas.specs.frameworks import (
+    HorovodSpecification,
+    MPISpecification,
+    MXNetSpecification,
+    PytorchSpecification,
+    TensorflowSpecification
+)
+from polyaxon_schemas.utils import TaskType
+
+Replica = namedtuple('Replica', 'task_type index resources node_selector tolerations')
+
+
+class PlacementStrategy(object):
+    FIRST_FIT_DECREASING = 'first_fit_decreasing'
+    BEST_FIT = 'best_fit'
+
+    VALUES = [FIRST_FIT_DECREASING, BEST_FIT]
+
+
+# The config attribute holding the framework environment and its specification
+FRAMEWORK_SPECIFICATIONS = (
+    ('tensorflow', TensorflowSpecification),
+    ('horovod', HorovodSpecification),
+    ('mxnet', MXNetSpecification),
+    ('pytorch', PytorchSpecification),
+    ('mpi', MPISpecification),
+)
+
+
+def get_replicas(spec):
+    """Returns the list of replicas, with their resources and constraints, of an experiment spec."""
+    cluster, is_distributed = spec.cluster_def
+    replicas = []
+    if TaskType.MASTER in cluster:
+        replicas.append(Replica(task_type=TaskType.MASTER,
+                                index=0,
+                                resources=spec.master_resources,
+                                node_selector=spec.master_node_selector,
+                                tolerations=spec.master_tolerations))
+    if not is_distributed:
+        return replicas
+
+    def add_task_replicas(task_type, resources, node_selectors, tolerations):
+        for i in range(cluster.get(task_type, 0)):
+            replicas.append(Replica(task_type=task_type,
+                                    index=i,
+                                    resources=resources.get(i),
+                                    node_selector=node_selectors.get(i),
+                                    tolerations=tolerations.get(i)))
+
+    for attr, framework_spec in FRAMEWORK_SPECIFICATIONS:
+        environment = getattr(spec.config, attr, None)
+        if not environment:
+            continue
+
+        kwargs = dict(environment=environment, cluster=cluster, is_distributed=is_distributed)
+        add_task_replicas(task_type=framework_spec.TASK_WORKER,
+                          resources=framework_spec.get_worker_resources(**kwargs) or {},
+                          node_selectors=framework_spec.get_worker_node_selectors(**kwargs),
+                          tolerations=framework_spec.get_worker_tolerations(**kwargs))
+        if framework_spec.TASK_PS in cluster:
+            add_task_replicas(task_type=framework_spec.TASK_PS,
+                              resources=framework_spec.get_ps_resources(**kwargs) or {},
+                              node_selectors=framework_spec.get_ps_node_selectors(**kwargs),
+                              tolerations=framework_spec.get_ps_tolerations(**kwargs))
+        break
+
+    return replicas
+
+
+def tolerates(tolerations, taint):
+    """Checks if one of the tolerations matches the taint, following the k8s semantics."""
+    for toleration in tolerations or []:
+        if toleration.get('effect') and toleration['effect'] != taint.get('effect'):
+            continue
+        key = toleration.get('key')
+        operator = toleration.get('operator', 'Equal')
+        if not key and operator == 'Exists':
+            return True
+        if key != taint.get('key'):
+            continue
+        if operator == 'Exists' or toleration.get('value') == taint.get('value'):
+            return True
+    return False
+
+
+class PlacementReport(object):
+    """The result of a placement simulation.
+
+    Args:
+        nodes: `list(ClusterNodeConfig)`. The nodes of the simulated cluster.
+        capacity: `array`. The nodes' capacity, shape `(n_nodes, len(RESOURCES))`.
+        used: `array`. The nodes' allocated resources, same shape as `capacity`.
+        assignments: `list(list(str) | None)`. For every job, the node name of each replica
+            in `get_replicas` order, or None if the job could not be scheduled.
+    """
+
+    def __init__(self, nodes, capacity, used, assignments):
+        self.nodes = nodes
+        self.capacity = capacity
+        self.used = used
+        self.assignments = assignments
+
+    @property
+    def unschedulable_jobs(self):
+        return [i for i, assignment in enumerate(self.assignments) if assignment is None]
+
+    @property
+    def n_unschedulable_jobs(self):
+        return len(self.unschedulable_jobs)
+
+    @property
+    def n_scheduled_jobs(self):
+        return len(self.assignments) - self.n_unschedulable_jobs
+
+    @property
+    def utilization(self):
+        """The cluster-wide utilization per resource, `nan` for resources without capacity."""
+        capacity = self.capacity.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return dict(zip(PlacementSimulator.RESOURCES,
+                            np.where(capacity > 0, self.used.sum(axis=0) / capacity, np.nan)))
+
+    @property
+    def node_utilization(self):
+        """The utilization per node and resource, `nan` for resources without capacity."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.capacity > 0, self.used / self.capacity, np.nan)
+
+
+class PlacementSimulator(object):
+    """Simulates the placement of experiments' replicas on the nodes of a cluster.
+
+    Jobs are placed atomically, if one of its replicas cannot be placed,
+    the job is marked as unschedulable and none of its replicas is kept.
+    The feasibility of a replica is checked against all nodes at once.
+
+    Args:
+        cluster: `PolyaxonClusterConfig | list(ClusterNodeConfig)`. The cluster to simulate.
+        node_labels: `dict(str, dict)`. Optional labels per node name,
+            used to honour the replicas' `node_selector`.
+        node_taints: `dict(str, list(dict))`. Optional taints per node name,
+            used to honour the replicas' `tolerations`. Nodes without explicit taints
+            and with `schedulable_taints=False` are considered tainted with `NoSchedule`.
+    """
+    # Nodes do not report tpus, so only these resources are checked
+    RESOURCES = (ResourceMatrix.CPU, ResourceMatrix.MEMORY, ResourceMatrix.GPU)
+
+    def __init__(self, cluster, node_labels=None, node_taints=None):
+        nodes = cluster if isinstance(cluster, (list, tuple)) else cluster.nodes
+        self.nodes = [node for node in nodes or [] if node.schedulable_state is not False]
+        self.node_labels = node_labels or {}
+        self.node_taints = node_taints or {}
+        capacity = ResourceMatrix.get_nodes_capacity(self.nodes)[:, :len(self.RESOURCES)]
+        self.capacity = np.nan_to_num(capacity)
+        self._eligibility_cache = {}
+
+    def _get_node_labels(self, node):
+        labels = {'kubernetes.io/hostname': node.hostname or node.name}
+        labels.update(self.node_labels.get(node.name, {}))
+        return labels
+
+    def _get_node_taints(self, node):
+        if node.name in self.node_taints:
+            return [taint for taint in self.node_taints[node.name]
+                    if taint.get('effect') != 'PreferNoSchedule']
+        if node.schedulable_taints is False:
+            return [{'effect': 'NoSchedule'}]
+        return []
+
+    def _get_eligible_nodes(self, node_selector, tolerations):
+        key = (tuple(sorted(six.iteritems(node_selector or {}))),
+               tuple(tuple(sorted(six.iteritems(t))) for t in tolerations or []))
+        if key not in self._eligibility_cache:
+            self._eligibility_cache[key] = np.array([
+                all(labels.get(k) == v for k, v in six.iteritems(node_selector or {})) and
+                all(tolerates(tolerations, taint) for taint in self._get_node_taints(node))
+                for node, labels in ((n, self._get_node_labels(n)) for n in self.nodes)
+            ], dtype=bool)
+        return self._eligibility_cache[key]
+
+    @classmethod
+    def get_demands(cls, replicas):
+        """Returns the requested resources of the replicas, limits are used if no requests."""
+        matrix = ResourceMatrix.from_resources(r.resources for r in replicas)
+        requests = np.stack([matrix.get(r, ResourceMatrix.REQUESTS) for r in cls.RESOURCES],
+                            axis=-1)
+        limits = np.stack([matrix.get(r, ResourceMatrix.LIMITS) for r in cls.RESOURCES],
+                          axis=-1)
+        return np.nan_to_num(np.where(np.isnan(requests), limits, requests))
+
+    def _get_sizes(self, demands):
+        """Returns the dominant share of every demand relative to the cluster capacity."""
+        total = self.capacity.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.where(total > 0, demands / total, np.where(demands > 0, np.inf, 0))
+        return shares.max(axis=-1)
+
+    def _select_node(self, free, demand, eligible, strategy):
+        feasible = eligible & (free >= demand).all(axis=1)
+        if not feasible.any():
+            return None
+        if strategy == PlacementStrategy.FIRST_FIT_DECREASING:
+            return int(np.argmax(feasible))
+        # Best fit: the feasible node with the smallest relative slack after placement
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slack = np.where(self.capacity > 0, (free - demand) / self.capacity, 0).sum(axis=1)
+        return int(np.argmin(np.where(feasible, slack, np.inf)))
+
+    def simulate(self, specs, strategy=PlacementStrategy.FIRST_FIT_DECREASING):
+        """Places the replicas of a queue of experiment specs and returns a `PlacementReport`."""
+        if strategy not in PlacementStrategy.VALUES:
+            raise PolyaxonSchemaError('Placement strategy `{}` not supported.'.format(strategy))
+
+        jobs = [get_replicas(spec) for spec in specs]
+        demands = [self.get_demands(replicas) for replicas in jobs]
+        order = list(range(len(jobs)))
+        if strategy == PlacementStrategy.FIRST_FIT_DECREASING:
+            job_sizes = [self._get_sizes(d.sum(axis=0, keepdims=True))[0] for d in demands]
+            order = sorted(order, key=lambda i: -job_sizes[i])
+
+        free = self.capacity.copy()
+        assignments = [None] * len(jobs)
+        for job_index in order:
+            replicas = jobs[job_index]
+            job_demands = demands[job_index]
+            replica_order = range(len(replicas))
+            if strategy == PlacementStrategy.FIRST_FIT_DECREASING:
+                replica_order = np.argsort(-self._get_sizes(job_demands), kind='mergesort')
+
+            placed = {}
+            for replica_index in replica_order:
+                replica = replicas[replica_index]
+                eligible = self._get_eligible_nodes(replica.node_selector, replica.tolerations)
+                node_index = self._select_node(
+                    free, job_demands[replica_index], eligible, strategy)
+                if node_index is None:
+                    break
+                free[node_index] -= job_demands[replica_index]
+                placed[replica_index] = node_index
+            else:
+                assignments[job_index] = [self.nodes[placed[i]].name for i in range(len(replicas))]
+                continue
+
+            # Roll back the partially placed job
+            for replica_index, node_index in six.iteritems(placed):
+                free[node_index] += job_demands[replica_index]
+
+        return PlacementReport(nodes=self.nodes,
+                               capacity=self.capacity,
+                               used=self.capacity - free,
+                               assignments=assignments)
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import re
+import six
+
+from collections import Mapping, OrderedDict
+
+from marshmallow import RAISE, fields
+
+from polyaxon_schemas.base import BaseSchema
+
+JSONSCHEMA_DRAFT = 'http://json-schema.org/draft-07/schema#'
+
+# Keys with templates are only known after parsing, they are never rejected
+TEMPLATED_KEY_PATTERN = r'\{'
+
+# The json types of the raw values that can be loaded by a field, by field class.
+# Any value can be a template, i.e. a string, before parsing.
+# Subclasses, e.g. `IntOrStr`, are not constrained.
+FIELD_TYPES = {
+    fields.Integer: ['number', 'string'],
+    fields.Float: ['number', 'string'],
+    fields.Boolean: ['boolean', 'number', 'string'],
+    fields.String: ['string'],
+    fields.List: ['array', 'string'],
+    fields.Dict: ['object', 'string'],
+    fields.Nested: ['object', 'string'],
+}
+
+# The JSON Schemas and compiled prevalidators by specification
+_jsonschemas = {}
+_prevalidators = {}
+
+PYTHON_TYPES = {
+    'object': (Mapping, ),
+    'array': (list, tuple),
+    'string': six.string_types,
+    'integer': six.integer_types,
+    'number': six.integer_types + (float, ),
+    'boolean': (bool, ),
+    'null': (type(None), ),
+}
+
+
+def get_field_jsonschema(field, operators=(), _schemas=()):
+    """Returns the JSON Schema of the raw values of a marshmallow field.
+
+    Args:
+        field: `marshmallow.fields.Field`.
+        operators: `list(str)`. The operators that can replace any value, e.g. in `run`.
+    """
+    types = FIELD_TYPES.get(type(field))
+    if types is None:
+        return {}
+
+    jsonschema = OrderedDict()
+    if isinstance(field, fields.Nested):
+        try:
+            schema = field.schema
+        except Exception:  # pylint:disable=broad-except
+            schema = None
+        if isinstance(schema, BaseSchema) and schema.__class__ not in _schemas:
+            jsonschema = get_schema_jsonschema(schema, operators=operators, _schemas=_schemas)
+        if field.many:
+            types = ['array', 'string']
+            jsonschema = OrderedDict([('items', jsonschema)] if jsonschema else [])
+    elif isinstance(field, fields.List):
+        items = get_field_jsonschema(field.container, operators=operators, _schemas=_schemas)
+        if items:
+            jsonschema['items'] = items
+
+    jsonschema['type'] = types + ['null'] if field.allow_none else types
+    return _with_operators(jsonschema, operators)
+
+
+def get_schema_jsonschema(schema, operators=(), _schemas=()):
+    """Returns the JSON Schema of the raw data loaded by a `BaseSchema`.
+
+    With operators, the required keys are not checked, an operator can provide them.
+    """
+    _schemas = _schemas + (schema.__class__, )
+    properties = OrderedDict()
+    required = []
+    for name, field in six.iteritems(schema.fields):
+        if field.dump_only:
+            continue
+        key = field.data_key or name
+        properties[key] = get_field_jsonschema(field, operators=operators, _schemas=_schemas)
+        if field.required:
+            required.append(key)
+    for operator in operators:
+        properties.setdefault(operator, {})
+
+    jsonschema = OrderedDict([('type', 'object'), ('properties', properties)])
+    if required and not operators:
+        jsonschema['required'] = required
+    if schema.unknown == RAISE:
+        jsonschema['patternProperties'] = {TEMPLATED_KEY_PATTERN: {}}
+        jsonschema['additionalProperties'] = False
+    return jsonschema
+
+
+def _with_operators(jsonschema, operators):
+    if not operators:
+        return jsonschema
+    return {'anyOf': [jsonschema] + [
+        {'type': 'object', 'required': [operator]} for operator in operators
+    ]}
+
+
+def get_jsonschema(spec):
+    """Returns the JSON Schema of a specification (class), the schemas are built once."""
+    jsonschema = _jsonschemas.get(spec)
+    if jsonschema is None:
+        jsonschema = get_specification_jsonschema(spec)
+        _jsonschemas[spec] = jsonschema
+    return jsonschema
+
+
+def get_prevalidator(spec):
+    """Returns the compiled prevalidator of a specification (class), compiled once."""
+    prevalidator = _prevalidators.get(spec)
+    if prevalidator is None:
+        prevalidator = compile_jsonschema(get_jsonschema(spec))
+        _prevalidators[spec] = prevalidator
+    return prevalidator
+
+
+def get_specification_jsonschema(spec):
+    """Returns the JSON Schema of the raw data of a specification (class).
+
+    The schema covers the possible and required sections, and the keys and value types
+    of the sections loaded by the specification's config.
+    The values of the sections parsed with operators can be operators.
+    """
+    config_fields = spec.CONFIG.SCHEMA().fields if spec.CONFIG else {}
+    op_sections = set(spec.OP_PARSING_SECTIONS) | set(spec.GRAPH_SECTIONS) | {spec.RUN}
+    operators = sorted(spec.OPERATORS)
+
+    properties = OrderedDict()
+    for section in spec.POSSIBLE_SECTIONS:
+        field = config_fields.get(section)
+        if field is None:
+            properties[section] = {}
+        else:
+            properties[section] = get_field_jsonschema(
+                field, operators=operators if section in op_sections else ())
+    properties[spec.VERSION] = OrderedDict([
+        ('type', 'integer'), ('minimum', spec.MIN_VERSION), ('maximum', spec.MAX_VERSION)])
+    properties[spec.KIND] = {'enum': [spec._SPEC_KIND]}  # pylint:disable=protected-access
+
+    return OrderedDict([
+        ('$schema', JSONSCHEMA_DRAFT),
+        ('title', spec.__name__),
+        ('type', 'object'),
+        ('properties', properties),
+        ('required', list(spec.REQUIRED_SECTIONS)),
+        ('additionalProperties', False),
+    ])
+
+
+def compile_jsonschema(jsonschema):
+    """Compiles a JSON Schema to a function returning the list of errors of a value.
+
+    Only the keywords used by the schemas generated by this module are supported:
+    `type`, `enum`, `minimum`, `maximum`, `properties`, `patternProperties`,
+    `additionalProperties`, `required`, `items`, and `anyOf`.
+    The keys matching `TEMPLATED_KEY_PATTERN` are templates, they can provide any
+    required key, so the required keys of mappings with templated keys are not checked.
+    """
+    validate = _compile(jsonschema)
+
+    def prevalidate(value):
+        errors = []
+        validate(value, '', errors)
+        return errors
+
+    return prevalidate
+
+
+def _at(path):
+    return '`{}`: '.format(path) if path else ''
+
+
+def _get_path(path, key):
+    if isinstance(key, int):
+        return '{}[{}]'.format(path, key)
+    return '{}.{}'.format(path, key) if path else '{}'.format(key)
+
+
+def _compile(jsonschema):  # noqa, too-many-statements
+    checks = []
+
+    if 'anyOf' in jsonschema:
+        alternatives = [_compile(alternative) for alternative in jsonschema['anyOf']]
+
+        def check_any_of(value, path, errors):
+            alternatives_errors = []
+            for alternative in alternatives:
+                alternative_errors = []
+                alternative(value, path, alternative_errors)
+                if not alternative_errors:
+                    return
+                alternatives_errors.append(alternative_errors)
+            errors.extend(alternatives_errors[0])
+
+        checks.append(check_any_of)
+
+    if 'type' in jsonschema:
+        json_types = _to_types(jsonschema['type'])
+        python_types = tuple(t for json_type in json_types for t in PYTHON_TYPES[json_type])
+        accepts_bool = 'boolean' in json_types
+
+        def check_type(value, path, errors):
+            if (isinstance(value, bool) and not accepts_bool or
+                    not isinstance(value, python_types)):
+                errors.append('{}expected {}, received `{}`.'.format(
+                    _at(path), ' or '.join(json_types), value.__class__.__name__))
+                return False
+            return True
+
+        checks.append(check_type)
+
+    if 'enum' in jsonschema:
+        enum = jsonschema['enum']
+
+        def check_enum(value, path, errors):
+            if value not in enum:
+                errors.append('{}expected one of {}, received `{}`.'.format(
+                    _at(path), enum, value))
+
+        checks.append(check_enum)
+
+    if 'minimum' in jsonschema or 'maximum' in jsonschema:
+        minimum = jsonschema.get('minimum')
+        maximum = jsonschema.get('maximum')
+        number_types = PYTHON_TYPES['number']
+
+        def check_range(value, path, errors):
+            if not isinstance(value, number_types) or isinstance(value, bool):
+                return
+            if ((minimum is not None and value < minimum) or
+                    (maximum is not None and value > maximum)):
+                errors.append('{}expected a value between {} and {}, received `{}`.'.format(
+                    _at(path), minimum, maximum, value))
+
+        checks.append(check_range)
+
+    if {'properties', 'patternProperties', 'additionalProperties', 'required'} & set(jsonschema):
+        properties = {
+            key: _compile(value)
+            for key, value in six.iteritems(jsonschema.get('properties', {}))
+        }
+        patterns = [re.compile(pattern) for pattern in jsonschema.get('patternProperties', {})]
+        additional_properties = jsonschema.get('additionalProperties', True) is not False
+        required = jsonschema.get('required', [])
+
+        def check_object(value, path, errors):
+            if not isinstance(value, Mapping):
+                return
+            has_templated_keys = False
+            for key, item in six.iteritems(value):
+                if key in properties:
+                    properties[key](item, _get_path(path, key), errors)
+                elif isinstance(key, six.string_types) and any(p.search(key) for p in patterns):
+                    has_templated_keys = True
+                elif not additional_properties:
+                    errors.append('{}unexpected key `{}`.'.format(_at(path), key))
+            if required and not has_templated_keys:
+                for key in required:
+                    if key not in value:
+                        errors.append('{}missing required key `{}`.'.format(_at(path), key))
+
+        checks.append(check_object)
+
+    if 'items' in jsonschema:
+        items = _compile(jsonschema['items'])
+        array_types = PYTHON_TYPES['array']
+
+        def check_items(value, path, errors):
+            if not isinstance(value, array_types):
+                return
+            for i, item in enumerate(value):
+                items(item, _get_path(path, i), errors)
+
+        checks.append(check_items)
+
+    if not checks:
+        return lambda value, path, errors: None
+
+    def validate(value, path, errors):
+        for check in checks:
+            # The other checks are skipped for values of the wrong type
+            if check(value, path, errors) is False:
+                return
+
+    return validate
+
+
+def _to_types(json_types):
+    return [json_types] if isinstance(json_types, six.string_types) else list(json_types)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import six
+import yaml
+
+from collections import Mapping
+
+from hestia.list_utils import to_list
+from rhea import RheaError
+from rhea.utils import deep_update
+
+try:
+    # The libyaml based loader is much faster than the pure python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+YAML_EXTENSIONS = ('.yml', '.yaml')
+JSON_EXTENSIONS = ('.json', )
+
+
+def load_yaml(stream):
+    """Loads a yaml stream, or file object, with libyaml if it is available."""
+    return yaml.load(stream, Loader=SafeLoader)  # noqa, the loader is a safe loader
+
+
+def read_file(filepath):
+    """Reads a yaml or a json file, based on its extension."""
+    _, ext = os.path.splitext(filepath)
+    if ext in YAML_EXTENSIONS:
+        with open(filepath) as f:
+            return load_yaml(f)
+    if ext in JSON_EXTENSIONS:
+        with open(filepath) as f:
+            try:
+                return json.load(f)
+            except ValueError as e:
+                raise RheaError(e)
+    raise RheaError(
+        "Expects a file with extension: `.yml`, `.yaml`, or `json`, "
+        "received instead `{}`".format(ext))
+
+
+def read_stream(stream):
+    """Reads a yaml, or a json, stream."""
+    try:
+        results = load_yaml(stream)
+    except yaml.YAMLError:
+        raise RheaError('Received non valid yaml stream: `{}`'.format(stream))
+    if not results:
+        try:
+            results = json.loads(stream)
+        except ValueError as e:
+            raise RheaError(e)
+    return results
+
+
+def read_value(value):
+    """Reads a single config value: a dict, a file path, or a yaml/json stream.
+
+    Dicts are returned as is, without any copy.
+    """
+    if isinstance(value, Mapping):
+        return value
+    if not isinstance(value, six.string_types):
+        raise RheaError(
+            "Expects Mapping, string, or list of Mapping/string instances, "
+            "received {} instead".format(type(value)))
+    if os.path.isfile(value):
+        return read_file(value)
+    return read_stream(value)
+
+
+def read(values):
+    """Reads and merges an ordered list of config values, same as `rhea.read`.
+
+    A single value is returned as read, a dict is not copied and must not be mutated,
+    many values are deep merged in a new dict, the later values taking precedence.
+    """
+    if not values:
+        raise RheaError('Cannot read config_value: `{}`'.format(values))
+
+    values = to_list(values)
+    results = []
+    for value in values:
+        result = read_value(value)
+        if not result or not isinstance(result, Mapping):
+            raise RheaError('Cannot read config_value: `{}`'.format(value))
+        results.append(result)
+
+    if len(results) == 1:
+        return results[0]
+
+    config = {}
+    for result in results:
+        config = deep_update(config, result)
+    return config
@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
-import copy
-
 from polyaxon_schemas.exceptions import PolyaxonfileError
 from polyaxon_schemas.ml.eval import EvalConfig
 from polyaxon_schemas.ml.models import ModelConfig
@@ -35,8 +33,7 @@ def validate_headers(spec, data):
 
 
 def validate(spec, data):
-    """Validates the data and creates the config objects"""
-    data = copy.deepcopy(data)
+    """Validates the data and creates the config objects, the data is not mutated."""
     validated_data = {}
 
     def validate_keys(section, config, section_data):
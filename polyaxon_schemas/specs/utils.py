@@ -1,18 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
-import copy
-
 
 def get_task_values(cluster, is_distributed, values, default_value, task_type):
     result_values = {}
     if not is_distributed:
         return result_values
 
-    result_values = copy.deepcopy(values) if values else {}
+    # The values are shared, not copied, like the default value
+    result_values = dict(values) if values else {}
     if default_value:
         for i in range(cluster.get(task_type, 0)):
-            result_values[i] = values.get(i, default_value)
+            result_values[i] = result_values.get(i, default_value)
 
     return result_values
 
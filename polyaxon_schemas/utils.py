@@ -3,6 +3,7 @@ from __future__ import absolute_import, division, print_function
 
 import ast
 import numpy as np
+import operator
 import six
 
 from collections import Mapping
@@ -375,6 +376,29 @@ def get_value(key, obj, default=missing):
     return _get_value_for_keys(key.split('.'), obj, default)
 
 
+def get_value_accessor(key):
+    """Returns a function `(obj, default)` pulling the value of a key off objects.
+
+    Simple keys are read with an `operator.attrgetter`, without trying `obj[key]` first,
+    callable values are returned by name as in `get_value`.
+    Mappings, integer keys, and dotted keys are read with `get_value`.
+    """
+    if not isinstance(key, six.string_types) or '.' in key:
+        return lambda obj, default: get_value(key, obj, default)
+
+    getter = operator.attrgetter(key)
+
+    def accessor(obj, default):
+        if isinstance(obj, Mapping):
+            return get_value(key, obj, default)
+        try:
+            return _get_callable_name(getter(obj))
+        except AttributeError:
+            return default
+
+    return accessor
+
+
 def _get_value_for_keys(keys, obj, default):
     if len(keys) == 1:
         return _get_value_for_key(keys[0], obj, default)
@@ -386,16 +410,21 @@ def _get_value_for_key(key, obj, default):
         return obj[key]
     except (KeyError, AttributeError, IndexError, TypeError):
         try:
-            attr = getattr(obj, key)
-            if callable(attr):
-                if hasattr(attr, 'get_config') or hasattr(attr, 'SCHEMA'):
-                    return attr
+            return _get_callable_name(getattr(obj, key))
+        except AttributeError:
+            return default
 
-                return attr.__name__
 
+def _get_callable_name(attr):
+    """Returns the name of callable values, e.g. activations, except configs and objects
+    with a config."""
+    if callable(attr):
+        if hasattr(attr, 'get_config') or hasattr(attr, 'SCHEMA'):
             return attr
-        except AttributeError:
-            return default
+
+        return attr.__name__
+
+    return attr
 
 
 def to_camel_case(snake_str):
@@ -5,6 +5,7 @@ from unittest import TestCase
 
 from tests.utils import assert_equal_graphs
 
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
 from polyaxon_schemas.ml.graph import GraphConfig
 
 
@@ -29,3 +30,134 @@ class TestGraphConfigs(TestCase):
         config = GraphConfig.from_dict(config_dict)
         config_to_dict = config.to_dict()
         assert_equal_graphs(config_dict, config_to_dict)
+
+    def test_graph_estimate(self):
+        config = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['dense_out'],
+            'layers': [
+                {'Conv2D': {'filters': 8, 'kernel_size': 3, 'padding': 'same', 'name': 'conv'}},
+                {'MaxPooling2D': {'pool_size': 2, 'name': 'pool'}},
+                {'Flatten': {}},
+                {'Dense': {'units': 10}},
+                {'Dense': {'units': 10, 'name': 'other', 'inbound_nodes': ['Flatten_1']}},
+                {'Merge': {
+                    'Concatenate': {'name': 'concat', 'inbound_nodes': ['Dense_1', 'other']}}},
+                {'Dense': {'units': 2, 'name': 'dense_out'}},
+            ]
+        })
+        estimation = config.estimate((28, 28, 1))
+        shapes = {layer.name: layer.output_shape for layer in estimation.layers}
+        assert shapes == {
+            'conv': (28, 28, 8),
+            'pool': (14, 14, 8),
+            'Flatten_1': (1568, ),
+            'Dense_1': (10, ),
+            'other': (10, ),
+            'concat': (20, ),
+            'dense_out': (2, ),
+        }
+        assert estimation.output_shapes == {'dense_out': (2, )}
+        params = {layer.name: layer.params for layer in estimation.layers}
+        assert params['conv'] == 3 * 3 * 1 * 8 + 8
+        assert params['Dense_1'] == 1568 * 10 + 10
+        assert estimation.params == 80 + 2 * 15690 + 42
+        assert estimation.get_params_memory() == estimation.params * 4
+        assert estimation.get_memory(batch_size=2) == (
+            estimation.params * 4 + estimation.activations * 2 * 4)
+        assert estimation.flops > 0
+
+    def test_graph_estimate_unknown_and_errors(self):
+        config = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['b'],
+            'layers': [
+                {'Dense': {'units': 4, 'name': 'a', 'inbound_nodes': ['b']}},
+                {'Dense': {'units': 4, 'name': 'b', 'inbound_nodes': ['a']}},
+            ]
+        })
+        with self.assertRaises(PolyaxonSchemaError):
+            config.estimate((3, ))
+
+        config = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['Dense_2'],
+            'layers': [
+                {'Dense': {'units': 4}},
+                {'Dense': {'units': 4, 'inbound_nodes': ['unknown']}},
+            ]
+        })
+        with self.assertRaises(PolyaxonSchemaError):
+            config.estimate((3, ))
+
+        # The batch dimension is not known, the estimations of its dependents are unknown
+        estimation = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['Dense_2'],
+            'layers': [{'Dense': {'units': 4}}, {'Dense': {'units': 2}}]
+        }).estimate((None, ))
+        assert [layer.output_shape for layer in estimation.layers] == [(4, ), (2, )]
+        assert estimation.params is None
+        assert estimation.get_memory() is None
+
+    def test_graph_index(self):
+        config = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['out'],
+            'layers': [
+                {'Dense': {'units': 4, 'name': 'a'}},
+                {'Dense': {'units': 4, 'name': 'dead', 'inbound_nodes': ['a']}},
+                {'Dense': {'units': 4, 'name': 'b', 'inbound_nodes': ['image']}},
+                {'Merge': {'Add': {'name': 'out', 'inbound_nodes': ['b', 'a']}}},
+                {'Dense': {'units': 4}},
+            ]
+        })
+        index = config.index
+        assert index is config.index
+        assert list(index.layers) == ['a', 'dead', 'b', 'out', 'Dense_1']
+        assert index.inbound['out'] == ['b', 'a']
+        assert index.outbound['a'] == ['dead', 'out']
+        assert index.outbound['image'] == ['a', 'b']
+        assert index.topological_order == ['a', 'dead', 'b', 'out', 'Dense_1']
+        assert index.reachable == {'image', 'a', 'b', 'out'}
+        assert index.dead_layers == ['dead', 'Dense_1']
+        assert index.get_ancestors('out') == {'image', 'a', 'b'}
+        assert index.get_descendants('a') == {'dead', 'out', 'Dense_1'}
+
+        pruned = config.prune()
+        assert [layer.name for layer in pruned.layers] == ['a', 'b', 'out']
+        assert pruned.index.dead_layers == []
+        assert pruned.index.inbound == {'a': ['image'], 'b': ['image'], 'out': ['b', 'a']}
+        # The original layers are not mutated
+        assert config.layers[0].inbound_nodes == []
+        assert pruned.to_dict()['output_layers'] == config.to_dict()['output_layers']
+
+    def test_graph_index_order_and_errors(self):
+        config = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['b'],
+            'layers': [
+                {'Dense': {'units': 4, 'name': 'b', 'inbound_nodes': ['a']}},
+                {'Dense': {'units': 4, 'name': 'a', 'inbound_nodes': ['image']}},
+            ]
+        })
+        assert config.index.topological_order == ['a', 'b']
+
+        config = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['a'],
+            'layers': [
+                {'Dense': {'units': 4, 'name': 'a'}},
+                {'Dense': {'units': 4, 'name': 'a'}},
+            ]
+        })
+        with self.assertRaises(PolyaxonSchemaError):
+            config.index  # noqa, pointless-statement
+
+        config = GraphConfig.from_dict({
+            'input_layers': ['image'],
+            'output_layers': ['missing'],
+            'layers': [{'Dense': {'units': 4}}]
+        })
+        with self.assertRaises(PolyaxonSchemaError):
+            config.index  # noqa, pointless-statement
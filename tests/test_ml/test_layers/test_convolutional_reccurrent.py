@@ -62,3 +62,21 @@ class TestConvolutionalRecurrentConfigs(TestCase):
         }
         config = ConvLSTM2DConfig.from_dict(config_dict)
         assert_equal_layers(config, config_dict)
+
+    def test_conv_lstm_2d_config_dump_with_functions(self):
+        def tanh():
+            pass
+
+        def hard_sigmoid():
+            pass
+
+        config = ConvLSTM2DConfig(filters=20,
+                                  kernel_size=3,
+                                  activation=tanh,
+                                  recurrent_activation=hard_sigmoid,
+                                  kernel_initializer=GlorotNormalInitializerConfig(),
+                                  recurrent_initializer=OrthogonalInitializerConfig(),
+                                  bias_initializer=ZerosInitializerConfig())
+        config_dict = config.to_dict()
+        assert config_dict['activation'] == 'tanh'
+        assert config_dict['recurrent_activation'] == 'hard_sigmoid'
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import copy
+import pickle
+
 from unittest import TestCase
 
 from tests.utils import assert_equal_layers
 
+from polyaxon_schemas import base
+from polyaxon_schemas.base import intern_config
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
 from polyaxon_schemas.ml.initializations import (
     GlorotNormalInitializerConfig,
     ZerosInitializerConfig
@@ -102,6 +108,88 @@ class TestCoreConfigs(TestCase):
         config = DenseConfig.from_dict(config_dict)
         assert_equal_layers(config, config_dict)
 
+    def test_dense_config_dump_with_functions_and_dtypes(self):
+        class DType(object):
+            name = 'float16'
+
+        def elu():
+            pass
+
+        config = DenseConfig(units=12, activation=elu, dtype=DType())
+        config_dict = config.to_dict()
+        assert config_dict['activation'] == 'elu'
+        assert config_dict['dtype'] == 'float16'
+        assert config_dict['units'] == 12
+        # The accessors are reused by the next dumps
+        assert DenseConfig(units=3, activation='relu').to_dict()['activation'] == 'relu'
+
+    def test_dense_configs_are_interned(self):
+        config_dict = {
+            'units': 12,
+            'kernel_initializer': {'GlorotNormal': None},
+            'bias_initializer': {'Zeros': {'dtype': 'float32'}},
+            'kernel_regularizer': {'L2': {'l': 0.01}},
+        }
+        # Interning is opt-in
+        config = DenseConfig.from_dict(config_dict)
+        assert config is not DenseConfig.from_dict(config_dict)
+        config.units = 1
+
+        base.INTERN_CONFIGS = True
+        try:
+            self.assert_dense_configs_are_interned(config_dict)
+        finally:
+            base.INTERN_CONFIGS = False
+
+    def assert_dense_configs_are_interned(self, config_dict):
+        config = DenseConfig.from_dict(config_dict)
+        other = DenseConfig.from_dict(config_dict)
+        assert config is other
+        assert config.kernel_initializer is GlorotNormalInitializerConfig.from_dict({})
+
+        # Identical sub-configs are shared by different layers
+        other = DenseConfig.from_dict(dict(config_dict, units=1, bias_initializer={'Zeros': {}}))
+        assert other is not config
+        assert other.kernel_initializer is config.kernel_initializer
+        assert other.kernel_regularizer is config.kernel_regularizer
+        assert other.bias_initializer is not config.bias_initializer
+        assert other.bias_initializer is ZerosInitializerConfig.from_dict({})
+
+        # The shared configs cannot be mutated, their copies can
+        with self.assertRaises(PolyaxonSchemaError):
+            config.units = 1
+        with self.assertRaises(PolyaxonSchemaError):
+            config.kernel_initializer.seed = 1
+        copied = copy.copy(config)
+        copied.units = 1
+        assert config.units == 12
+        assert DenseConfig.from_dict(config_dict).units == 12
+
+        # Equal values of different types are not shared
+        assert intern_config(DenseConfig, {'units': 1}) is intern_config(DenseConfig, {'units': 1})
+        assert intern_config(DenseConfig, {'units': 1}) is not intern_config(
+            DenseConfig, {'units': True})
+
+    def test_dense_config_pickle(self):
+        config_dict = {
+            'units': 12,
+            'kernel_initializer': {'GlorotNormal': None},
+            'kernel_regularizer': {'L2': {'l': 0.01}},
+        }
+        config = DenseConfig.from_dict(config_dict)
+        payload = pickle.dumps(config, pickle.HIGHEST_PROTOCOL)
+        # The fields' names are not pickled
+        assert b'kernel_regularizer' not in payload
+        unpickled = pickle.loads(payload)
+        assert isinstance(unpickled, DenseConfig)
+        assert unpickled.to_dict() == config.to_dict()
+        assert unpickled.fingerprint() == config.fingerprint()
+
+        copied = copy.copy(config)
+        assert copied is not config
+        assert copied.kernel_regularizer is config.kernel_regularizer
+        assert copied.to_dict() == config.to_dict()
+
     def test_activity_regularization_config(self):
         config_dict = {
             'l1': 0.2,
@@ -3,12 +3,14 @@ from __future__ import absolute_import, division, print_function
 
 from unittest import TestCase
 
+from marshmallow import ValidationError
 from tests.utils import assert_equal_dict
 
 from polyaxon_schemas.ml.regularizations import (
     L1L2RegularizerConfig,
     L1RegularizerConfig,
-    L2RegularizerConfig
+    L2RegularizerConfig,
+    RegularizerSchema
 )
 
 
@@ -40,3 +42,36 @@ class TestRegularizationConfigs(TestCase):
         }
         config = L1L2RegularizerConfig.from_dict(config_dict)
         assert_equal_dict(config.to_dict(), config_dict)
+
+    def test_regularizer_schema_aliases(self):
+        assert RegularizerSchema.__aliases__ == {
+            'L1': L1RegularizerConfig,
+            'l1': L1RegularizerConfig,
+            'L2': L2RegularizerConfig,
+            'l2': L2RegularizerConfig,
+            'L1L2': L1L2RegularizerConfig,
+            'l1l2': L1L2RegularizerConfig,
+            'l1_l2': L1L2RegularizerConfig,
+        }
+        config = RegularizerSchema().load({'l1_l2': {'l1': 0.1}})
+        assert isinstance(config, L1L2RegularizerConfig)
+        assert config.l1 == 0.1
+        assert isinstance(RegularizerSchema().load({'L2': None}), L2RegularizerConfig)
+
+        # Other spellings converted to a valid identifier are cached apart from the aliases
+        assert isinstance(RegularizerSchema().load({'L1_l2': None}), L1L2RegularizerConfig)
+        assert 'L1_l2' not in RegularizerSchema.__aliases__
+        assert RegularizerSchema.__converted_aliases__['L1_l2'] is L1L2RegularizerConfig
+
+        with self.assertRaises(ValidationError):
+            RegularizerSchema().load({'l3': None})
+        assert 'l3' not in RegularizerSchema.__converted_aliases__
+
+        # The converted spellings are bounded
+        max_converted_aliases = RegularizerSchema._MAX_CONVERTED_ALIASES
+        RegularizerSchema._MAX_CONVERTED_ALIASES = 1
+        try:
+            assert RegularizerSchema.get_config('L1_L2') is L1L2RegularizerConfig
+            assert RegularizerSchema.__converted_aliases__ == {'L1_L2': L1L2RegularizerConfig}
+        finally:
+            RegularizerSchema._MAX_CONVERTED_ALIASES = max_converted_aliases
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+from unittest import TestCase
+
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
+from polyaxon_schemas.ml.optimizers import AdamConfig, SGDConfig
+from polyaxon_schemas.ml.rl.explorations import (
+    ConstantExplorationConfig,
+    DecayExplorationConfig,
+    RandomDecayExplorationConfig
+)
+from polyaxon_schemas.ml.schedules import evaluate_schedule, evaluate_schedules
+
+
+class TestSchedules(TestCase):
+    def test_learning_rate_schedules(self):
+        steps = [0, 5, 10, 20, 30, 40, 50]
+        configs = [
+            AdamConfig(learning_rate=0.1),
+            SGDConfig(learning_rate=0.1, decay_type='exponential_decay', decay_rate=0.5,
+                      decay_steps=10, start_decay_at=10, stop_decay_at=30),
+            SGDConfig(learning_rate=0.1, decay_type='inverse_time', decay_rate=1.,
+                      decay_steps=10, staircase=True),
+            SGDConfig(learning_rate=0.1, decay_type='natural_exp_decay', decay_rate=1.,
+                      decay_steps=10),
+            SGDConfig(learning_rate=0.1, decay_type='piecewise_constant', decay_rate=0.1,
+                      decay_steps=10, min_learning_rate=1e-3),
+            SGDConfig(learning_rate=0.1, decay_type='polynomial_decay', decay_rate=0.02,
+                      decay_steps=40),
+        ]
+        schedules = evaluate_schedules(configs, steps)
+        assert schedules.shape == (6, 7)
+        expected = [
+            [0.1] * 7,
+            [0.1, 0.1, 0.1, 0.05, 0.025, 0.025, 0.025],
+            [0.1, 0.1, 0.05, 0.1 / 3, 0.025, 0.02, 0.1 / 6],
+            [0.1 * np.exp(-step / 10.) for step in steps],
+            [0.1, 0.1, 0.01, 0.001, 0.001, 0.001, 0.001],
+            [0.1, 0.09, 0.08, 0.06, 0.04, 0.02, 0.02],
+        ]
+        np.testing.assert_allclose(schedules, expected)
+
+        # Each curve does not depend on the other configs
+        np.testing.assert_allclose(evaluate_schedule(configs[1], steps), expected[1])
+
+    def test_exploration_schedules(self):
+        schedules = evaluate_schedules([
+            DecayExplorationConfig(exploration_rate=0.2, decay_steps=100),
+            RandomDecayExplorationConfig(decay_steps=100, min_exploration_rate=0.1),
+        ], np.arange(0, 201, 50))
+        np.testing.assert_allclose(schedules, [[0.2, 0.1, 0., 0., 0.], [1., 0.5, 0.1, 0.1, 0.1]])
+
+    def test_unsupported_schedules(self):
+        with self.assertRaises(PolyaxonSchemaError):
+            evaluate_schedules([SGDConfig(decay_type='cosine_decay')], [0])
+        with self.assertRaises(PolyaxonSchemaError):
+            evaluate_schedules([ConstantExplorationConfig()], [0])
+        assert evaluate_schedules([], [0, 1]).shape == (0, 2)
+
+    def test_decay_steps_are_required(self):
+        for decay_steps in [None, 0, -10]:
+            with self.assertRaises(PolyaxonSchemaError):
+                evaluate_schedule(SGDConfig(decay_type='exponential_decay',
+                                            decay_steps=decay_steps), [0, 10])
+            with self.assertRaises(PolyaxonSchemaError):
+                evaluate_schedule(DecayExplorationConfig(decay_steps=decay_steps), [0])
+        # The schedules without decay do not use the decay steps
+        np.testing.assert_allclose(
+            evaluate_schedule(SGDConfig(learning_rate=0.1, decay_steps=None), [0, 10]), [0.1, 0.1])
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import datetime
+import numpy as np
+
+from collections import OrderedDict
 from unittest import TestCase
 
 from marshmallow import ValidationError
 
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
 from polyaxon_schemas.ops.build import BuildBackend, BuildConfig
 
 
@@ -236,3 +241,41 @@ class TestBuildConfigs(TestCase):
         assert config.to_dict() == config_dict
         assert config.image_tag == '1.3.0'
         assert config.backend == BuildBackend.KANIKO
+
+    def test_build_fingerprint(self):
+        config_dict = {
+            'image': 'some_image_name:1.3.0',
+            'build_steps': ['pip install foo'],
+            'env_vars': [['KEY', 1]],
+        }
+        config = BuildConfig.from_dict(config_dict)
+        fingerprint = config.fingerprint()
+        assert len(fingerprint) in (32, 64)
+        assert BuildConfig.from_dict(config_dict).fingerprint() == fingerprint
+        assert BuildConfig(**config_dict).fingerprint() == fingerprint
+        # NumPy scalars are fingerprinted as the python values
+        assert BuildConfig(image='some_image_name:1.3.0',
+                           build_steps=['pip install foo'],
+                           env_vars=[['KEY', np.int64(1)]]).fingerprint() == fingerprint
+
+        for key, value in [('image', 'some_image_name:1.3.1'),
+                           ('build_steps', ['pip install bar']),
+                           ('env_vars', [['KEY', '1']]),
+                           ('env_vars', [['KEY', 1.]]),
+                           ('nocache', True)]:
+            other = BuildConfig.from_dict(dict(config_dict, **{key: value}))
+            assert other.fingerprint() != fingerprint
+
+    def test_fingerprint_values(self):
+        config = BuildConfig(image='foo', env_vars={'b': 1, 'a': [1, 2]})
+        assert config.fingerprint() == BuildConfig(
+            image='foo', env_vars=OrderedDict([('a', [1, 2]), ('b', 1)])).fingerprint()
+        assert config.fingerprint() != BuildConfig(
+            image='foo', env_vars={'b': 1, 'a': [2, 1]}).fingerprint()
+
+        config = BuildConfig(image='foo', tags={datetime.date(2019, 1, 1), 'tag'})
+        assert config.fingerprint() == BuildConfig(
+            image='foo', tags={'tag', datetime.date(2019, 1, 1)}).fingerprint()
+
+        with self.assertRaises(PolyaxonSchemaError):
+            BuildConfig(image='foo', tags=[object()]).fingerprint()
@@ -10,15 +10,18 @@ from polyaxon_schemas.ops.environments.experiments import (
     HorovodClusterConfig,
     HorovodConfig,
     MPIClusterConfig,
+    MPIConfig,
     MXNetClusterConfig,
     MXNetConfig,
     PytorchClusterConfig,
     PytorchConfig,
+    ReplicaEnvironment,
     TensorflowClusterConfig,
     TensorflowConfig
 )
 from polyaxon_schemas.ops.environments.legacy import TFRunConfig
 from polyaxon_schemas.ops.environments.resources import K8SResourcesConfig, PodResourcesConfig
+from polyaxon_schemas.utils import TaskType
 
 
 class TestExperimentEnvironmentsConfigs(TestCase):
@@ -141,6 +144,68 @@ class TestExperimentEnvironmentsConfigs(TestCase):
         config = TensorflowConfig.from_dict(config_dict)
         assert_equal_dict(config_dict, config.to_light_dict())
 
+    def test_replica_environments(self):
+        config = TensorflowConfig.from_dict({
+            'n_workers': 4,
+            'n_ps': 2,
+            'default_worker': {
+                'resources': {'cpu': {'requests': 1, 'limits': 2}},
+                'node_selector': {'polyaxon': 'workers'},
+            },
+            'worker': [
+                {'index': 1, 'node_selector': {'polyaxon': 'worker1'}},
+                {'index': 3, 'resources': {'memory': {'requests': 256}}, 'tolerations': [{}]},
+                {'index': 10, 'affinity': {'foo': 'bar'}},
+            ],
+            'ps': [{'index': 0, 'resources': {'gpu': {'requests': 1}}}],
+        })
+        environments = config.replica_environments
+        assert environments is config.replica_environments
+        assert len(environments) == 4 + 1 + 2
+        default_resources = config.default_worker_resources
+
+        assert environments[(TaskType.WORKER, 0)] is environments[(TaskType.WORKER, 2)]
+        assert environments[(TaskType.WORKER, 0)].resources is default_resources
+        assert environments[(TaskType.WORKER, 1)] == ReplicaEnvironment(
+            resources=default_resources,
+            node_selector={'polyaxon': 'worker1'},
+            affinity=None,
+            tolerations=None)
+        assert environments[(TaskType.WORKER, 3)].resources is config.worker_resources[3]
+        assert environments[(TaskType.WORKER, 3)].node_selector == {'polyaxon': 'workers'}
+        # Out of range environments do not get the default values
+        assert environments[(TaskType.WORKER, 10)] == ReplicaEnvironment(
+            resources=None, node_selector=None, affinity={'foo': 'bar'}, tolerations=None)
+
+        assert environments.get_values(TaskType.WORKER, 'resources') == {
+            0: default_resources,
+            1: default_resources,
+            2: default_resources,
+            3: config.worker_resources[3],
+        }
+        assert environments.get_values(TaskType.WORKER, 'tolerations') == {3: [{}]}
+        assert environments.get_values(TaskType.PS, 'resources') == {
+            0: config.ps_resources[0]}
+        assert environments.get_values(TaskType.PS, 'node_selector') == {}
+        # The default values follow the replicas of the cluster
+        assert environments.get_values(TaskType.WORKER, 'resources', n_replicas=2) == {
+            0: default_resources,
+            1: default_resources,
+            3: config.worker_resources[3],
+        }
+        assert environments.get_values(TaskType.WORKER, 'node_selector', n_replicas=6)[5] == {
+            'polyaxon': 'workers'}
+
+        with self.assertRaises(TypeError):
+            environments[(TaskType.PS, 0)] = None
+
+        config = MPIConfig.from_dict({'n_workers': 2})
+        assert list(config.replica_environments) == [(TaskType.WORKER, 0), (TaskType.WORKER, 1)]
+
+        # The replicas are indexed by the task types of the framework
+        config = MXNetConfig.from_dict({'n_workers': 1, 'n_ps': 1})
+        assert list(config.replica_environments) == [(TaskType.WORKER, 0), (TaskType.SERVER, 0)]
+
     def test_horovod_config(self):
         config_dict = {
             'n_workers': 10,
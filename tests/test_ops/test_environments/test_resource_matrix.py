@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import uuid
+
+from unittest import TestCase
+
+from polyaxon_schemas.api.clusters import ClusterNodeConfig
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
+from polyaxon_schemas.ops.environments.resource_matrix import ResourceMatrix
+from polyaxon_schemas.ops.environments.resources import PodResourcesConfig
+
+
+class TestResourceMatrix(TestCase):
+    def setUp(self):
+        self.resources = [
+            PodResourcesConfig.from_dict({
+                'cpu': {'requests': 1, 'limits': 2},
+                'memory': {'requests': 256, 'limits': 512},
+            }),
+            {
+                'cpu': {'requests': 0.5, 'limits': None},
+                'gpu': {'requests': 1, 'limits': 1},
+                'memory': None,
+                'tpu': None,
+            },
+            None,
+            PodResourcesConfig.from_dict({
+                'memory': {'requests': 1024},
+                'gpu': {'requests': 2, 'limits': 2},
+            }),
+        ]
+        self.matrix = ResourceMatrix.from_resources(
+            self.resources,
+            project=['p1', 'p2', 'p1', 'p2'],
+            node=['node1', 'node1', 'node2', 'node3'],
+            task_type=['master', 'worker', 'worker', 'ps'])
+
+    def test_shape_and_missing_values(self):
+        assert len(self.matrix) == 4
+        assert self.matrix.values.shape == (4, 4, 2)
+        assert np.isnan(self.matrix.values[2]).all()
+        assert self.matrix.get('cpu').tolist()[:2] == [1, 0.5]
+        assert np.isnan(self.matrix.get('cpu', 'limits')[1])
+
+    def test_raises_for_wrong_shape_or_labels(self):
+        with self.assertRaises(PolyaxonSchemaError):
+            ResourceMatrix(np.zeros((2, 3, 2)))
+
+        with self.assertRaises(PolyaxonSchemaError):
+            ResourceMatrix(np.zeros((2, 4, 2)), labels={'node': ['node1']})
+
+    def test_sum(self):
+        total = self.matrix.sum()
+        assert total[0].tolist() == [1.5, 2]
+        assert total[1].tolist() == [1280, 512]
+        assert total[2].tolist() == [3, 3]
+        assert np.isnan(total[3]).all()
+
+    def test_to_pod_resources_does_not_mutate(self):
+        resources = self.matrix.to_pod_resources()
+        assert resources.to_dict() == {
+            'cpu': {'requests': 1.5, 'limits': 2},
+            'memory': {'requests': 1280, 'limits': 512},
+            'gpu': {'requests': 3, 'limits': 3},
+            'tpu': None,
+        }
+        assert self.resources[0].cpu.requests == 1
+        assert self.resources[0].memory.requests == 256
+
+        resources = self.matrix.to_pod_resources(index=1)
+        assert resources.to_dict() == self.resources[1]
+
+    def test_group_by(self):
+        by_project = self.matrix.group_by('project')
+        assert by_project.labels['project'].tolist() == ['p1', 'p2']
+        assert by_project.to_pod_resources(0).to_dict() == self.resources[0].to_dict()
+        assert by_project.to_pod_resources(1).to_dict() == {
+            'cpu': {'requests': 0.5, 'limits': None},
+            'memory': {'requests': 1024, 'limits': None},
+            'gpu': {'requests': 3, 'limits': 3},
+            'tpu': None,
+        }
+
+        by_task = self.matrix.group_by('task_type')
+        assert by_task.labels['task_type'].tolist() == ['master', 'ps', 'worker']
+        assert by_task.get('cpu').tolist()[2] == 0.5
+
+        with self.assertRaises(PolyaxonSchemaError):
+            self.matrix.group_by('foo')
+
+    def test_headroom(self):
+        nodes = [
+            ClusterNodeConfig(uuid=uuid.uuid4().hex,
+                              name='node1',
+                              cpu=4,
+                              memory=4 * 1024 ** 3,
+                              n_gpus=2),
+            ClusterNodeConfig(uuid=uuid.uuid4().hex, name='node3', cpu=2, memory=1024 ** 3),
+        ]
+        headroom = self.matrix.headroom(nodes)
+        assert headroom.shape == (2, 4)
+        assert headroom[0, :3].tolist() == [2.5, 4096 - 256, 1]
+        assert headroom[1, :3].tolist() == [2, 0, -2]
+        assert np.isnan(headroom[:, 3]).all()
+
+        headroom = self.matrix.headroom(nodes, bound='limits')
+        assert headroom[0, :3].tolist() == [2, 4096 - 512, 1]
@@ -3,12 +3,17 @@ from __future__ import absolute_import, division, print_function
 
 from unittest import TestCase
 
+from marshmallow import ValidationError
 from tests.utils import assert_equal_dict
 
 from polyaxon_schemas.ops.environments.resources import (
     K8SContainerResourcesConfig,
     K8SResourcesConfig,
-    PodResourcesConfig
+    K8SResourcesEntryConfig,
+    PodResourcesConfig,
+    get_cpu_millicores,
+    get_memory_bytes,
+    to_cpu_quantity
 )
 
 
@@ -72,6 +77,88 @@ class TestResourcesConfigs(TestCase):
         config = K8SContainerResourcesConfig.from_dict(config_dict)
         assert_equal_dict(config_dict, config.to_dict())
 
+    def test_quantities(self):
+        assert get_cpu_millicores('500m') == 500
+        assert get_cpu_millicores('1.5') == 1500
+        assert get_cpu_millicores(0.8) == 800
+        assert get_cpu_millicores(2) == 2000
+        assert get_cpu_millicores('100u') == 1
+        assert get_cpu_millicores(None) is None
+        assert get_memory_bytes('2Gi') == 2 * 1024 ** 3
+        assert get_memory_bytes('1.5Mi') == int(1.5 * 1024 ** 2)
+        assert get_memory_bytes('1k') == 1000
+        assert get_memory_bytes('1E') == 10 ** 18
+        assert get_memory_bytes('1e3') == 1000
+        assert get_memory_bytes(265) == 265
+        assert to_cpu_quantity(2000) == '2'
+        assert to_cpu_quantity(1500) == '1500m'
+
+        for value in ['foo', '1Zi', '-1', '1e', True, -2, float('inf'), float('nan'), '1e400',
+                      '1e999999999']:
+            with self.assertRaises(ValueError):
+                get_cpu_millicores(value)
+        with self.assertRaises(ValueError):
+            get_memory_bytes(float('inf'))
+
+        # Non-finite and overflowing quantities are validation errors
+        for value in [float('inf'), 1e400, '1e400']:
+            with self.assertRaises(ValidationError):
+                K8SResourcesEntryConfig.from_dict({'cpu': value})
+            with self.assertRaises(ValidationError):
+                K8SResourcesEntryConfig.from_dict({'memory': value})
+
+    def test_container_resources_quantities(self):
+        with self.assertRaises(ValidationError):
+            K8SContainerResourcesConfig.from_dict({'requests': {'cpu': '1 cpu'}})
+
+        with self.assertRaises(ValidationError):
+            K8SContainerResourcesConfig.from_dict({'limits': {'memory': '2Gb'}})
+
+        config1 = K8SContainerResourcesConfig.from_dict({
+            'requests': {'cpu': '800m', 'memory': '1Gi', 'gpu': 1},
+            'limits': {'cpu': 1},
+        })
+        assert config1.requests.cpu_millicores == 800
+        assert config1.requests.memory_bytes == 1024 ** 3
+        assert config1.requests.quantities == (800, 1024 ** 3, 1, None)
+        assert config1.limits.cpu_millicores == 1000
+
+        config2 = K8SContainerResourcesConfig.from_dict({
+            'requests': {'cpu': 0.8, 'memory': 1024 ** 3, 'gpu': 1},
+            'limits': {'cpu': '1000m'},
+        })
+        assert config1 == config2
+        assert len({config1, config2}) == 1
+
+        config3 = K8SContainerResourcesConfig.from_dict({'requests': {'cpu': '1.5'}})
+        assert config3 > config1
+        assert sorted([config3, config1]) == [config1, config3]
+
+        total = config1 + config2 + config3
+        assert total.to_dict() == {
+            'requests': {'cpu': '3100m', 'memory': 2 * 1024 ** 3, 'gpu': 2},
+            'limits': {'cpu': '2'},
+        }
+        assert sum([config1, config2, config3]) == total
+        # The operands are not mutated
+        assert config1.requests.cpu == '800m'
+        assert config3.requests.cpu == '1.5'
+
+        entry = K8SResourcesEntryConfig(cpu='1')
+        entry.cpu = '250m'
+        assert entry.cpu_millicores == 250
+        assert entry < K8SResourcesEntryConfig(cpu='300m')
+
+    def test_equal_entries_fingerprints(self):
+        # Equal entries with different quantities keep their own fingerprints
+        entry = K8SResourcesEntryConfig.from_dict({'cpu': 1.})
+        other = K8SResourcesEntryConfig.from_dict({'cpu': '1'})
+        assert entry == other
+        fingerprint = entry.fingerprint()
+        assert other.fingerprint() != fingerprint
+        assert K8SResourcesEntryConfig.from_dict({'cpu': '1'}).fingerprint() == other.fingerprint()
+        assert K8SResourcesEntryConfig.from_dict({'cpu': 1.}).fingerprint() == fingerprint
+
     def test_pod_resources_config(self):
         config_dict = {
             'cpu': {
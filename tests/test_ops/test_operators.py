@@ -48,3 +48,18 @@ class TestOperatorConfigs(TestCase):
         assert config.to_dict() == config_dict
         assert 'It was True' == config.parse(ExperimentSpecification, Parser(), {'i': 5})
         assert 'It was False' == config.parse(ExperimentSpecification, Parser(), {'i': 3})
+
+    def test_nested_for_operators_do_not_copy_declarations(self):
+        config = ForConfig.from_dict({
+            'len': 2,
+            'index': 'i',
+            'do': {'for': {'len': '{{ n }}', 'index': 'j', 'do': '{{ prefix }}{{ i }}{{ j }}'}}
+        })
+        declarations = {'n': 3, 'prefix': 'v'}
+        expected = ['v00', 'v01', 'v02', 'v10', 'v11', 'v12']
+        assert expected == config.parse(ExperimentSpecification, Parser(), declarations)
+        assert declarations == {'n': 3, 'prefix': 'v'}
+
+        # The enclosing declarations take precedence over the loop index
+        config = ForConfig.from_dict({'len': 2, 'do': '{{ index }}'})
+        assert [7, 7] == config.parse(ExperimentSpecification, Parser(), {'index': 7})
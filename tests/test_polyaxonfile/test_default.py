@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import os
+import shutil
 import tempfile
 
 from unittest import TestCase
@@ -8,7 +10,9 @@ from unittest import TestCase
 from polyaxon_schemas.polyaxonfile import (
     DEFAULT_POLYAXON_FILE_EXTENSION,
     DEFAULT_POLYAXON_FILE_NAME,
-    PolyaxonFile
+    PolyaxonFile,
+    PolyaxonFilesCatalog,
+    find_polyaxonfiles
 )
 
 
@@ -27,3 +31,64 @@ class TestDefaultFile(TestCase):
                 path = tempfile.mkdtemp()
                 create_file(path, filename, ext)
                 assert PolyaxonFile.check_default_path(path=path)
+
+
+class TestPolyaxonFilesCatalog(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.experiment = self.copy_fixture('simple_file.yml', 'project1/polyaxonfile.yml')
+        self.group = self.copy_fixture('matrix_file.yml', 'project2/sub/polyaxon.yaml')
+        self.invalid = self.copy_fixture('missing_kind.yml', 'project3/polyaxon.yml')
+        self.copy_fixture('simple_file.yml', 'project1/other.yml')
+        self.copy_fixture('simple_file.yml', '.hidden/polyaxonfile.yml')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def copy_fixture(self, fixture, filepath):
+        filepath = os.path.join(self.path, filepath)
+        if not os.path.isdir(os.path.dirname(filepath)):
+            os.makedirs(os.path.dirname(filepath))
+        shutil.copy(os.path.abspath(os.path.join('tests/fixtures', fixture)), filepath)
+        return filepath
+
+    def test_find_polyaxonfiles(self):
+        filepaths = sorted(filepath for filepath, _ in find_polyaxonfiles(self.path))
+        assert filepaths == sorted([self.experiment, self.group, self.invalid])
+        filepaths = [filepath for filepath, _ in find_polyaxonfiles(self.path,
+                                                                    filenames=['other.yml'])]
+        assert filepaths == [os.path.join(self.path, 'project1/other.yml')]
+        assert len(list(find_polyaxonfiles(self.path, skip_hidden=False))) == 4
+
+    def test_scan(self):
+        catalog = PolyaxonFilesCatalog(self.path, workers=2)
+        assert sorted(catalog.scan()) == sorted([self.experiment, self.group, self.invalid])
+        assert len(catalog) == 3
+        assert catalog.kinds == {'experiment', 'group'}
+        assert list(catalog.get_specifications('experiment')) == [self.experiment]
+        # The specifications parsed in the pool processes are not parsed again
+        for kind in catalog.kinds:
+            for specification in catalog.get_specifications(kind).values():
+                assert '_pickled' not in specification.__dict__
+                assert '_config' in specification.__dict__
+        assert catalog.get_specifications('experiment')[self.experiment].is_experiment
+        assert catalog.get_specifications('group')[self.group].is_group
+        assert catalog.get_specifications('job') == {}
+        assert list(catalog.errors) == [self.invalid]
+
+    def test_incremental_scan(self):
+        catalog = PolyaxonFilesCatalog(self.path, workers=1)
+        catalog.scan()
+        assert catalog.scan() == []
+
+        # Modified files are re-parsed, and re-indexed by their new kind
+        self.copy_fixture('simple_file.yml', 'project2/sub/polyaxon.yaml')
+        mtime = catalog.entries[self.group].mtime + 10
+        os.utime(self.group, (mtime, mtime))
+        os.remove(self.invalid)
+        assert catalog.scan() == [self.group]
+        assert self.invalid not in catalog
+        assert catalog.kinds == {'experiment'}
+        assert sorted(catalog.get_specifications('experiment')) == sorted([
+            self.experiment, self.group])
+        assert catalog.errors == {}
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import os
+
+from unittest import TestCase
+
+from polyaxon_schemas.polyaxonfile import PolyaxonFile
+from polyaxon_schemas.specs.libs.dependencies import DependenciesIndex
+
+
+class TestDependenciesIndex(TestCase):
+    def setUp(self):
+        self.index = DependenciesIndex.from_data({
+            'declarations': {
+                'lr': '{{ base_lr / 10 }}',
+                'units': [32, '{{ width }}'],
+                'unused': '{{ foo }}',
+            },
+            'run': {'cmd': 'train --lr={{ lr }}'},
+            'model': {
+                'graph': {'layers': [
+                    {'Dense': {'units': '{{ units[1] }}'}},
+                    {'for': {'len': '{{ depth }}', 'index': 'i', 'do': {'Dense': {'units': 1}}}},
+                ]},
+            },
+            'environment': {'{{ env_key }}': 1},
+        })
+
+    def test_references(self):
+        assert self.index.references[('run', 'cmd')] == {'lr'}
+        assert self.index.references[('declarations', 'units', 1)] == {'width'}
+        assert self.index.references[('model', 'graph', 'layers', 1, 'for', 'len')] == {'depth'}
+        assert self.index.references[('environment', '{{ env_key }}')] == {'env_key'}
+        assert self.index.names == {
+            'base_lr', 'width', 'foo', 'lr', 'units', 'depth', 'env_key'}
+
+    def test_dependencies_through_declarations(self):
+        assert self.index.get_dependent_names(['base_lr']) == {'base_lr', 'lr'}
+        assert self.index.get_paths(['base_lr']) == {('declarations', 'lr'), ('run', 'cmd')}
+        assert self.index.get_sections(['width']) == {'declarations', 'model'}
+        assert self.index.get_sections(['depth', 'env_key']) == {'model', 'environment'}
+        assert self.index.get_sections(['bar']) == set()
+
+    def test_unused_names(self):
+        assert self.index.get_unused_names(['base_lr', 'foo', 'bar', 'unused']) == {
+            'foo', 'bar', 'unused'}
+
+    def test_group_unused_matrix_declarations(self):
+        spec = PolyaxonFile(os.path.abspath(
+            'tests/fixtures/run_exec_matrix_sampling_file.yml')).specification
+        assert spec.unused_matrix_declarations == {'learning_rate', 'dropout', 'activation'}
+
+        # Only the run section depends on the matrix
+        experiment_spec = spec.get_experiment_spec({'model': 'DNA'})
+        assert experiment_spec.run.cmd == 'video_prediction_train --model="DNA" --num_masks=10'
+        assert experiment_spec.build.build_steps == ['pip install some_lib']
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import sys
+
 from unittest import TestCase
 
 from polyaxon_schemas.exceptions import PolyaxonfileError
 from polyaxon_schemas.specs import ExperimentSpecification
+from polyaxon_schemas.specs.libs import parser as parser_module
+from polyaxon_schemas.specs.libs.declarations import DeclarationsScope
 from polyaxon_schemas.specs.libs.parser import Parser
 
 
@@ -24,6 +28,84 @@ class TestParser(TestCase):
         assert parser.parse_expression(ExperimentSpecification, '{{ something }}',
                                        {'something': 1}) == 1
 
+    def test_declarations_scope(self):
+        declarations = {'a': 1, 'b': 2}
+        scope = DeclarationsScope.get_scope(declarations)
+        assert DeclarationsScope.get_scope(scope) is scope
+        child = scope.new_child({'a': 10, 'c': 3}).with_defaults({'b': 20, 'd': 4})
+        assert dict(child) == {'a': 10, 'b': 2, 'c': 3, 'd': 4}
+        assert len(child) == 4
+        assert 'd' in child and 'e' not in child
+        assert child.get('e') is None
+        assert declarations == {'a': 1, 'b': 2}
+
+        parser = Parser()
+        assert parser.render('{{ a }}-{{ b }}-{{ c }}', child) == '10-2-3'
+        # Jinja globals are still available
+        assert parser.render('{{ range(d)|list }}', child) == '[0, 1, 2, 3]'
+        assert parser.parse_expression(ExperimentSpecification, '{{ range(d)|list }}',
+                                       child) == [0, 1, 2, 3]
+        # Errors are reported with the declarations as the template's locals
+        with self.assertRaises(ZeroDivisionError):
+            parser.render('{{ a / 0 }}', child)
+
+    def test_render_with_public_api(self):
+        scope = DeclarationsScope.get_scope({'a': 1}).with_defaults({'d': 2})
+        shared_context = parser_module.JINJA_SHARED_CONTEXT
+        parser_module.JINJA_SHARED_CONTEXT = False
+        try:
+            assert Parser.render('{{ a }}-{{ range(d)|list }}', scope) == '1-[0, 1]'
+            with self.assertRaises(ZeroDivisionError):
+                Parser.render('{{ a / 0 }}', scope)
+        finally:
+            parser_module.JINJA_SHARED_CONTEXT = shared_context
+
+    def test_render_errors_are_raised_once(self):
+        calls = []
+        scope = DeclarationsScope.get_scope({'f': lambda: calls.append(1)})
+        with self.assertRaises(ZeroDivisionError):
+            Parser.render('{{ f() }}{{ 1 / 0 }}', scope)
+        assert len(calls) == 1
+
+    def test_parse_self_referencing_declarations_raises(self):
+        for declarations in [{'a': '{{ a }}x'}, {'a': '{{ b }}', 'b': '{{ a }}'}]:
+            with self.assertRaises(PolyaxonfileError):
+                Parser.parse_expression(ExperimentSpecification, '{{ a }}', declarations)
+
+        content = {
+            'version': 1,
+            'kind': 'experiment',
+            'declarations': {'a': '{{ a }}x'},
+            'run': {'cmd': 'train {{ a }}'},
+        }
+        with self.assertRaises(PolyaxonfileError):
+            ExperimentSpecification.read(content)
+
+    def test_parse_deeply_nested_expression(self):
+        depth = sys.getrecursionlimit() * 2
+        expression = leaf = {'value': '{{ a }}'}
+        for _ in range(depth):
+            expression = {'nested': [expression, ('{{ b }}', 1)]}
+
+        parsed = Parser.parse_expression(ExperimentSpecification, expression, {'a': 1, 'b': 'b'})
+        for _ in range(depth):
+            assert parsed['nested'][1] == ('b', 1)
+            parsed = parsed['nested'][0]
+        assert parsed == {'value': 1}
+        assert leaf == {'value': '{{ a }}'}
+
+    def test_parse_mapping_with_operators(self):
+        expression = {
+            'a': '{{ a }}',
+            'if': {'cond': '{{ a }} == 1', 'do': {'b': 2, 'c': '{{ a }}'}},
+            '{{ key }}': ['{{ a }}', {'d': '[1, 2]'}],
+        }
+        parsed = Parser.parse_expression(ExperimentSpecification,
+                                         expression,
+                                         {'a': 1, 'key': 'e'},
+                                         check_operators=True)
+        assert parsed == {'a': 1, 'b': 2, 'c': 1, 'e': [1, {'d': [1, 2]}]}
+
     def test_parse_graph_expression(self):
         expression = {
             'graph': {
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import os
+import uuid
+
+from unittest import TestCase
+
+from polyaxon_schemas.api.clusters import ClusterNodeConfig, PolyaxonClusterConfig
+from polyaxon_schemas.exceptions import PolyaxonSchemaError
+from polyaxon_schemas.specs import ExperimentSpecification
+from polyaxon_schemas.specs.libs.placement import (
+    PlacementSimulator,
+    PlacementStrategy,
+    get_replicas,
+    tolerates
+)
+from polyaxon_schemas.utils import TaskType
+
+
+def get_node(name, cpu, memory, n_gpus=0, **kwargs):
+    return ClusterNodeConfig(uuid=uuid.uuid4().hex,
+                             name=name,
+                             cpu=cpu,
+                             memory=memory * 1024 ** 2,
+                             n_gpus=n_gpus,
+                             **kwargs)
+
+
+def get_spec(cpu, memory=None, gpu=None, **environment):
+    resources = {'cpu': {'requests': cpu, 'limits': cpu}}
+    if memory:
+        resources['memory'] = {'requests': memory, 'limits': memory}
+    if gpu:
+        resources['gpu'] = {'requests': gpu, 'limits': gpu}
+    environment['resources'] = resources
+    return ExperimentSpecification.read({
+        'version': 1,
+        'kind': 'experiment',
+        'environment': environment,
+        'build': {'image': 'my_image'},
+        'run': {'cmd': 'train'},
+    })
+
+
+class TestPlacement(TestCase):
+    def test_get_replicas(self):
+        spec = ExperimentSpecification.read(
+            os.path.abspath('tests/fixtures/distributed_tensorflow_file.yml'))
+        replicas = get_replicas(spec)
+        assert len(replicas) == 1 + 5 + 10
+        assert [r.task_type for r in replicas] == (
+            [TaskType.MASTER] + [TaskType.WORKER] * 5 + [TaskType.PS] * 10)
+        assert replicas[0].resources.cpu.requests == 1
+        assert replicas[4].resources.memory.requests == 300
+        assert replicas[3].tolerations == [{'operator': 'Exists'}]
+        assert replicas[15].resources.memory.limits == 1024
+
+        spec = get_spec(cpu=1)
+        replicas = get_replicas(spec)
+        assert len(replicas) == 1
+
+    def test_tolerates(self):
+        taint = {'key': 'dedicated', 'value': 'gpu', 'effect': 'NoSchedule'}
+        assert tolerates([{'operator': 'Exists'}], taint)
+        assert tolerates([{'key': 'dedicated', 'operator': 'Exists'}], taint)
+        assert tolerates([{'key': 'dedicated', 'value': 'gpu'}], taint)
+        assert not tolerates([{'key': 'dedicated', 'value': 'cpu'}], taint)
+        assert not tolerates([{'operator': 'Exists', 'effect': 'NoExecute'}], taint)
+        assert not tolerates(None, taint)
+
+    def test_first_fit_decreasing(self):
+        cluster = PolyaxonClusterConfig(version_api={}, nodes=[
+            get_node('node1', cpu=4, memory=1024),
+            get_node('node2', cpu=8, memory=4096, n_gpus=2),
+        ])
+        specs = [get_spec(cpu=1, memory=512),
+                 get_spec(cpu=8, memory=1024),
+                 get_spec(cpu=2, memory=256, gpu=1),
+                 get_spec(cpu=16)]
+        report = PlacementSimulator(cluster).simulate(specs)
+        # The bigger jobs are placed first, leaving no cpu for the gpu job on node2
+        assert report.assignments == [['node1'], ['node2'], None, None]
+        assert report.n_scheduled_jobs == 2
+        assert report.n_unschedulable_jobs == 2
+        assert report.unschedulable_jobs == [2, 3]
+
+        report = PlacementSimulator(cluster).simulate(specs[::-1][1:])
+        assert report.assignments == [None, ['node2'], ['node1']]
+        assert report.utilization['cpu'] == 9 / 12
+
+    def test_best_fit(self):
+        nodes = [get_node('node1', cpu=8, memory=4096), get_node('node2', cpu=2, memory=4096)]
+        specs = [get_spec(cpu=2), get_spec(cpu=6)]
+        report = PlacementSimulator(nodes).simulate(specs, strategy=PlacementStrategy.BEST_FIT)
+        assert report.assignments == [['node2'], ['node1']]
+        assert report.node_utilization[:, 0].tolist() == [6 / 8, 1]
+
+        with self.assertRaises(PolyaxonSchemaError):
+            PlacementSimulator(nodes).simulate(specs, strategy='foo')
+
+    def test_distributed_jobs_are_placed_atomically(self):
+        spec = ExperimentSpecification.read(
+            os.path.abspath('tests/fixtures/distributed_tensorflow_file.yml'))
+        nodes = [get_node('node1', cpu=16, memory=8192), get_node('node2', cpu=8, memory=8192)]
+        report = PlacementSimulator(nodes).simulate([spec])
+        # Requires 31 cpus
+        assert report.assignments == [None]
+        assert report.used.sum() == 0
+
+        nodes.append(get_node('node3', cpu=8, memory=8192))
+        report = PlacementSimulator(nodes).simulate([spec])
+        assert len(report.assignments[0]) == 16
+        assert report.used[:, 0].sum() == 31
+
+    def test_node_selectors_and_taints(self):
+        nodes = [get_node('node1', cpu=8, memory=4096),
+                 get_node('node2', cpu=8, memory=4096),
+                 get_node('node3', cpu=8, memory=4096, schedulable_taints=False),
+                 get_node('node4', cpu=8, memory=4096, schedulable_state=False)]
+        simulator = PlacementSimulator(
+            nodes,
+            node_labels={'node2': {'polyaxon.com': 'gpu'}},
+            node_taints={'node1': [{'key': 'dedicated', 'value': 'a', 'effect': 'NoSchedule'}]})
+        specs = [
+            get_spec(cpu=1, node_selector={'polyaxon.com': 'gpu'}),
+            get_spec(cpu=1, tolerations=[{'key': 'dedicated', 'operator': 'Exists'}]),
+            get_spec(cpu=1, tolerations=[{'operator': 'Exists'}], node_selector={
+                'kubernetes.io/hostname': 'node3'}),
+            get_spec(cpu=1, node_selector={'polyaxon.com': 'cpu'}),
+        ]
+        report = simulator.simulate(specs)
+        assert len(simulator.nodes) == 3
+        assert report.assignments == [['node2'], ['node1'], ['node3'], None]
@@ -21,7 +21,7 @@ from polyaxon_schemas.ops.hptuning import HPTuningConfig, SearchAlgorithms
 from polyaxon_schemas.ops.logging import LoggingConfig
 from polyaxon_schemas.ops.matrix import MatrixConfig
 from polyaxon_schemas.ops.run_exec import RunConfig
-from polyaxon_schemas.polyaxonfile import PolyaxonFile
+from polyaxon_schemas.polyaxonfile import PolyaxonFile, validate_many
 from polyaxon_schemas.specs.frameworks import (
     HorovodSpecification,
     MPISpecification,
@@ -1708,3 +1708,23 @@ class TestPolyaxonfile(TestCase):
 
         assert spec.environment.tolerations == tolerations
         assert spec.tolerations == tolerations
+
+    def test_validate_many(self):
+        paths = [os.path.abspath('tests/fixtures/{}'.format(f)) for f in [
+            'simple_file.yml', 'missing_kind.yml', 'advanced_file.yml', 'matrix_file.yml',
+            'distributed_tensorflow_file.yml', 'non_supported_file.yml.yml']]
+        results = list(validate_many(paths, workers=2, chunksize=1))
+        assert sorted(r.filepaths for r in results) == sorted(paths)
+        results = {os.path.basename(r.filepaths): r for r in results}
+        assert results['simple_file.yml'].kind == 'experiment'
+        assert results['simple_file.yml'].errors == []
+        assert results['matrix_file.yml'].kind == 'group'
+        assert results['missing_kind.yml'].kind is None
+        assert results['missing_kind.yml'].errors[0].startswith('PolyaxonfileError')
+        assert len(results['non_supported_file.yml.yml'].errors) == 1
+        assert all(r.duration >= 0 for r in results.values())
+
+        serial_results = list(validate_many(paths, workers=1))
+        assert [r.filepaths for r in serial_results] == paths
+        assert [r.kind for r in serial_results] == [
+            results[os.path.basename(p)].kind for p in paths]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import glob
+import os
+
+from unittest import TestCase
+
+import rhea
+
+from polyaxon_schemas.specs.libs import reader
+
+
+class TestReader(TestCase):
+    def test_read_fixtures_same_as_rhea(self):
+        filepaths = sorted(glob.glob(os.path.abspath('tests/fixtures/*.yml')))
+        filepaths += [os.path.abspath('tests/fixtures/simple_json_file.json')]
+        for filepath in filepaths:
+            assert reader.read(filepath) == rhea.read(filepath), filepath
+
+    def test_read_dict_is_not_copied(self):
+        data = {'version': 1, 'kind': 'experiment', 'run': {'cmd': 'train'}}
+        assert reader.read(data) is data
+        assert reader.read([data]) is data
+
+    def test_read_merges_many_values(self):
+        data = {'version': 1, 'kind': 'experiment', 'run': {'cmd': 'train'}}
+        values = [data, 'run: {image: foo}', '{"tags": ["foo"]}']
+        result = reader.read(values)
+        assert result == rhea.read(values) == {
+            'version': 1, 'kind': 'experiment', 'run': {'cmd': 'train', 'image': 'foo'},
+            'tags': ['foo']}
+        assert data == {'version': 1, 'kind': 'experiment', 'run': {'cmd': 'train'}}
+
+    def test_read_raises(self):
+        for value in [None, [], 1, ['foo: bar', 2], 'foo: [bar', '', 'tests/fixtures/foo.txt']:
+            with self.assertRaises(rhea.RheaError):
+                reader.read(value)
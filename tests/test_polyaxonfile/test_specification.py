@@ -2,6 +2,7 @@
 from __future__ import absolute_import, division, print_function
 
 import os
+import pickle
 
 from unittest import TestCase
 
@@ -12,7 +13,9 @@ from polyaxon_schemas.exceptions import PolyaxonConfigurationError, Polyaxonfile
 from polyaxon_schemas.ops.environments.experiments import ExperimentEnvironmentConfig
 from polyaxon_schemas.ops.environments.resources import K8SResourcesConfig, PodResourcesConfig
 from polyaxon_schemas.ops.experiment import ExperimentConfig
+from polyaxon_schemas.polyaxonfile import prevalidate
 from polyaxon_schemas.specs import (
+    SPECIFICATION_BY_KIND,
     BuildSpecification,
     ExperimentSpecification,
     GroupSpecification,
@@ -20,6 +23,7 @@ from polyaxon_schemas.specs import (
     NotebookSpecification,
     TensorboardSpecification
 )
+from polyaxon_schemas.specs.frameworks import TensorflowSpecification
 from polyaxon_schemas.utils import TaskType
 
 
@@ -254,6 +258,10 @@ class TestSpecifications(TestCase):
         }
         spec = GroupSpecification.read(content)
         assert GroupSpecification.read(spec.raw_data).raw_data == spec.raw_data
+        # Sections validated once are shared
+        assert spec.config.hptuning is spec.hptuning
+        assert spec.build is spec.config.build
+        assert spec.build.image == 'my_image'
         assert spec.environment is None
         assert spec.configmap_refs is None
         assert spec.secret_refs is None
@@ -275,3 +283,381 @@ class TestSpecifications(TestCase):
         assert spec.environment is not None
         assert spec.configmap_refs == ['foo', 'boo']
         assert spec.secret_refs == ['foo', 'boo']
+
+    def test_total_resources_for_large_distributed_experiments(self):
+        content = {
+            'version': 1,
+            'kind': 'experiment',
+            'framework': 'tensorflow',
+            'environment': {
+                'resources': {'cpu': {'requests': 1, 'limits': 2}},
+                'replicas': {
+                    'n_workers': 512,
+                    'n_ps': 8,
+                    'default_worker': {
+                        'resources': {'cpu': {'requests': 2}, 'gpu': {'requests': 1, 'limits': 1}}
+                    },
+                    'worker': [
+                        {'index': 3, 'resources': {'memory': {'requests': 512}}},
+                        {'index': 7, 'node_selector': {'foo': 'bar'}},
+                    ],
+                    'default_ps': {'resources': {'memory': {'requests': 256, 'limits': 512}}},
+                    'ps': [{'index': 0, 'resources': {'cpu': {'requests': 0.5}}}],
+                },
+            },
+            'build': {'image': 'my_image'},
+            'run': {'cmd': 'train'},
+        }
+        spec = ExperimentSpecification.read(content)
+        assert spec.total_resources == {
+            'cpu': {'requests': 1 + 2 * 511 + 0.5, 'limits': 2},
+            'memory': {'requests': 512 + 256 * 7, 'limits': 512 * 7},
+            'gpu': {'requests': 511, 'limits': 511},
+            'tpu': None,
+        }
+
+        # Same result as adding the replicas resources one by one
+        cluster, is_distributed = spec.cluster_def
+        total_resources = PodResourcesConfig()
+        total_resources += spec.master_resources
+        for task_resources in [
+            TensorflowSpecification.get_worker_resources(
+                environment=spec.config.tensorflow, cluster=cluster, is_distributed=True),
+            TensorflowSpecification.get_ps_resources(
+                environment=spec.config.tensorflow, cluster=cluster, is_distributed=True),
+        ]:
+            for resources in task_resources.values():
+                total_resources += resources
+        assert spec.total_resources == total_resources.to_dict()
+
+        content['environment']['replicas']['n_workers'] = 0
+        content['environment']['replicas']['n_ps'] = 0
+        spec = ExperimentSpecification.read(content)
+        assert spec.total_resources == spec.master_resources.to_dict()
+
+    def test_parsed_data_is_not_mutated_by_validation(self):
+        spec = ExperimentSpecification.read(os.path.abspath('tests/fixtures/advanced_file.yml'))
+        model = spec.parsed_data['model']
+        assert model['model_type'] == 'classifier'
+
+        # The parsed data can be validated again, e.g. when patching the specification
+        patched_spec = spec.patch({'environment': {'resources': {'cpu': {'requests': 2}}}})
+        assert patched_spec.parsed_data['model']['model_type'] == 'classifier'
+        assert patched_spec.environment.resources.cpu.requests == 2
+        assert spec.parsed_data['model'] == model
+
+    def test_patch_experiment_only_revalidates_changed_sections(self):
+        content = {
+            'version': 1,
+            'kind': 'experiment',
+            'declarations': {'lr': 0.1, 'units': 10},
+            'environment': {'resources': {'cpu': {'requests': 1, 'limits': 2}}},
+            'build': {'image': 'my_image'},
+            'run': {'cmd': 'train --lr={{ lr }}'},
+            'model': {
+                'model_type': 'classifier',
+                'loss': {'MeanSquaredError': None},
+                'graph': {
+                    'input_layers': 'images',
+                    'layers': [
+                        {'if': {'cond': '{{ units }} > 5',
+                                'do': {'Dense': {'units': '{{ units }}'}},
+                                'else_do': {'Dense': {'units': 5}}}},
+                    ]
+                }
+            }
+        }
+        spec = ExperimentSpecification.read(content)
+
+        patch = {'environment': {'resources': {'cpu': {'requests': 2}}}}
+        patched_spec = spec.patch(patch)
+        assert patched_spec.get_changed_sections(spec) == {'environment'}
+        assert patched_spec.environment.resources.cpu.to_dict() == {'requests': 2, 'limits': 2}
+        assert patched_spec.run is spec.run
+        assert patched_spec.model is spec.model
+        assert patched_spec.config.build is spec.config.build
+        assert patched_spec.parsed_data == ExperimentSpecification.read(
+            [content, patch]).parsed_data
+
+        # Only the sections referencing the changed declarations are parsed again
+        patch = {'declarations': {'lr': 0.01}}
+        patched_spec = spec.patch(patch)
+        assert patched_spec.get_changed_sections(spec) == {'declarations', 'run'}
+        assert patched_spec.run.cmd == 'train --lr=0.01'
+        assert patched_spec.model is spec.model
+        assert patched_spec.environment is spec.environment
+
+        # The operators are parsed with the declarations as well
+        patch = {'declarations': {'units': 2}}
+        patched_spec = spec.patch(patch)
+        assert patched_spec.get_changed_sections(spec) == {'declarations', 'model'}
+        assert patched_spec.model is not spec.model
+        assert patched_spec.model.graph.layers[0].units == 5
+        assert patched_spec.run is spec.run
+        assert patched_spec.config.to_dict() == ExperimentSpecification.read(
+            [content, patch]).config.to_dict()
+
+        with self.assertRaises(ValidationError):
+            spec.patch({'environment': {'resources': {'cpu': {'foo': 1}}}})
+
+    def test_patch_experiment_runs_schema_validators(self):
+        content = {
+            'version': 1,
+            'kind': 'experiment',
+            'framework': 'tensorflow',
+            'environment': {'replicas': {'n_workers': 2}},
+            'run': {'cmd': 'train'}
+        }
+        spec = ExperimentSpecification.read(content)
+        with self.assertRaises(ValidationError) as read_error:
+            ExperimentSpecification.read([content, {'framework': None}])
+        with self.assertRaises(ValidationError) as patch_error:
+            spec.patch({'framework': None})
+        assert patch_error.exception.messages == read_error.exception.messages
+
+    def test_jsonschema_is_built_once_per_kind(self):
+        jsonschema = ExperimentSpecification.get_jsonschema()
+        assert ExperimentSpecification.get_jsonschema() is jsonschema
+        assert jsonschema['required'] == ['version', 'kind']
+        assert jsonschema['properties']['kind'] == {'enum': ['experiment']}
+        assert jsonschema['additionalProperties'] is False
+        assert set(jsonschema['properties']) == set(ExperimentSpecification.POSSIBLE_SECTIONS)
+        assert 'hptuning' in GroupSpecification.get_jsonschema()['required']
+
+    def test_prevalidate_valid_files(self):
+        fixtures = [
+            'advanced_file.yml',
+            'matrix_file.yml',
+            'run_exec_simple_file_list_cmds.yml',
+            'distributed_tensorflow_file.yml',
+            'build_with_custom_environment.yml',
+            'notebook_with_custom_environment.yml',
+            'simple_generator_file.yml',
+        ]
+        for fixture in fixtures:
+            data = prevalidate(os.path.abspath(os.path.join('tests/fixtures', fixture)))
+            assert data['kind'] in SPECIFICATION_BY_KIND
+
+    def test_prevalidate_rejects_malformed_files(self):
+        with self.assertRaises(PolyaxonfileError):
+            prevalidate(os.path.abspath('tests/fixtures/job_missing_build.yml'))
+        with self.assertRaises(PolyaxonfileError):
+            prevalidate(os.path.abspath('tests/fixtures/missing_kind.yml'))
+        with self.assertRaises(PolyaxonfileError):
+            prevalidate(os.path.abspath('tests/fixtures/wrong_grid_matrix_file.yml'))
+
+        with self.assertRaises(PolyaxonfileError) as e:
+            ExperimentSpecification.prevalidate({
+                'version': 1,
+                'kind': 'experiment',
+                'run': {'cmd': 'train', 'cmnd': 'train'},
+                'environment': {'resources': {'cpu': {'requests': [1]}}},
+                'tags': 'foo',
+            })
+        message = '{}'.format(e.exception)
+        assert '`run`: unexpected key `cmnd`.' in message
+        assert '`environment.resources.cpu.requests`: expected number' in message
+
+    def test_prevalidate_accepts_templates_and_operators(self):
+        ExperimentSpecification.prevalidate({
+            'version': 1,
+            'kind': 'experiment',
+            'declarations': {'n_gpus': 1, 'key': 'image'},
+            'environment': {'resources': {'gpu': {'requests': '{{ n_gpus }}'}}},
+            'build': {'{{ key }}': 'my_image'},
+            'run': {'cmd': {'if': {'cond': '{{ n_gpus }} > 0', 'do': 'train', 'else_do': 'run'}}},
+        })
+
+    def test_lazy_experiment_sections(self):
+        content = {
+            'version': 1,
+            'kind': 'experiment',
+            'environment': {
+                'resources': {'cpu': {'requests': 1, 'limits': 2}},
+                'replicas': {'n_workers': 2},
+            },
+            'framework': 'tensorflow',
+            'build': {'image': 'my_image'},
+            'run': {'cmd': 'train'},
+            'model': {
+                'classifier': {
+                    'loss': {'MeanSquaredError': None},
+                    'graph': {
+                        'input_layers': 'images',
+                        'layers': [{'Dense': {'units': 10}}],
+                    },
+                },
+            },
+        }
+        spec = ExperimentSpecification.read(content, lazy=True)
+        config = spec.config
+        assert 'model' not in config.__dict__
+        assert 'run' not in config.__dict__
+        assert spec.build.image == 'my_image'
+        assert config.tensorflow.n_workers == 2
+        assert spec.cluster_def == (
+            {TaskType.MASTER: 1, TaskType.WORKER: 2, TaskType.PS: 0}, True)
+
+        # The sections are materialised on first access, and cached
+        assert spec.run.cmd == 'train'
+        assert config.model is config.model
+        assert 'model' in config.__dict__
+        assert config.to_dict() == ExperimentSpecification.read(content).config.to_dict()
+        with self.assertRaises(AttributeError):
+            config.unknown_attribute  # noqa, pointless-statement
+
+        # The lazy sections are validated structurally when loaded
+        with self.assertRaises(ValidationError):
+            ExperimentConfig.from_dict(dict(content, run=[]), lazy=True)
+        with self.assertRaises(ValidationError):
+            ExperimentConfig.from_dict(dict(content, run={'foo': 'train'}), lazy=True)
+
+        # The other errors are raised on access
+        config = ExperimentConfig.from_dict(
+            dict(content, model={'classifier': {'graph': {'layers': 'dense'}}}), lazy=True)
+        assert config.environment.replicas.n_workers == 2
+        with self.assertRaises(ValidationError):
+            config.model  # noqa, pointless-statement
+
+    def test_scheduling_sections_and_upgrade(self):
+        content = {
+            'version': 1,
+            'kind': 'experiment',
+            'declarations': {'lr': 0.1},
+            'environment': {'replicas': {'n_workers': 2}},
+            'framework': 'tensorflow',
+            'build': {'image': 'my_image'},
+            'run': {'cmd': 'train --lr={{ lr }}'},
+            'model': {
+                'classifier': {
+                    'loss': {'MeanSquaredError': None},
+                    'graph': {
+                        'input_layers': 'images',
+                        'layers': [{'Dense': {'units': '{{ lr * 10 }}'}}],
+                    },
+                },
+            },
+        }
+        spec = ExperimentSpecification.read(
+            content, sections=ExperimentSpecification.SCHEDULING_SECTIONS)
+        assert spec.sections == set(ExperimentSpecification.SCHEDULING_SECTIONS)
+        assert spec.build.image == 'my_image'
+        assert spec.cluster_def == (
+            {TaskType.MASTER: 1, TaskType.WORKER: 2, TaskType.PS: 0}, True)
+        assert spec.run is None
+        assert spec.model is None
+        assert 'model' not in spec.parsed_data
+
+        # Only the run section is added
+        run_spec = spec.upgrade(['run'])
+        assert run_spec.run.cmd == 'train --lr=0.1'
+        assert run_spec.model is None
+        assert run_spec.config.build is spec.config.build
+
+        # All the sections are parsed, the parsed sections are reused
+        full_spec = spec.upgrade()
+        assert full_spec.sections is None
+        assert full_spec.upgrade() is full_spec
+        assert full_spec.config.environment is spec.config.environment
+        assert full_spec.model.graph.layers[0].units == 1
+        assert full_spec.config.to_dict() == ExperimentSpecification.read(content).config.to_dict()
+
+        # Patching keeps the parsed sections
+        patched_spec = spec.patch({'environment': {'replicas': {'n_workers': 4}}})
+        assert patched_spec.sections == spec.sections
+        assert patched_spec.config.tensorflow.n_workers == 4
+        assert patched_spec.model is None
+
+    def test_pickle_specifications(self):
+        content = {
+            'version': 1,
+            'kind': 'experiment',
+            'declarations': {'lr': 0.1},
+            'environment': {'replicas': {'n_workers': 2}},
+            'framework': 'tensorflow',
+            'run': {'cmd': 'train --lr={{ lr }}'},
+        }
+        spec = ExperimentSpecification.read(
+            content, sections=ExperimentSpecification.SCHEDULING_SECTIONS)
+        spec_dict = spec.config.to_dict()
+
+        # Only the read data is pickled, the specification is parsed again on first use
+        unpickled = pickle.loads(pickle.dumps(spec, pickle.HIGHEST_PROTOCOL))
+        assert unpickled.sections == spec.sections
+        assert unpickled.config.to_dict() == spec_dict
+        assert unpickled.run is None
+
+        # The parsed state is pickled
+        ExperimentSpecification.PICKLE_PARSED_STATE = True
+        try:
+            unpickled = pickle.loads(pickle.dumps(spec.upgrade(), pickle.HIGHEST_PROTOCOL))
+        finally:
+            ExperimentSpecification.PICKLE_PARSED_STATE = False
+        assert '_config' in unpickled.__dict__
+        assert unpickled.run.cmd == 'train --lr=0.1'
+        assert unpickled.cluster_def == spec.cluster_def
+
+        group_content = dict(content, kind='group', hptuning={
+            'matrix': {'lr': {'values': [0.1, 0.2]}}})
+        group_content.pop('environment')
+        group_content.pop('declarations')
+        group_spec = GroupSpecification.read(group_content)
+        unpickled = pickle.loads(pickle.dumps(group_spec, pickle.HIGHEST_PROTOCOL))
+        assert unpickled.matrix_space == 2
+        assert unpickled.get_experiment_spec({'lr': 0.2}).run.cmd == 'train --lr=0.2'
+
+    def test_group_config_reuses_validated_sections(self):
+        content = {
+            'version': 1,
+            'kind': 'group',
+            'hptuning': {'matrix': {'lr': {'values': [0.1, 0.2]}}},
+            'build': {'image': 'my_image'},
+            'run': {'cmd': 'train --lr={{ lr }}'},
+            'model': {
+                'classifier': {
+                    'loss': {'MeanSquaredError': None},
+                    'graph': {
+                        'input_layers': 'images',
+                        'layers': [{'Dense': {'units': 1}}],
+                        'output_layers': ['Dense_1'],
+                    },
+                },
+            },
+        }
+        spec = GroupSpecification.read(content)
+        validated_data = spec._test_validated_data  # pylint:disable=protected-access
+        # The sections not depending on the matrix are validated once
+        assert spec.config.build is validated_data['build']
+        assert spec.config.model is validated_data['model']
+        # The templated sections are kept as defined in the group
+        assert spec.config.run is not validated_data['run']
+        assert spec.config.run.cmd == 'train --lr={{ lr }}'
+
+    def test_group_with_sections_get_experiment_spec(self):
+        content = {
+            'version': 1,
+            'kind': 'group',
+            'hptuning': {'matrix': {'lr': {'values': [0.1, 0.2]}}},
+            'environment': {'resources': {'cpu': {'requests': 1, 'limits': 2}}},
+            'build': {'image': 'my_image'},
+            'run': {'cmd': 'train --lr={{ lr }}'},
+            'model': {
+                'classifier': {
+                    'loss': {'MeanSquaredError': None},
+                    'graph': {
+                        'input_layers': 'images',
+                        'layers': [{'Dense': {'units': 1}}],
+                        'output_layers': ['Dense_1'],
+                    },
+                },
+            },
+        }
+        matrix_declaration = {'lr': 0.2}
+        expected = GroupSpecification.read(content).get_experiment_spec(matrix_declaration)
+        for sections in [GroupSpecification.SCHEDULING_SECTIONS, ['environment']]:
+            spec = GroupSpecification.read(content, sections=sections)
+            experiment_spec = spec.get_experiment_spec(matrix_declaration)
+            assert experiment_spec.sections is None
+            assert experiment_spec.model is not None
+            assert experiment_spec.run.cmd == 'train --lr=0.2'
+            assert experiment_spec.parsed_data == expected.parsed_data